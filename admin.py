@@ -0,0 +1,26 @@
+import hmac
+from functools import wraps
+
+from flask import request, jsonify
+
+import config
+
+ADMIN_HEADER = 'X-Admin-Token'
+# Admin pages opened in a browser pass the token as a query parameter instead
+ADMIN_QUERY_PARAM = 'admin_token'
+
+
+def is_admin_request() -> bool:
+    """Check the admin token header against the configured ADMIN_TOKEN"""
+    token = request.headers.get(ADMIN_HEADER) or request.args.get(ADMIN_QUERY_PARAM, '')
+    return bool(config.ADMIN_TOKEN) and hmac.compare_digest(token, config.ADMIN_TOKEN)
+
+
+def admin_required(view):
+    """Restrict a view to requests carrying the admin token"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin_request():
+            return jsonify({'success': False, 'error': 'Forbidden'}), 403
+        return view(*args, **kwargs)
+    return wrapper
@@ -1,16 +1,29 @@
 import os
-import logging
 from flask import Flask
 from werkzeug.middleware.proxy_fix import ProxyFix
 
+import logging_setup
+import metrics
+import profiler
+from lazy_imports import LazyGroup
+
 # Configure logging
-logging.basicConfig(level=logging.DEBUG)
+logging_setup.configure_logging()
 
 # Create the app
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "dev-secret-key-change-in-production")
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
+# Per-stage Server-Timing headers and the Prometheus /metrics endpoint
+metrics.init_app(app)
+
+# Opt-in sampling profiler for slow requests
+profiler.init_app(app)
+
+# Cross-season analytics warehouse CLI; warehouse.py (and SQLAlchemy) is imported when it is used
+app.cli.add_command(LazyGroup('warehouse', 'warehouse:warehouse_cli', help='Cross-season analytics warehouse'))
+
 # Import routes
 from routes import *
 
@@ -0,0 +1,153 @@
+"""Asyncio facade over F1DataService.
+
+Every service call runs on a bounded thread pool chosen by operation type,
+so a view can await several slow fastf1 loads at once and the number of
+concurrent loads, telemetry merges and renders per worker stays capped no
+matter how many requests are waiting. Flask runs each async view through
+asgiref on the thread that took the request, so a waiting view still holds
+one of gunicorn's threads; the number of requests a worker serves at once
+comes from those threads (``threads`` in gunicorn.conf.py), and the pools
+bound how much of the heavy work they start. Thread pools rather than process
+pools are used because loaded fastf1 sessions live in the worker's memory
+and cannot be handed to another process cheaply.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+import config
+from f1_data import F1DataService, get_f1_service
+from profiler import track_current_thread
+
+DEFAULT_POOL_SIZE = 4
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """Parse 'pool=threads,pool=threads' into executor sizes, skipping bad entries"""
+    limits = {}
+    for entry in (spec or '').split(','):
+        name, _, value = entry.partition('=')
+        try:
+            limits[name.strip()] = max(int(value), 1)
+        except ValueError:
+            continue
+    return limits
+
+
+
+
+def _offloaded(pool: str, method_name: str):
+    """Async method running F1DataService.<method_name> on the given pool"""
+    async def method(self, *args, **kwargs):
+        return await self.run(pool, getattr(self.service, method_name), *args, **kwargs)
+    method.__name__ = method_name
+    method.__doc__ = f"Async {method_name} on the '{pool}' executor"
+    return method
+
+
+class AsyncF1DataService:
+    """F1DataService operations as coroutines on per-operation bounded executors"""
+
+    POOLS = ('schedule', 'laps', 'telemetry', 'analysis', 'render')
+
+    def __init__(self, service: F1DataService, limits: Dict[str, int]):
+        self.service = service
+        self.logger = logging.getLogger(__name__)
+        self.limits = {pool: limits.get(pool, DEFAULT_POOL_SIZE) for pool in self.POOLS}
+        self._executors = {
+            pool: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"f1-{pool}")
+            for pool, size in self.limits.items()
+        }
+        self._queued = dict.fromkeys(self.POOLS, 0)
+        self._running = dict.fromkeys(self.POOLS, 0)
+        self._counts_lock = threading.Lock()
+
+    async def run(self, pool: str, func, *args, **kwargs):
+        """Run a blocking callable on a pool and await its result"""
+        # Carry the request's context (stage timings, active profile) into the executor thread
+        context = contextvars.copy_context()
+        with self._counts_lock:
+            self._queued[pool] += 1
+        future = self._executors[pool].submit(context.run, self._tracked_call, pool, func, args, kwargs)
+        future.add_done_callback(functools.partial(self._call_done, pool))
+        return await asyncio.wrap_future(future)
+
+    def _tracked_call(self, pool: str, func, args, kwargs):
+        with self._counts_lock:
+            self._queued[pool] -= 1
+            self._running[pool] += 1
+        try:
+            with track_current_thread():
+                return func(*args, **kwargs)
+        finally:
+            with self._counts_lock:
+                self._running[pool] -= 1
+
+    def _call_done(self, pool: str, future):
+        if future.cancelled():
+            # A cancelled call never started, so it only leaves the queue
+            with self._counts_lock:
+                self._queued[pool] -= 1
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict:
+        """Configured size, waiting and running calls of every executor"""
+        with self._counts_lock:
+            return {
+                pool: {'max_workers': self.limits[pool], 'queued': self._queued[pool], 'running': self._running[pool]}
+                for pool in self.POOLS
+            }
+
+    get_available_years = _offloaded('schedule', 'get_available_years')
+    get_season_schedule = _offloaded('schedule', 'get_season_schedule')
+    get_session_info = _offloaded('schedule', 'get_session_info')
+    get_drivers_in_session = _offloaded('schedule', 'get_drivers_in_session')
+    get_weather_data = _offloaded('schedule', 'get_weather_data')
+    get_weather_timeline = _offloaded('schedule', 'get_weather_timeline')
+
+    prepare_session = _offloaded('laps', 'prepare_session')
+    get_lap_data = _offloaded('laps', 'get_lap_data')
+    get_driver_fastest_laps = _offloaded('laps', 'get_driver_fastest_laps')
+    generate_sample_lap_data = _offloaded('laps', 'generate_sample_lap_data')
+
+    get_telemetry_data = _offloaded('telemetry', 'get_telemetry_data')
+    get_track_data = _offloaded('telemetry', 'get_track_data')
+    get_minisector_dominance = _offloaded('telemetry', 'get_minisector_dominance')
+    get_replay_manifest = _offloaded('telemetry', 'get_replay_manifest')
+    get_replay_chunk = _offloaded('telemetry', 'get_replay_chunk')
+    generate_sample_telemetry = _offloaded('telemetry', 'generate_sample_telemetry')
+
+    get_performance_metrics = _offloaded('analysis', 'get_performance_metrics')
+    get_detailed_comparison = _offloaded('analysis', 'get_detailed_comparison')
+    get_export_data = _offloaded('analysis', 'get_export_data')
+    get_advanced_performance_insights = _offloaded('analysis', 'get_advanced_performance_insights')
+    get_tyre_degradation = _offloaded('analysis', 'get_tyre_degradation')
+    get_fuel_analysis = _offloaded('analysis', 'get_fuel_analysis')
+    get_gap_timeline = _offloaded('analysis', 'get_gap_timeline')
+
+    generate_circuit_layout = _offloaded('render', 'generate_circuit_layout')
+    render_circuit_maps = _offloaded('render', 'render_circuit_maps')
+
+
+_async_service = None
+_async_service_pid = None
+_async_service_lock = threading.Lock()
+
+
+def get_async_f1_service() -> AsyncF1DataService:
+    """Return the per-process async service (executor threads do not survive a fork)"""
+    global _async_service, _async_service_pid
+    if _async_service is None or _async_service_pid != os.getpid():
+        with _async_service_lock:
+            if _async_service is None or _async_service_pid != os.getpid():
+                _async_service = AsyncF1DataService(get_f1_service(), parse_limits(config.ASYNC_POOL_LIMITS))
+                _async_service_pid = os.getpid()
+    return _async_service
@@ -0,0 +1,213 @@
+"""Benchmark suite for F1DataService operations.
+
+Every case runs in a fresh interpreter against a replayed fixture archive
+(see offline_backend.py): the first call is the cold run (empty fastf1
+cache, nothing in memory), the following calls are warm runs. Results are
+written as JSON so runs can be compared across commits.
+
+Usage:
+    python -m benchmarks.bench_service --archive fixtures/bahrain_2023.zip
+    python -m benchmarks.bench_service --archive A.zip --cases get_lap_data,get_fuel_analysis \
+        --repeat 20 --output results.json --compare baseline.json
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Tuple
+
+from benchmarks.common import (format_delta, print_table, read_json, run_metadata,
+                               summarize_latencies, write_json)
+
+
+def _case_lap_data(service, session, drivers, lap):
+    return service.get_lap_data(*session, drivers)
+
+
+def _case_telemetry(service, session, drivers, lap):
+    return service.get_telemetry_data(*session, drivers[0], lap)
+
+
+def _case_track(service, session, drivers, lap):
+    return service.get_track_data(*session)
+
+
+def _case_circuit_layout(service, session, drivers, lap):
+    # Measure the draw, not the render cache
+    service.renders.clear()
+    return service.generate_circuit_layout(*session, drivers[0], lap)
+
+
+def _case_circuit_maps(service, session, drivers, lap):
+    service.renders.clear()
+    return service.render_circuit_maps(*session, drivers, sizes=('full', 'thumbnail'))
+
+
+def _case_performance_metrics(service, session, drivers, lap):
+    return service.get_performance_metrics(*session, drivers)
+
+
+def _case_fuel_analysis(service, session, drivers, lap):
+    return service.get_fuel_analysis(*session, drivers)
+
+
+def _case_export_csv(service, session, drivers, lap):
+    return service.format_as_csv(service.get_export_data(*session, drivers))
+
+
+def _case_fastest_laps(service, session, drivers, lap):
+    return service.get_driver_fastest_laps(*session, drivers)
+
+
+CASES = {
+    'get_lap_data': _case_lap_data,
+    'get_telemetry_data': _case_telemetry,
+    'get_track_data': _case_track,
+    'generate_circuit_layout': _case_circuit_layout,
+    'render_circuit_maps': _case_circuit_maps,
+    'get_performance_metrics': _case_performance_metrics,
+    'get_fuel_analysis': _case_fuel_analysis,
+    'export_csv': _case_export_csv,
+    'get_driver_fastest_laps': _case_fastest_laps,
+}
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_case(case: str, session: Tuple[int, int, str], drivers: List[str], lap: int,
+             repeat: int, archive: str, latency_ms: float) -> Dict:
+    """Run one case in this (fresh) process; cold first, then warm repetitions"""
+    cache_dir = tempfile.mkdtemp(prefix='lapla_bench_')
+    os.environ.update({
+        'F1_BACKEND_MODE': 'replay',
+        'F1_FIXTURE_ARCHIVE': archive,
+        'F1_REPLAY_LATENCY_MS': str(latency_ms),
+        'FASTF1_CACHE_DIR': cache_dir,
+    })
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+
+    from f1_data import F1DataService
+    from offline_backend import get_archive
+
+    func = CASES[case]
+    rss_before = _peak_rss_mb()
+
+    start = time.perf_counter()
+    service = F1DataService()
+    func(service, session, drivers, lap)
+    cold_ms = (time.perf_counter() - start) * 1000
+    rss_cold = _peak_rss_mb()
+
+    warm_ms = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(service, session, drivers, lap)
+        warm_ms.append((time.perf_counter() - start) * 1000)
+    rss_warm = _peak_rss_mb()
+
+    # Allocation tracing slows everything down, so it gets its own warm run
+    tracemalloc.start()
+    func(service, session, drivers, lap)
+    snapshot = tracemalloc.take_snapshot()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    live_blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+
+    archive_stats = get_archive().get_stats() if get_archive() else {}
+    return {
+        'case': case,
+        'session': list(session),
+        'cold_ms': round(cold_ms, 3),
+        'warm_ms': summarize_latencies(warm_ms),
+        'peak_rss_mb': {'baseline': round(rss_before, 1), 'cold': round(rss_cold, 1), 'warm': round(rss_warm, 1)},
+        'alloc_peak_mb': round(traced_peak / 1024 ** 2, 3),
+        'alloc_live_blocks': live_blocks,
+        'replay_misses': archive_stats.get('misses', 0)
+    }
+
+
+def run_isolated(*args) -> Dict:
+    """Run a case in a spawned interpreter so caches and RSS start from zero"""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(run_case, args)
+
+
+def print_results(results: List[Dict], baseline: Dict = None):
+    previous = {}
+    for entry in (baseline or {}).get('results', []):
+        previous[(entry['case'], tuple(entry['session']))] = entry
+
+    headers = ['case', 'session', 'cold ms', 'warm p50', 'warm p90', 'warm p99', 'rss MB', 'alloc MB', 'misses']
+    if baseline:
+        headers += ['cold Δ', 'p50 Δ']
+    rows = []
+    for entry in results:
+        warm = entry['warm_ms']
+        row = [entry['case'], ':'.join(map(str, entry['session'])), entry['cold_ms'], warm.get('p50'),
+               warm.get('p90'), warm.get('p99'), entry['peak_rss_mb']['warm'], entry['alloc_peak_mb'],
+               entry['replay_misses']]
+        if baseline:
+            old = previous.get((entry['case'], tuple(entry['session'])))
+            row += [format_delta(entry['cold_ms'], old and old['cold_ms']),
+                    format_delta(warm.get('p50'), old and old['warm_ms'].get('p50'))]
+        rows.append(row)
+    print_table(headers, rows)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--archive', default=os.environ.get('F1_FIXTURE_ARCHIVE'), required='F1_FIXTURE_ARCHIVE' not in os.environ,
+                        help='fixture archive recorded with offline_backend.py')
+    parser.add_argument('--sessions', help='comma separated YEAR:ROUND:TYPE list (default: every session in the archive)')
+    parser.add_argument('--cases', help=f"comma separated subset of: {', '.join(CASES)}")
+    parser.add_argument('--drivers', default='VER,LEC,HAM', help='driver codes passed to multi-driver operations')
+    parser.add_argument('--lap', type=int, default=10, help='lap number for telemetry and circuit layout cases')
+    parser.add_argument('--repeat', type=int, default=10, help='warm repetitions per case')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='simulated upstream latency per request')
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare against')
+    args = parser.parse_args(argv)
+
+    from offline_backend import FixtureArchive, parse_session_spec
+
+    if args.sessions:
+        sessions = [parse_session_spec(spec) for spec in args.sessions.split(',')]
+    else:
+        sessions = FixtureArchive(args.archive).sessions
+    if not sessions:
+        parser.error('no sessions to benchmark: the archive lists none and --sessions was not given')
+    cases = args.cases.split(',') if args.cases else list(CASES)
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    drivers = args.drivers.split(',')
+    archive = os.path.abspath(args.archive)
+
+    results = []
+    for session in sessions:
+        for case in cases:
+            print(f"running {case} on {':'.join(map(str, session))} ...", file=sys.stderr)
+            results.append(run_isolated(case, tuple(session), drivers, args.lap, args.repeat, archive, args.latency_ms))
+
+    output = {
+        'meta': run_metadata(archive=archive, repeat=args.repeat, drivers=drivers, lap=args.lap,
+                             latency_ms=args.latency_ms),
+        'results': results
+    }
+    print_results(results, read_json(args.compare) if args.compare else None)
+    if args.output:
+        write_json(args.output, output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Shared helpers for the benchmark scripts"""
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Linearly interpolated percentile (q in 0..100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower, upper = math.floor(position), math.ceil(position)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_latencies(values_ms: Sequence[float]) -> Dict:
+    """Percentile summary of a list of latencies in milliseconds"""
+    if not values_ms:
+        return {'n': 0}
+    return {
+        'n': len(values_ms),
+        'min': round(min(values_ms), 3),
+        'p50': round(percentile(values_ms, 50), 3),
+        'p90': round(percentile(values_ms, 90), 3),
+        'p99': round(percentile(values_ms, 99), 3),
+        'max': round(max(values_ms), 3),
+        'mean': round(sum(values_ms) / len(values_ms), 3)
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_metadata(**extra) -> Dict:
+    """Metadata recorded with every result file so runs can be compared across commits"""
+    meta = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+    meta.update(extra)
+    return meta
+
+
+def write_json(path: str, data: Dict):
+    with open(path, 'w') as handle:
+        json.dump(data, handle, indent=2)
+
+
+def read_json(path: str) -> Dict:
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def format_delta(current: Optional[float], baseline: Optional[float]) -> str:
+    if current is None or baseline in (None, 0):
+        return 'n/a'
+    return f"{(current - baseline) / baseline * 100:+.1f}%"
+
+
+def print_table(headers: List[str], rows: List[List]):
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    for row in [headers] + rows:
+        print('  '.join(str(value).ljust(width) for value, width in zip(row, widths)))
+
+
+def child_pids(pid: int) -> List[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as handle:
+            return [int(child) for child in handle.read().split()]
+    except OSError:
+        return []
+
+
+def memory_mb(pid: int) -> Dict[str, Optional[float]]:
+    """RSS and PSS of a process (PSS accounts for pages shared copy-on-write)"""
+    memory = {'rss': None, 'pss': None}
+    try:
+        with open(f"/proc/{pid}/status") as handle:
+            for line in handle:
+                if line.startswith('VmRSS:'):
+                    memory['rss'] = round(int(line.split()[1]) / 1024, 1)
+        with open(f"/proc/{pid}/smaps_rollup") as handle:
+            for line in handle:
+                if line.startswith('Pss:'):
+                    memory['pss'] = round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return memory
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
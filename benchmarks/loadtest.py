@@ -0,0 +1,261 @@
+"""Load-test harness driving the app under gunicorn with a realistic traffic mix.
+
+Starts gunicorn in replay mode against a fixture archive (or targets an
+already running server with --url), fires a weighted mix of page and API
+requests across the archive's sessions from concurrent clients, and reports
+throughput, per-route latency histograms, error rates and worker memory over
+time.
+
+Usage:
+    python -m benchmarks.loadtest --archive fixtures/season.zip --workers 4 --clients 16 --duration 120
+    python -m benchmarks.loadtest --archive A.zip --mix lap_data=50,telemetry=50 --output load.json
+    python -m benchmarks.loadtest --url http://127.0.0.1:5000 --sessions 2023:1:R --duration 30
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from benchmarks.common import (REPO_ROOT, child_pids, free_port, memory_mb, print_table, run_metadata,
+                               summarize_latencies, write_json)
+
+DEFAULT_MIX = {
+    'analysis': 10,
+    'lap_data': 30,
+    'telemetry': 25,
+    'circuit_layout': 10,
+    'performance_metrics': 25,
+}
+
+# Upper bounds (ms) of the latency histogram buckets
+HISTOGRAM_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, float('inf'))
+
+
+def build_path(route: str, session: Tuple[int, int, str], drivers: List[str], rng: random.Random, max_lap: int) -> str:
+    year, round_number, session_type = session
+    driver = rng.choice(drivers)
+    lap = rng.randint(1, max_lap)
+    selected = rng.sample(drivers, min(2, len(drivers)))
+    driver_query = '&'.join(f"drivers={code}" for code in selected)
+    if route == 'analysis':
+        return f"/analysis?year={year}&round={round_number}&session={session_type}&{driver_query}"
+    if route == 'lap_data':
+        return f"/api/lap_data/{year}/{round_number}/{session_type}?{driver_query}"
+    if route == 'telemetry':
+        return f"/api/telemetry/{year}/{round_number}/{session_type}/{driver}/{lap}"
+    if route == 'circuit_layout':
+        return f"/api/circuit-layout/{year}/{round_number}/{session_type}/{driver}/{lap}"
+    if route == 'performance_metrics':
+        return f"/api/performance-metrics/{year}/{round_number}/{session_type}?{driver_query}"
+    raise ValueError(f"unknown route {route!r}")
+
+
+def parse_mix(spec: Optional[str]) -> Dict[str, int]:
+    if not spec:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in spec.split(','):
+        route, weight = item.split('=')
+        if route not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown route {route!r}, expected one of {', '.join(DEFAULT_MIX)}")
+        mix[route] = int(weight)
+    return mix
+
+
+class RouteStats:
+    """Latencies and outcome counters for one route"""
+
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.errors = 0
+        self.app_errors = 0
+
+    def histogram(self) -> Dict[str, int]:
+        counts = dict.fromkeys((f"le_{bound:g}" for bound in HISTOGRAM_BUCKETS), 0)
+        for latency in self.latencies_ms:
+            for bound in HISTOGRAM_BUCKETS:
+                if latency <= bound:
+                    counts[f"le_{bound:g}"] += 1
+                    break
+        return counts
+
+
+def client_loop(base_url: str, mix: Dict[str, int], sessions, drivers, max_lap: int, deadline: float,
+                stats: Dict[str, RouteStats], lock: threading.Lock, seed: int, timeout: float):
+    rng = random.Random(seed)
+    routes, weights = zip(*mix.items())
+    http = requests.Session()
+    while time.monotonic() < deadline:
+        route = rng.choices(routes, weights)[0]
+        path = build_path(route, rng.choice(sessions), drivers, rng, max_lap)
+        start = time.perf_counter()
+        error = app_error = False
+        try:
+            response = http.get(base_url + path, timeout=timeout, allow_redirects=False)
+            error = response.status_code >= 500
+            if not error and response.headers.get('Content-Type', '').startswith('application/json'):
+                body = response.json()
+                app_error = isinstance(body, dict) and body.get('success') is False
+        except (requests.RequestException, ValueError):
+            error = True
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with lock:
+            route_stats = stats[route]
+            route_stats.latencies_ms.append(elapsed_ms)
+            route_stats.errors += error
+            route_stats.app_errors += app_error
+
+
+def sample_memory(master_pid: int, started: float, interval: float, stop: threading.Event, timeline: List[Dict]):
+    while not stop.is_set():
+        workers = {str(pid): memory_mb(pid) for pid in child_pids(master_pid)}
+        timeline.append({'t': round(time.monotonic() - started, 2), 'master': memory_mb(master_pid), 'workers': workers})
+        stop.wait(interval)
+
+
+def start_gunicorn(args, port: int, cache_dir: str) -> subprocess.Popen:
+    env = dict(os.environ, F1_BACKEND_MODE='replay', F1_FIXTURE_ARCHIVE=os.path.abspath(args.archive),
+               F1_REPLAY_LATENCY_MS=str(args.latency_ms), FASTF1_CACHE_DIR=cache_dir)
+    command = [sys.executable, '-m', 'gunicorn', '--bind', f"127.0.0.1:{port}", '--workers', str(args.workers),
+               '--threads', str(args.threads), '--timeout', str(int(args.timeout) + 30), '--log-level', 'warning']
+    command += args.gunicorn_arg or []
+    command.append(args.app)
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env)
+
+
+def wait_until_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(base_url + '/about', timeout=5).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--archive', help='fixture archive to replay (required unless --url and --sessions are given)')
+    parser.add_argument('--url', help='target an already running server instead of starting gunicorn')
+    parser.add_argument('--app', default='main:app', help='WSGI app passed to gunicorn')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--gunicorn-arg', action='append', help='extra argument passed through to gunicorn')
+    parser.add_argument('--cache-dir', help='fastf1 cache dir for the server (default: fresh temporary dir)')
+    parser.add_argument('--sessions', help='comma separated YEAR:ROUND:TYPE list (default: every session in the archive)')
+    parser.add_argument('--drivers', default='VER,LEC,HAM,NOR,PER,SAI')
+    parser.add_argument('--max-lap', type=int, default=50)
+    parser.add_argument('--mix', type=parse_mix, default=None, help='route weights, e.g. lap_data=30,telemetry=25')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent client threads')
+    parser.add_argument('--duration', type=float, default=60.0, help='seconds of load')
+    parser.add_argument('--timeout', type=float, default=120.0, help='per-request timeout in seconds')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='simulated upstream latency for replay')
+    parser.add_argument('--sample-interval', type=float, default=1.0, help='seconds between worker memory samples')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args(argv)
+
+    from offline_backend import FixtureArchive, parse_session_spec
+
+    if args.sessions:
+        sessions = [parse_session_spec(spec) for spec in args.sessions.split(',')]
+    elif args.archive:
+        sessions = FixtureArchive(args.archive).sessions
+    else:
+        parser.error('--sessions is required when no --archive is given')
+    if not sessions:
+        parser.error('no sessions to request')
+    if not args.url and not args.archive:
+        parser.error('--archive is required when starting gunicorn')
+    mix = args.mix or dict(DEFAULT_MIX)
+    drivers = args.drivers.split(',')
+
+    server = None
+    if args.url:
+        base_url = args.url.rstrip('/')
+    else:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_gunicorn(args, port, args.cache_dir or tempfile.mkdtemp(prefix='lapla_load_'))
+
+    timeline: List[Dict] = []
+    stop_sampling = threading.Event()
+    try:
+        wait_until_ready(base_url)
+        started = time.monotonic()
+        if server:
+            threading.Thread(target=sample_memory, args=(server.pid, started, args.sample_interval, stop_sampling, timeline),
+                             daemon=True).start()
+
+        stats: Dict[str, RouteStats] = defaultdict(RouteStats)
+        lock = threading.Lock()
+        deadline = started + args.duration
+        clients = [threading.Thread(target=client_loop, args=(base_url, mix, sessions, drivers, args.max_lap, deadline,
+                                                              stats, lock, args.seed + index, args.timeout))
+                   for index in range(args.clients)]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        elapsed = time.monotonic() - started
+    finally:
+        stop_sampling.set()
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    routes = {}
+    total_requests = total_errors = 0
+    for route, route_stats in sorted(stats.items()):
+        count = len(route_stats.latencies_ms)
+        total_requests += count
+        total_errors += route_stats.errors
+        routes[route] = {
+            'requests': count,
+            'throughput_rps': round(count / elapsed, 3),
+            'error_rate': round(route_stats.errors / count, 4) if count else None,
+            'app_error_rate': round(route_stats.app_errors / count, 4) if count else None,
+            'latency_ms': summarize_latencies(route_stats.latencies_ms),
+            'histogram_ms': route_stats.histogram()
+        }
+
+    result = {
+        'meta': run_metadata(url=base_url, archive=args.archive, workers=args.workers, threads=args.threads,
+                             clients=args.clients, duration=args.duration, mix=mix, sessions=[list(s) for s in sessions],
+                             latency_ms=args.latency_ms),
+        'summary': {
+            'elapsed_s': round(elapsed, 2),
+            'requests': total_requests,
+            'throughput_rps': round(total_requests / elapsed, 3),
+            'error_rate': round(total_errors / total_requests, 4) if total_requests else None
+        },
+        'routes': routes,
+        'memory_timeline': timeline
+    }
+
+    summary = result['summary']
+    print(f"{summary['requests']} requests in {summary['elapsed_s']} s: {summary['throughput_rps']} req/s, error rate {summary['error_rate']}")
+    print_table(['route', 'requests', 'req/s', 'errors', 'app errors', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms'],
+                [[route, data['requests'], data['throughput_rps'], data['error_rate'], data['app_error_rate'],
+                  data['latency_ms'].get('p50'), data['latency_ms'].get('p90'), data['latency_ms'].get('p99'),
+                  data['latency_ms'].get('max')] for route, data in routes.items()])
+    if timeline:
+        last = timeline[-1]['workers']
+        print('worker RSS at end (MB): ' + ', '.join(f"{pid}={memory['rss']}" for pid, memory in last.items()))
+    if args.output:
+        write_json(args.output, result)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
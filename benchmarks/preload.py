@@ -0,0 +1,164 @@
+"""Compare gunicorn deployments with and without preloading hot sessions.
+
+Boots gunicorn in replay mode three ways and measures boot time, per-worker
+RSS/PSS and the latency of the first request each worker serves for the hot
+sessions:
+
+    cold            main:app, no preload, nothing warmed
+    worker-warm     wsgi:app without preload: every worker warms its own copy
+    preload         wsgi:app with preload_app: the master warms, workers share it
+
+Usage:
+    python -m benchmarks.preload --archive fixtures/season.zip --workers 4
+    python -m benchmarks.preload --archive A.zip --sessions 2023:1:R,2023:1:Q --output preload.json
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import requests
+
+from benchmarks.common import (REPO_ROOT, child_pids, free_port, memory_mb, print_table, run_metadata,
+                               summarize_latencies, write_json)
+
+MODES = {
+    'cold': {'app': 'main:app', 'preload': False, 'warm': False},
+    'worker-warm': {'app': 'wsgi:app', 'preload': False, 'warm': True},
+    'preload': {'app': 'wsgi:app', 'preload': True, 'warm': True},
+}
+
+
+def start_server(mode: Dict, args, port: int, cache_dir: str, hot_sessions: str) -> subprocess.Popen:
+    env = dict(os.environ, F1_BACKEND_MODE='replay', F1_FIXTURE_ARCHIVE=os.path.abspath(args.archive),
+               F1_REPLAY_LATENCY_MS=str(args.latency_ms), FASTF1_CACHE_DIR=cache_dir,
+               GUNICORN_PRELOAD='1' if mode['preload'] else '0',
+               HOT_SESSIONS=hot_sessions if mode['warm'] else '',
+               SESSION_POPULARITY_FILE=os.path.join(cache_dir, 'session_popularity.json'))
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f"127.0.0.1:{port}",
+               '--workers', str(args.workers), '--timeout', '600', '--log-level', 'warning', mode['app']]
+    return subprocess.Popen(command, cwd=REPO_ROOT, env=env)
+
+
+def wait_for_workers(base_url: str, master_pid: int, workers: int, timeout: float) -> float:
+    """Seconds until every worker has booted and the server answers"""
+    started = time.monotonic()
+    deadline = started + timeout
+    while time.monotonic() < deadline:
+        if len(child_pids(master_pid)) >= workers:
+            try:
+                if requests.get(base_url + '/about', timeout=5).status_code == 200:
+                    return time.monotonic() - started
+            except requests.RequestException:
+                pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not become ready")
+
+
+def worker_memory(master_pid: int) -> Dict:
+    workers = [memory_mb(pid) for pid in child_pids(master_pid)]
+    rss = [memory['rss'] for memory in workers if memory['rss'] is not None]
+    pss = [memory['pss'] for memory in workers if memory['pss'] is not None]
+    return {
+        'master': memory_mb(master_pid),
+        'workers': workers,
+        'worker_rss_mean': round(sum(rss) / len(rss), 1) if rss else None,
+        'worker_pss_mean': round(sum(pss) / len(pss), 1) if pss else None,
+        'total_pss': round(sum(pss) + (memory_mb(master_pid)['pss'] or 0), 1) if pss else None,
+    }
+
+
+def first_requests(base_url: str, sessions, drivers: List[str], concurrency: int) -> List[float]:
+    """Latency of `concurrency` simultaneous first requests per hot session (one per worker)"""
+    def fetch(path):
+        start = time.perf_counter()
+        requests.get(base_url + path, timeout=600)
+        return (time.perf_counter() - start) * 1000
+
+    latencies = []
+    driver_query = '&'.join(f"drivers={code}" for code in drivers)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for year, round_number, session_type in sessions:
+            path = f"/api/lap_data/{year}/{round_number}/{session_type}?{driver_query}"
+            latencies.extend(pool.map(fetch, [path] * concurrency))
+    return latencies
+
+
+def run_mode(name: str, args, sessions, hot_sessions: str) -> Dict:
+    mode = MODES[name]
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory(prefix='lapla_preload_') as cache_dir:
+        # Populate the on-disk cache first so every mode measures in-memory loading, not replay
+        subprocess.run([sys.executable, '-c', 'import wsgi'], cwd=REPO_ROOT, check=False,
+                       env=dict(os.environ, F1_BACKEND_MODE='replay', F1_FIXTURE_ARCHIVE=os.path.abspath(args.archive),
+                                FASTF1_CACHE_DIR=cache_dir, HOT_SESSIONS=hot_sessions))
+        server = start_server(mode, args, port, cache_dir, hot_sessions)
+        try:
+            boot_seconds = wait_for_workers(base_url, server.pid, args.workers, args.boot_timeout)
+            time.sleep(args.settle)
+            memory_idle = worker_memory(server.pid)
+            latencies = first_requests(base_url, sessions, args.drivers.split(','), args.workers)
+            memory_after = worker_memory(server.pid)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+    return {
+        'mode': name,
+        'app': mode['app'],
+        'preload': mode['preload'],
+        'boot_seconds': round(boot_seconds, 2),
+        'memory_idle': memory_idle,
+        'memory_after_first_requests': memory_after,
+        'first_request_ms': summarize_latencies(latencies),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--archive', required=True, help='fixture archive to replay')
+    parser.add_argument('--sessions', help='comma separated YEAR:ROUND:TYPE hot sessions (default: the archive\'s first two)')
+    parser.add_argument('--modes', default=','.join(MODES), help='comma separated subset of: ' + ', '.join(MODES))
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--drivers', default='VER,LEC')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='simulated upstream latency for replay')
+    parser.add_argument('--settle', type=float, default=2.0, help='seconds to wait after boot before measuring memory')
+    parser.add_argument('--boot-timeout', type=float, default=600.0)
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args(argv)
+
+    from offline_backend import FixtureArchive, parse_session_spec
+
+    if args.sessions:
+        sessions = [parse_session_spec(spec) for spec in args.sessions.split(',')]
+    else:
+        sessions = FixtureArchive(args.archive).sessions[:2]
+    if not sessions:
+        parser.error('no sessions to warm')
+    hot_sessions = ','.join(f"{year}:{round_number}:{session_type}" for year, round_number, session_type in sessions)
+
+    results = []
+    for name in args.modes.split(','):
+        if name not in MODES:
+            parser.error(f"unknown mode {name!r}")
+        print(f"Running {name} ...", file=sys.stderr)
+        results.append(run_mode(name, args, sessions, hot_sessions))
+
+    print_table(
+        ['mode', 'boot s', 'worker RSS MB', 'worker PSS MB', 'total PSS MB', 'first req p50 ms', 'first req max ms',
+         'worker RSS after MB'],
+        [[r['mode'], r['boot_seconds'], r['memory_idle']['worker_rss_mean'], r['memory_idle']['worker_pss_mean'],
+          r['memory_idle']['total_pss'], r['first_request_ms'].get('p50'), r['first_request_ms'].get('max'),
+          r['memory_after_first_requests']['worker_rss_mean']] for r in results])
+
+    if args.output:
+        write_json(args.output, {'metadata': run_metadata(workers=args.workers, sessions=hot_sessions), 'results': results})
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
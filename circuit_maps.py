@@ -0,0 +1,126 @@
+"""Speed-coloured circuit maps drawn on one reusable figure.
+
+Maps of a grid (``render_circuit_maps``) share everything but the colours
+and the title: they are drawn on the session's reference lap (each driver's
+speed resampled onto it by lap distance) against one speed scale. A single
+driver's map keeps its own line and speed range and redraws the scene. A
+SpeedMapRenderer draws
+the fixed parts of such a scene (axes, track outline, colorbar) once and
+keeps the pixels; each map restores them and draws only the speed-coloured
+line and the title on top. The crop is the fixed parts' bounding box
+joined with the title's extent, measured for every map. Thumbnails are
+downscaled from the full bitmap rather than drawn again. Figures are not
+thread-safe, so each render thread keeps its own renderer (see
+``renderer()``).
+"""
+import base64
+import io
+import threading
+import zlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from lazy_imports import mpl
+
+RENDER_DPI = 100
+# Output sizes as the factor the full (12x8 inch, RENDER_DPI) render is scaled down by
+RENDER_SIZES = {'full': 1, 'thumbnail': 3}
+# Blank margin around the drawn content, as bbox_inches='tight' leaves
+PAD_PIXELS = 10
+
+_local = threading.local()
+
+
+def resample_speed(distance: np.ndarray, speed: np.ndarray, reference_distance: np.ndarray) -> np.ndarray:
+    """A lap's speed at the reference lap's points, matched by fraction of lap distance"""
+    fraction = distance / distance[-1] if distance[-1] > 0 else np.linspace(0.0, 1.0, len(distance))
+    reference = reference_distance / reference_distance[-1] if reference_distance[-1] > 0 \
+        else np.linspace(0.0, 1.0, len(reference_distance))
+    return np.interp(reference, fraction, np.asarray(speed, dtype=float))
+
+
+def speed_scale(speed: np.ndarray) -> Tuple[float, float]:
+    """Colour limits for a grid of maps: the reference lap's range with 10 km/h headroom, in tens"""
+    return float(np.floor(speed.min() / 10) * 10 - 10), float(np.ceil(speed.max() / 10) * 10 + 10)
+
+
+class SpeedMapRenderer:
+    """One figure with the track outline, speed-coloured line and colorbar; per map only the line and title are drawn"""
+
+    def __init__(self):
+        self.figure = mpl.figure.Figure(figsize=(12, 8), dpi=RENDER_DPI, facecolor='black')
+        self.canvas = mpl.backends.backend_agg.FigureCanvasAgg(self.figure)
+        self.title = self.figure.suptitle('', size=16, y=0.95)
+        self.figure.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.12)
+        self.axes = self.figure.add_subplot()
+        self.axes.axis('off')
+        (self.outline,) = self.axes.plot([], [], color='black', linestyle='-', linewidth=12, zorder=0)
+        self.line = mpl.collections.LineCollection([], cmap=mpl.cm.plasma, linestyle='-', linewidth=5)
+        self.line.set_array(np.zeros(0))
+        self.axes.add_collection(self.line)
+        # Follows the line's colour limits through the mappable's change callback
+        self.colorbar = self.figure.colorbar(self.line, cax=self.figure.add_axes([0.25, 0.05, 0.5, 0.05]),
+                                             orientation='horizontal')
+        self.colorbar.set_label('Speed (km/h)', fontsize=12)
+        self._scene = None
+        self._background = None
+        self._fixed_bbox = None
+
+    def _set_scene(self, x: np.ndarray, y: np.ndarray, clim: Tuple[float, float]):
+        """Draw the fixed parts for this geometry and speed scale, unless they are already drawn"""
+        if self._scene is not None and self._scene[0] is x and self._scene[1] is y and self._scene[2] == clim:
+            return
+        points = np.column_stack([x, y]).reshape(-1, 1, 2)
+        self.line.set_segments(np.concatenate([points[:-1], points[1:]], axis=1))
+        self.line.set_clim(*clim)
+        self.outline.set_data(x, y)
+        self.axes.relim()
+        self.axes.autoscale_view()
+
+        self.line.set_visible(False)
+        self.title.set_visible(False)
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._fixed_bbox = self.figure.get_tightbbox(self.canvas.get_renderer()).transformed(self.figure.dpi_scale_trans)
+        self.line.set_visible(True)
+        self.title.set_visible(True)
+        self._scene = (x, y, clim)
+
+    def _bitmap(self, title: str, color: np.ndarray):
+        """Restore the fixed parts, draw the line and title and crop to what was drawn"""
+        from PIL import Image
+        # One colour per segment, from the speed at its start
+        self.line.set_array(color[:-1])
+        self.title.set_text(title)
+        self.canvas.restore_region(self._background)
+        self.axes.draw_artist(self.line)
+        self.figure.draw_artist(self.title)
+
+        bbox = mpl.transforms.Bbox.union([self._fixed_bbox, self.title.get_window_extent(self.canvas.get_renderer())])
+        width, height = self.canvas.get_width_height()
+        x0, x1 = max(0, int(bbox.x0) - PAD_PIXELS), min(width, int(np.ceil(bbox.x1)) + PAD_PIXELS)
+        y0, y1 = max(0, int(bbox.y0) - PAD_PIXELS), min(height, int(np.ceil(bbox.y1)) + PAD_PIXELS)
+        image = Image.frombuffer('RGBA', (width, height), self.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+        return image.crop((x0, height - y1, x1, height - y0)).convert('RGB')
+
+    def render(self, title: str, x: np.ndarray, y: np.ndarray, color: np.ndarray, sizes=('full',),
+               clim: Optional[Tuple[float, float]] = None) -> Dict[str, str]:
+        """Data URLs of one map at each of the given sizes; `clim` defaults to the map's own speed range"""
+        self._set_scene(x, y, clim or (float(color.min()), float(color.max())))
+        image = self._bitmap(title, color)
+        urls = {}
+        for size in sizes:
+            factor = RENDER_SIZES[size]
+            buffer = io.BytesIO()
+            # Run-length matching suits mostly black maps: faster than the default strategy and as small
+            (image.reduce(factor) if factor > 1 else image).save(buffer, format='png', compress_type=zlib.Z_RLE)
+            urls[size] = f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode()}"
+        return urls
+
+
+def renderer() -> SpeedMapRenderer:
+    """The calling thread's renderer, built on first use"""
+    if getattr(_local, 'renderer', None) is None:
+        _local.renderer = SpeedMapRenderer()
+    return _local.renderer
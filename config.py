@@ -0,0 +1,107 @@
+"""Runtime configuration read from environment variables.
+
+Every setting has a default suitable for local development; deployments
+override them through the environment.
+"""
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    try:
+        return int(value) if value not in (None, '') else default
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    try:
+        return float(value) if value not in (None, '') else default
+    except ValueError:
+        return default
+
+
+# Admin endpoints are disabled unless a token is configured
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# FastF1 on-disk cache
+FASTF1_CACHE_DIR = os.environ.get('FASTF1_CACHE_DIR', '/tmp/fastf1_cache')
+FASTF1_CACHE_MAX_MB = _env_int('FASTF1_CACHE_MAX_MB', 2048)
+FASTF1_CACHE_SWEEP_INTERVAL = _env_int('FASTF1_CACHE_SWEEP_INTERVAL', 300)  # seconds between eviction sweeps
+
+# Upstream data backend: 'live' talks to the F1 APIs, 'record' captures every
+# upstream response into F1_FIXTURE_ARCHIVE, 'replay' serves them from it and
+# 'synthetic' generates seeded sessions locally (synthetic.py)
+F1_BACKEND_MODE = os.environ.get('F1_BACKEND_MODE', 'live')
+F1_FIXTURE_ARCHIVE = os.environ.get('F1_FIXTURE_ARCHIVE', 'fixtures/sessions.zip')
+F1_REPLAY_LATENCY_MS = _env_float('F1_REPLAY_LATENCY_MS', 0.0)
+F1_REPLAY_JITTER_MS = _env_float('F1_REPLAY_JITTER_MS', 0.0)
+
+# Sizes of the seeded sessions served when F1_BACKEND_MODE=synthetic (and of
+# the demo fallback data); SYNTHETIC_LAPS=0 uses a typical count per session type
+SYNTHETIC_SEED = _env_int('SYNTHETIC_SEED', 0)
+SYNTHETIC_DRIVERS = _env_int('SYNTHETIC_DRIVERS', 20)
+SYNTHETIC_LAPS = _env_int('SYNTHETIC_LAPS', 0)
+SYNTHETIC_HZ = _env_float('SYNTHETIC_HZ', 10.0)
+SYNTHETIC_ROUNDS = _env_int('SYNTHETIC_ROUNDS', 24)
+
+# Request profiling: admins can force a profile with the X-Profile header;
+# otherwise PROFILE_SAMPLE_RATE of requests are sampled and kept when slower
+# than PROFILE_SLOW_MS
+PROFILE_DIR = os.environ.get('PROFILE_DIR', '/tmp/lapla_profiles')
+PROFILE_SAMPLE_RATE = _env_float('PROFILE_SAMPLE_RATE', 0.0)
+PROFILE_SLOW_MS = _env_float('PROFILE_SLOW_MS', 2000.0)
+PROFILE_INTERVAL_MS = _env_float('PROFILE_INTERVAL_MS', 5.0)
+PROFILE_MAX_COUNT = _env_int('PROFILE_MAX_COUNT', 200)
+
+# Logging: LOG_LEVEL applies to the root logger, LOG_LEVELS overrides single
+# loggers ("name=LEVEL,name=LEVEL"). DEBUG records are rate limited per logger
+# to LOG_DEBUG_RATE per second and sampled at LOG_DEBUG_SAMPLE.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'DEBUG')
+LOG_LEVELS = os.environ.get('LOG_LEVELS', 'urllib3=WARNING,requests_cache=WARNING,fastf1=INFO,matplotlib=WARNING,PIL=WARNING')
+LOG_DEBUG_RATE = _env_float('LOG_DEBUG_RATE', 20.0)
+LOG_DEBUG_SAMPLE = _env_float('LOG_DEBUG_SAMPLE', 1.0)
+LOG_QUEUE_SIZE = _env_int('LOG_QUEUE_SIZE', 10000)
+
+# Loaded sessions kept in memory per worker, and where request counts per
+# session are merged so the most popular sessions can be warmed at startup
+SESSION_CACHE_SIZE = _env_int('SESSION_CACHE_SIZE', 4)
+SESSION_POPULARITY_FILE = os.environ.get('SESSION_POPULARITY_FILE', os.path.join(FASTF1_CACHE_DIR, 'session_popularity.json'))
+
+# Season schedules and event metadata, persisted per backend mode and served
+# from memory; seasons older than SCHEDULE_TTL seconds are refreshed in the background
+SCHEDULE_STORE_FILE = os.environ.get('SCHEDULE_STORE_FILE', os.path.join(FASTF1_CACHE_DIR, f'schedule_store_{F1_BACKEND_MODE}.json'))
+SCHEDULE_TTL = _env_int('SCHEDULE_TTL', 6 * 3600)
+
+# Results derived from sessions (stints, models, all drivers' telemetry as one
+# entry) kept in memory per worker; a fully used session takes about ten entries
+DERIVED_CACHE_SIZE = _env_int('DERIVED_CACHE_SIZE', 64)
+# Encoded position-replay chunks kept per worker, so scrubbing back and forth is free
+REPLAY_CACHE_CHUNKS = _env_int('REPLAY_CACHE_CHUNKS', 256)
+# Rendered circuit maps (base64 PNGs, one entry per driver, lap and size set) kept per worker
+RENDER_CACHE_SIZE = _env_int('RENDER_CACHE_SIZE', 128)
+# Most sub-requests one POST /api/batch call may carry
+BATCH_MAX_REQUESTS = _env_int('BATCH_MAX_REQUESTS', 20)
+
+# Sessions the production entry point (wsgi.py) loads before gunicorn forks:
+# comma separated YEAR:ROUND:TYPE specs, 'latest' for the latest race weekend
+# and 'popular' for the HOT_SESSIONS_POPULAR_COUNT most requested sessions
+HOT_SESSIONS = os.environ.get('HOT_SESSIONS', 'latest,popular')
+HOT_SESSIONS_POPULAR_COUNT = _env_int('HOT_SESSIONS_POPULAR_COUNT', 3)
+
+# Derived per-session arrays shared by all workers as memory-mapped .npy
+# files; /dev/shm keeps them in RAM. Tables are kept apart per data source
+# (fastf1 or the synthetic generator settings, see shared_tables.data_source).
+# Least recently attached tables are evicted beyond SHARED_TABLES_MAX_MB.
+SHARED_TABLES_DIR = os.environ.get('SHARED_TABLES_DIR', '/dev/shm/lapla_tables' if os.path.isdir('/dev/shm') else '/tmp/lapla_tables')
+SHARED_TABLES_MAX_MB = _env_int('SHARED_TABLES_MAX_MB', 512)
+
+# Concurrency limits of the async service's executors, per operation type
+# ("pool=threads,..."): schedule/session metadata, lap tables, telemetry,
+# analysis aggregations and matplotlib rendering
+ASYNC_POOL_LIMITS = os.environ.get('ASYNC_POOL_LIMITS', 'schedule=4,laps=4,telemetry=4,analysis=2,render=2')
+
+# Cross-season warehouse (flask-sqlalchemy); SQLite locally, any
+# SQLAlchemy URL (e.g. Postgres via DATABASE_URL) in deployments
+WAREHOUSE_DATABASE_URL = os.environ.get('DATABASE_URL', 'sqlite:////tmp/lapla_warehouse.db').replace('postgres://', 'postgresql://', 1)
@@ -0,0 +1,98 @@
+"""Fuel-corrected pace over a session LapTable.
+
+Cars start a race with up to 110 kg of fuel and burn it roughly evenly over
+the distance, and every kilogram costs lap time, so raw lap times flatter
+the end of a stint. Each lap time is corrected to an empty tank with
+``models.fuel_correction`` (shared with the stint engine's degradation
+fits), for all drivers and laps at once, and per-driver summaries are
+reduced with ``np.bincount`` over the clean laps found by the stint engine.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from models import RACE_SESSIONS, LapTable, fuel_correction, optional_float
+from stints import StintAnalysis
+# Laps returned per driver for the trend chart
+TREND_LAPS = 10
+
+
+class FuelModel:
+    """Fuel-mass corrected lap times and per-driver pace summaries of a session"""
+
+    def __init__(self, table: LapTable, stints: StintAnalysis, session_type: str):
+        self.table = table
+        self.drivers = table.drivers
+        self.corrected = session_type in RACE_SESSIONS
+        self.fuel_per_lap, self.fuel_mass, self.corrected_lap_time = fuel_correction(table, session_type)
+
+        drivers = max(len(self.drivers), 1)
+        index = table.driver_index.astype(int)
+        known = index >= 0
+        valid = known & ~np.isnan(table.lap_time)
+        clean = known & stints.clean
+
+        self.laps = np.bincount(index[valid], minlength=drivers)
+        self.clean_laps = np.bincount(index[clean], minlength=drivers)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.mean_lap_time = np.bincount(index[valid], table.lap_time[valid], drivers) / self.laps
+            self.corrected_mean = (np.bincount(index[clean], self.corrected_lap_time[clean], drivers)
+                                   / self.clean_laps)
+        self.best_lap_time = np.full(drivers, np.inf)
+        np.minimum.at(self.best_lap_time, index[valid], table.lap_time[valid])
+        self.corrected_best = np.full(drivers, np.inf)
+        np.minimum.at(self.corrected_best, index[clean], self.corrected_lap_time[clean])
+        self.best_lap_time[np.isinf(self.best_lap_time)] = np.nan
+        self.corrected_best[np.isinf(self.corrected_best)] = np.nan
+
+        # Gap of each driver's corrected race pace to the quickest driver's
+        finite = self.corrected_mean[~np.isnan(self.corrected_mean)]
+        self.pace_gap = self.corrected_mean - (finite.min() if finite.size else np.nan)
+
+    def driver_summary(self, driver_code: str) -> Optional[Dict[str, Any]]:
+        """Fuel and pace summary of one driver, or None if they set no lap time"""
+        if driver_code not in self.drivers:
+            return None
+        i = self.drivers.index(driver_code)
+        if not self.laps[i]:
+            return None
+
+        rows = np.flatnonzero(self.table.driver_index == i)
+        rows = rows[np.argsort(self.table.lap_number[rows])]
+        rows = rows[~np.isnan(self.table.lap_time[rows])][-TREND_LAPS:]
+        compounds = self.table.compounds
+
+        corrected_mean, corrected_best = self.corrected_mean[i], self.corrected_best[i]
+        fuel_adjusted_pace = (corrected_mean - corrected_best) * 100 / corrected_best
+        if fuel_adjusted_pace != fuel_adjusted_pace:
+            fuel_adjusted_pace = 0.0
+        return {
+            'total_laps': int(self.laps[i]),
+            'clean_laps': int(self.clean_laps[i]),
+            'estimated_fuel_used': round(self.fuel_per_lap * int(self.laps[i]), 1),
+            'fuel_per_lap': round(self.fuel_per_lap, 2),
+            'fuel_adjusted_pace': round(float(fuel_adjusted_pace), 2),
+            'efficiency_rating': round(max(0.0, 100 - float(fuel_adjusted_pace) * 2), 1),
+            'avg_lap_time': optional_float(self.mean_lap_time[i], 3),
+            'best_lap_time': optional_float(self.best_lap_time[i], 3),
+            'fuel_corrected_avg': optional_float(corrected_mean, 3),
+            'fuel_corrected_best': optional_float(corrected_best, 3),
+            'pace_gap': optional_float(self.pace_gap[i], 3),
+            'stint_analysis': [{
+                'lap': int(self.table.lap_number[row]),
+                'time': optional_float(self.table.lap_time[row], 3),
+                'corrected_time': optional_float(self.corrected_lap_time[row], 3),
+                'fuel_kg': round(float(self.fuel_mass[row]), 1),
+                'compound': compounds[self.table.compound_code[row]] if self.table.compound_code[row] >= 0 else None,
+                'tyre_life': None if np.isnan(self.table.tyre_life[row]) else int(self.table.tyre_life[row])
+            } for row in rows]
+        }
+
+    def to_dict(self, driver_codes: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Summaries for the given drivers, or every driver in the session"""
+        summaries = {}
+        for driver_code in driver_codes or self.drivers:
+            summary = self.driver_summary(driver_code)
+            if summary is not None:
+                summaries[driver_code] = summary
+        return summaries
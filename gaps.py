@@ -0,0 +1,71 @@
+"""Gap to leader, interval to the car ahead and running position for the field.
+
+Lap end times (session time) go into a drivers x laps matrix. For every lap
+the drivers who completed it are ranked by when they crossed the line, which
+gives positions, and the differences between consecutive crossings give the
+intervals, for all laps at once with one ``argsort`` along the driver axis.
+Lapped cars are found by counting how many times the leader had crossed the
+line (``np.searchsorted`` over the leader's crossing times) when the car
+completed its lap.
+"""
+from typing import Any, Dict
+
+import numpy as np
+
+from models import LapTable, optional_floats
+
+
+class GapTimeline:
+    """Per-lap position, gap to leader, interval and laps down for every driver"""
+
+    def __init__(self, table: LapTable):
+        self.drivers = table.drivers
+        known = (table.driver_index >= 0) & (table.lap_number > 0) & ~np.isnan(table.lap_end_time)
+        laps = int(table.lap_number[known].max()) if known.any() else 0
+        self.laps = laps
+
+        # crossing[d, n]: session time when driver d completed lap n + 1
+        crossing = np.full((len(self.drivers), laps), np.nan)
+        crossing[table.driver_index[known], table.lap_number[known] - 1] = table.lap_end_time[known]
+
+        completed = ~np.isnan(crossing)
+        order = np.argsort(np.where(completed, crossing, np.inf), axis=0, kind='stable')
+        ranked = np.take_along_axis(crossing, order, axis=0)
+
+        self.position = np.full(crossing.shape, np.nan)
+        np.put_along_axis(self.position, order, np.arange(1, len(self.drivers) + 1, dtype=float)[:, None], axis=0)
+        self.position[~completed] = np.nan
+
+        interval = np.full(crossing.shape, np.nan)
+        if len(self.drivers):
+            sorted_interval = np.vstack([np.zeros((1, laps)), np.diff(ranked, axis=0)])
+            np.put_along_axis(interval, order, sorted_interval, axis=0)
+        self.interval = np.where(completed, interval, np.nan)
+
+        # The leader's line crossings: the first car to complete each lap
+        leader_crossing = np.where(completed, crossing, np.inf).min(axis=0, initial=np.inf)
+        leader_crossing[np.isinf(leader_crossing)] = np.nan
+        self.gap = crossing - leader_crossing[None, :]
+        self.leader = [self.drivers[order[0, lap]] if completed[order[0, lap], lap] else None for lap in range(laps)]
+
+        # Laps down: leader crossings up to the moment a car completes a lap, minus the laps it has done
+        line = np.fmax.accumulate(np.nan_to_num(leader_crossing, nan=-np.inf))
+        crossings_before = np.searchsorted(line, np.where(completed, crossing, 0.0), side='right')
+        laps_down = crossings_before - np.arange(1, laps + 1)[None, :]
+        self.laps_down = np.where(completed, np.maximum(laps_down, 0), -1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Columnar payload: one list per metric per driver, indexed by lap"""
+        return {
+            'laps': list(range(1, self.laps + 1)),
+            'leader': self.leader,
+            'drivers': {
+                driver: {
+                    'position': [None if value != value else int(value) for value in self.position[i].tolist()],
+                    'gap': optional_floats(self.gap[i], 3),
+                    'interval': optional_floats(self.interval[i], 3),
+                    'laps_down': [None if value < 0 else value for value in self.laps_down[i].tolist()],
+                }
+                for i, driver in enumerate(self.drivers)
+            }
+        }
@@ -0,0 +1,33 @@
+"""Gunicorn settings for the production entry point: gunicorn -c gunicorn.conf.py wsgi:app"""
+import gc
+import os
+import sys
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# With more than one thread gunicorn uses gthread workers. Every request, async
+# views included, holds one thread until it is answered, so this is how many
+# requests a worker serves at once
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+wsgi_app = 'wsgi:app'
+
+# Import the app and warm hot sessions once in the master, then fork
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+
+def when_ready(server):
+    # Move everything the master allocated into the permanent generation so
+    # the workers' garbage collector does not touch (and copy) those pages
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Connections, the HTTP cache's SQLite handle and the warehouse pool must not be shared with the master
+    from cache_manager import reset_after_fork
+    reset_after_fork()
+    # The warehouse is imported on first use, so usually not yet in the master
+    warehouse = sys.modules.get('warehouse')
+    if warehouse is not None:
+        warehouse.reset_after_fork()
@@ -0,0 +1,87 @@
+import importlib
+import threading
+from typing import Callable, Optional, Sequence
+
+import click
+
+
+class LazyModule:
+    """Module proxy that performs the real import on first attribute access.
+
+    Heavy dependencies (fastf1, pandas, matplotlib) take over a second to import,
+    which every worker spawn and every page would otherwise pay even when it
+    never touches F1 data.
+    """
+
+    def __init__(self, name: str, on_import: Optional[Callable] = None, requires: Sequence['LazyModule'] = ()):
+        self._name = name
+        self._on_import = on_import
+        self._requires = tuple(requires)
+        self._module = None
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    for dependency in self._requires:
+                        dependency._load()
+                    module = importlib.import_module(self._name)
+                    if self._on_import:
+                        self._on_import(module)
+                    self._module = module
+        return self._module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+class LazyGroup(click.Group):
+    """Click group whose commands are defined in a module imported only when the group is used.
+
+    ``flask --help`` and app startup list the group by name without loading
+    the module behind it.
+    """
+
+    def __init__(self, name: str, import_path: str, **kwargs):
+        super().__init__(name, **kwargs)
+        self._import_path = import_path
+
+    def _group(self) -> click.Group:
+        module, _, attr = self._import_path.partition(':')
+        return getattr(importlib.import_module(module), attr)
+
+    def list_commands(self, ctx):
+        return self._group().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self._group().get_command(ctx, name)
+
+
+def _configure_matplotlib(module):
+    """Select the non-interactive backend before pyplot is imported"""
+    module.use('Agg')
+    for submodule in ('matplotlib.pyplot', 'matplotlib.collections', 'matplotlib.colorbar', 'matplotlib.backends.backend_agg'):
+        importlib.import_module(submodule)
+
+
+def _configure_fastf1(module):
+    """Send fastf1's log output through the application's queue handler"""
+    import logging_setup
+    logging_setup.adopt_logger('fastf1')
+
+
+fastf1 = LazyModule('fastf1', on_import=_configure_fastf1)
+pd = LazyModule('pandas')
+mpl = LazyModule('matplotlib', on_import=_configure_matplotlib)
+plt = LazyModule('matplotlib.pyplot', requires=(mpl,))
+# SQLAlchemy alone takes about half a second to import; only the warehouse endpoints and CLI need it
+warehouse = LazyModule('warehouse')
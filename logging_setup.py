@@ -0,0 +1,135 @@
+"""Queue-based logging.
+
+Request threads only format a record and push it onto a bounded queue; a
+QueueListener thread writes it to stderr. Per-logger levels come from
+config.LOG_LEVELS and DEBUG records are rate limited and sampled per logger,
+so chatty libraries cannot add latency to requests.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+from typing import Dict
+
+import config
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+_listener_lock = threading.Lock()
+_listener = None
+_listener_pid = None
+_queue = None
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """Parse 'name=LEVEL,name=LEVEL' into logger levels, skipping bad entries"""
+    levels = {}
+    for entry in (spec or '').split(','):
+        name, _, level = entry.partition('=')
+        level = logging.getLevelName(level.strip().upper())
+        if name.strip() and isinstance(level, int):
+            levels[name.strip()] = level
+    return levels
+
+
+class DebugSampler(logging.Filter):
+    """Rate-limit and sample DEBUG records per logger; other levels pass"""
+
+    def __init__(self, rate: float, sample: float):
+        super().__init__()
+        self.rate = rate
+        self.sample = sample
+        self.dropped = 0
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if self.sample < 1.0 and random.random() >= self.sample:
+            self.dropped += 1
+            return False
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            # Token bucket per logger, refilled at `rate` tokens per second
+            bucket = self._buckets.setdefault(record.name, [self.rate, now])
+            bucket[0] = min(self.rate, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                self.dropped += 1
+                return False
+            bucket[0] -= 1
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        _ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _ensure_listener():
+    """Start the writer thread, again after a fork since threads do not survive it"""
+    global _listener, _listener_pid
+    if _listener_pid == os.getpid():
+        return
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        _listener = logging.handlers.QueueListener(_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        _listener_pid = os.getpid()
+
+
+def _stop_listener():
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+
+
+def adopt_logger(name: str):
+    """Route a library logger that installs its own handler through the queue"""
+    logger = logging.getLogger(name)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.propagate = True
+    level = parse_levels(config.LOG_LEVELS).get(name)
+    if level is not None:
+        logger.setLevel(level)
+
+
+def configure_logging():
+    """Install the queue handler on the root logger and apply configured levels"""
+    global _queue
+    if _queue is not None:
+        return
+    _queue = queue.Queue(maxsize=config.LOG_QUEUE_SIZE)
+    handler = NonBlockingQueueHandler(_queue)
+    handler.addFilter(DebugSampler(config.LOG_DEBUG_RATE, config.LOG_DEBUG_SAMPLE))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(parse_levels(f"root={config.LOG_LEVEL}").get('root', logging.INFO))
+    for name, level in parse_levels(config.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _ensure_listener()
+    atexit.register(_stop_listener)
@@ -0,0 +1,256 @@
+"""Request stage timing (Server-Timing headers) and Prometheus metrics.
+
+Service code wraps expensive steps in ``stage('name')``; durations accumulate
+per request through a context variable and are emitted as a Server-Timing
+header. Metrics are kept per process, so each gunicorn worker exposes its own
+series on /metrics.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_request_stages: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar('request_stages', default=None)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return self.header() + [f"{self.name}{_format_labels(self.label_names, key)} {value}"
+                                for key, value in sorted(values.items())]
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def render(self) -> List[str]:
+        if self._callback is not None:
+            try:
+                values = self._callback()
+            except Exception:
+                values = {}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return self.header() + [f"{self.name}{_format_labels(self.label_names, key)} {value}"
+                                for key, value in sorted(values.items()) if value is not None]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                labels = _format_labels(self.label_names, key, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUEST_DURATION = REGISTRY.register(Histogram(
+    'lapla_request_duration_seconds', 'HTTP request latency by route', ('route', 'method', 'status')))
+STAGE_DURATION = REGISTRY.register(Histogram(
+    'lapla_stage_duration_seconds', 'Time spent in timed service stages', ('stage',)))
+SESSION_LOADS = REGISTRY.register(Counter(
+    'lapla_session_loads_total', 'fastf1 session loads by data loaded', ('kind',)))
+SESSION_LOAD_DURATION = REGISTRY.register(Histogram(
+    'lapla_session_load_duration_seconds', 'fastf1 session.load duration by data loaded', ('kind',)))
+RENDER_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    'lapla_render_queue_depth', 'Circuit renders waiting or in progress'))
+RENDERS = REGISTRY.register(Counter('lapla_renders_total', 'Completed circuit renders'))
+
+
+def _http_cache_counts():
+    from cache_manager import get_cache_manager
+    stats = get_cache_manager().get_stats()['http_cache']
+    return {('hit',): stats['hits'], ('miss',): stats['misses']}
+
+
+def _http_cache_ratio():
+    from cache_manager import get_cache_manager
+    return {(): get_cache_manager().get_stats()['http_cache']['hit_ratio']}
+
+
+HTTP_CACHE_REQUESTS = REGISTRY.register(Gauge(
+    'lapla_fastf1_http_requests', 'fastf1 HTTP requests answered from cache or network', ('result',),
+    callback=_http_cache_counts))
+HTTP_CACHE_HIT_RATIO = REGISTRY.register(Gauge(
+    'lapla_fastf1_http_cache_hit_ratio', 'Share of fastf1 HTTP requests answered from the cache',
+    callback=_http_cache_ratio))
+
+
+def record_stage(name: str, seconds: float):
+    """Add a measured duration to the current request's stages and the stage histogram"""
+    STAGE_DURATION.observe(seconds, stage=name)
+    stages = _request_stages.get()
+    if stages is not None:
+        stages[name] = stages.get(name, 0.0) + seconds
+
+
+def stage_total(name: str) -> float:
+    """Seconds recorded so far for a stage in the current request"""
+    stages = _request_stages.get()
+    return stages.get(name, 0.0) if stages else 0.0
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as a named stage of the current request"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+def server_timing_header(stages: Dict[str, float], total: float) -> str:
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in stages.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(entries)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that records response encoding as the 'json' stage"""
+
+    def response(self, *args, **kwargs):
+        with stage('json'):
+            return super().response(*args, **kwargs)
+
+
+def init_app(app):
+    """Install request timing hooks, the timed JSON provider and the /metrics endpoint"""
+    app.json = TimedJSONProvider(app)
+
+    @app.before_request
+    def _start_request_timing():
+        request.environ['lapla.start'] = time.perf_counter()
+        request.environ['lapla.stages_token'] = _request_stages.set({})
+
+    @app.after_request
+    def _finish_request_timing(response):
+        start = request.environ.get('lapla.start')
+        if start is None:
+            return response
+        total = time.perf_counter() - start
+        stages = _request_stages.get() or {}
+        response.headers['Server-Timing'] = server_timing_header(stages, total)
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_DURATION.observe(total, route=route, method=request.method, status=response.status_code)
+        return response
+
+    @app.teardown_request
+    def _reset_request_timing(exc):
+        token = request.environ.pop('lapla.stages_token', None)
+        if token is not None:
+            try:
+                _request_stages.reset(token)
+            except ValueError:
+                _request_stages.set(None)
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        """Prometheus text exposition of this worker's metrics"""
+        return REGISTRY.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
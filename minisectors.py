@@ -0,0 +1,85 @@
+"""Mini-sector dominance: who is fastest on each part of the lap.
+
+The lap is split into N equal-distance mini-sectors and every driver's time
+at each boundary is interpolated from their lap telemetry. Boundaries are
+fractions of the lap, and each driver's distance is divided by their own
+lap length: distance is integrated from speed, so it differs by a few
+metres between drivers, and fixed metre boundaries would hand drivers with
+a short integrated lap every boundary early. The boundary times form a
+drivers x (N + 1) matrix whose row differences are the mini-sector times.
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from models import optional_floats
+
+DEFAULT_MINISECTORS = 25
+MAX_MINISECTORS = 200
+
+
+def _lap_fraction(distance: np.ndarray) -> np.ndarray:
+    """Distance along the lap as a fraction of the lap's own length"""
+    distance = np.asarray(distance, dtype=float)
+    if distance[-1] > 0:
+        return distance / distance[-1]
+    return np.linspace(0.0, 1.0, len(distance))
+
+
+class MiniSectorDominance:
+    """Mini-sector times of one lap per driver and the fastest driver in each mini-sector"""
+
+    def __init__(self, laps: Dict[str, Dict[str, np.ndarray]], count: int, reference_driver: Optional[str] = None):
+        """`laps` maps driver codes to lap telemetry slices (distance, time, x, y from DriverTelemetry.lap())"""
+        self.count = count
+        self.drivers = [driver for driver, lap in laps.items() if lap is not None and len(lap['distance']) > 1]
+        if not self.drivers:
+            raise ValueError('no lap telemetry to compare')
+        lengths = np.array([laps[driver]['distance'][-1] for driver in self.drivers], dtype=float)
+        self.lap_length = float(np.median(lengths))
+        fractions = np.linspace(0.0, 1.0, count + 1)
+        self.boundaries = fractions * self.lap_length
+
+        boundary_times = np.empty((len(self.drivers), count + 1))
+        for i, driver in enumerate(self.drivers):
+            lap = laps[driver]
+            boundary_times[i] = np.interp(fractions, _lap_fraction(lap['distance']), lap['time'])
+
+        self.times = np.diff(boundary_times, axis=1)
+        filled = np.where(np.isnan(self.times), np.inf, self.times)
+        self.fastest = np.argmin(filled, axis=0)
+        self.best = filled[self.fastest, np.arange(count)]
+        self.best[np.isinf(self.best)] = np.nan
+        self.deltas = self.times - self.best[None, :]
+
+        # Reference path for colouring the circuit: the given driver's lap, split at the boundaries
+        reference = laps[reference_driver] if reference_driver in self.drivers else laps[self.drivers[0]]
+        self.path_x = np.asarray(reference['x'], dtype=float)
+        self.path_y = np.asarray(reference['y'], dtype=float)
+        self.path_sector = np.clip(np.searchsorted(fractions, _lap_fraction(reference['distance']), side='right') - 1,
+                                   0, count - 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        dominance = [self.drivers[index] if not np.isnan(best) else None
+                     for index, best in zip(self.fastest.tolist(), self.best.tolist())]
+        won = {driver: dominance.count(driver) for driver in self.drivers}
+        return {
+            'minisectors': self.count,
+            'lap_length': round(self.lap_length, 1),
+            'boundaries': optional_floats(self.boundaries, 1),
+            'dominance': dominance,
+            'best_times': optional_floats(self.best, 3),
+            'drivers': {
+                driver: {
+                    'times': optional_floats(self.times[i], 3),
+                    'deltas': optional_floats(self.deltas[i], 3),
+                    'minisectors_won': won[driver]
+                }
+                for i, driver in enumerate(self.drivers)
+            },
+            'track': {
+                'x': optional_floats(self.path_x, 1),
+                'y': optional_floats(self.path_y, 1),
+                'minisector': self.path_sector.tolist()
+            }
+        }
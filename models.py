@@ -1,6 +1,6 @@
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
-import pandas as pd
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Sequence, Tuple
+import numpy as np
 
 @dataclass
 class SessionInfo:
@@ -31,13 +31,16 @@ class LapData:
 
 @dataclass
 class TelemetryData:
-    distance: List[float]
-    speed: List[float]
-    throttle: List[float]
-    brake: List[float]
-    gear: List[int]
-    drs: List[int]
-    time: List[float]
+    # Channels left out of a field projection are None
+    distance: Optional[List[float]]
+    speed: Optional[List[float]]
+    throttle: Optional[List[float]]
+    brake: Optional[List[float]]
+    gear: Optional[List[int]]
+    drs: Optional[List[int]]
+    time: Optional[List[float]]
+
+TELEMETRY_FIELDS = ('distance', 'speed', 'throttle', 'brake', 'gear', 'drs', 'time')
 
 @dataclass
 class TrackData:
@@ -46,3 +49,324 @@ class TrackData:
     distance_markers: List[float]
     corner_numbers: List[int]
     sector_boundaries: List[float]
+
+
+def optional_float(value, digits: Optional[int] = None) -> Optional[float]:
+    """A NaN-able value as a Python float (rounded to `digits` if given), None for NaN"""
+    if value != value:
+        return None
+    return float(value) if digits is None else round(float(value), digits)
+
+
+def optional_floats(values, digits: int) -> List[Optional[float]]:
+    """A NaN-able array as a list of floats rounded to `digits`, None for NaN (JSON has no NaN)"""
+    return [None if value != value else value for value in np.round(np.asarray(values, dtype=float), digits).tolist()]
+
+
+def _seconds_column(laps, column: str) -> np.ndarray:
+    """Convert a timedelta column of a laps DataFrame to float seconds (NaN when missing)"""
+    if column not in laps.columns:
+        return np.full(len(laps), np.nan)
+    return laps[column].dt.total_seconds().to_numpy(dtype=float, na_value=np.nan)
+
+
+def _float_column(laps, column: str) -> np.ndarray:
+    """Convert a numeric column of a laps DataFrame to floats (NaN when missing)"""
+    if column not in laps.columns:
+        return np.full(len(laps), np.nan)
+    return laps[column].to_numpy(dtype=float, na_value=np.nan)
+
+
+def _category_column(laps, column: str):
+    """Factorize a string column into int16 codes (-1 when missing) and its categories"""
+    if column not in laps.columns:
+        return np.full(len(laps), -1, dtype=np.int16), ()
+    codes, uniques = laps[column].factorize()
+    return codes.astype(np.int16), tuple(str(value) for value in uniques)
+
+
+class LapRow:
+    """Read-only view of a single lap inside a LapTable (same attributes as LapData)"""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'LapTable', index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def lap_number(self) -> int:
+        return int(self._table.lap_number[self._index])
+
+    @property
+    def lap_time(self) -> Optional[float]:
+        return optional_float(self._table.lap_time[self._index])
+
+    @property
+    def sector_1_time(self) -> Optional[float]:
+        return optional_float(self._table.sector_1_time[self._index])
+
+    @property
+    def sector_2_time(self) -> Optional[float]:
+        return optional_float(self._table.sector_2_time[self._index])
+
+    @property
+    def sector_3_time(self) -> Optional[float]:
+        return optional_float(self._table.sector_3_time[self._index])
+
+    @property
+    def is_personal_best(self) -> bool:
+        return bool(self._table.is_personal_best[self._index])
+
+    @property
+    def compound(self) -> Optional[str]:
+        code = self._table.compound_code[self._index]
+        return self._table.compounds[code] if code >= 0 else None
+
+    @property
+    def tyre_life(self) -> Optional[int]:
+        value = self._table.tyre_life[self._index]
+        return None if np.isnan(value) else int(value)
+
+    @property
+    def driver_code(self) -> Optional[str]:
+        code = self._table.driver_index[self._index]
+        return self._table.drivers[code] if code >= 0 else None
+
+    def to_lap_data(self) -> LapData:
+        return LapData(self.lap_number, self.lap_time, self.sector_1_time, self.sector_2_time,
+                       self.sector_3_time, self.is_personal_best, self.compound, self.tyre_life)
+
+    def __repr__(self) -> str:
+        return f"LapRow(driver={self.driver_code!r}, lap_number={self.lap_number}, lap_time={self.lap_time})"
+
+
+class LapTable:
+    """Columnar lap timing data backed by NumPy arrays.
+
+    Times are float seconds with NaN for missing values, compounds and drivers
+    are stored as int16 codes into the ``compounds``/``drivers`` tuples (-1 when
+    missing). ``stint`` is NaN when unknown, ``is_pit_lap`` marks in and out
+    laps, ``lap_start_time``/``lap_end_time`` are session time in seconds.
+    Iterating yields LapRow views so templates can keep using ``lap.lap_time``
+    style attribute access.
+    """
+
+    TIME_COLUMNS = ('lap_time', 'sector_1_time', 'sector_2_time', 'sector_3_time')
+    ARRAY_COLUMNS = ('lap_number', 'lap_time', 'sector_1_time', 'sector_2_time', 'sector_3_time',
+                     'compound_code', 'tyre_life', 'is_personal_best', 'driver_index', 'stint', 'is_pit_lap',
+                     'lap_start_time', 'lap_end_time')
+    # Keys of to_records() dicts, in LapData field order
+    RECORD_FIELDS = ('lap_number', 'lap_time', 'sector_1_time', 'sector_2_time', 'sector_3_time',
+                     'is_personal_best', 'compound', 'tyre_life')
+
+    def __init__(self, lap_number: np.ndarray, lap_time: np.ndarray, sector_1_time: np.ndarray,
+                 sector_2_time: np.ndarray, sector_3_time: np.ndarray, compound_code: np.ndarray,
+                 tyre_life: np.ndarray, is_personal_best: np.ndarray, driver_index: Optional[np.ndarray] = None,
+                 stint: Optional[np.ndarray] = None, is_pit_lap: Optional[np.ndarray] = None,
+                 lap_start_time: Optional[np.ndarray] = None, lap_end_time: Optional[np.ndarray] = None,
+                 compounds: Sequence[str] = (), drivers: Sequence[str] = ()):
+        self.lap_number = np.asarray(lap_number, dtype=np.int32)
+        self.lap_time = np.asarray(lap_time, dtype=float)
+        self.sector_1_time = np.asarray(sector_1_time, dtype=float)
+        self.sector_2_time = np.asarray(sector_2_time, dtype=float)
+        self.sector_3_time = np.asarray(sector_3_time, dtype=float)
+        self.compound_code = np.asarray(compound_code, dtype=np.int16)
+        self.tyre_life = np.asarray(tyre_life, dtype=float)
+        self.is_personal_best = np.asarray(is_personal_best, dtype=bool)
+        if driver_index is None:
+            driver_index = np.full(len(self.lap_number), -1, dtype=np.int16)
+        self.driver_index = np.asarray(driver_index, dtype=np.int16)
+        if stint is None:
+            stint = np.full(len(self.lap_number), np.nan)
+        self.stint = np.asarray(stint, dtype=float)
+        if is_pit_lap is None:
+            is_pit_lap = np.zeros(len(self.lap_number), dtype=bool)
+        self.is_pit_lap = np.asarray(is_pit_lap, dtype=bool)
+        if lap_start_time is None:
+            lap_start_time = np.full(len(self.lap_number), np.nan)
+        self.lap_start_time = np.asarray(lap_start_time, dtype=float)
+        if lap_end_time is None:
+            lap_end_time = np.full(len(self.lap_number), np.nan)
+        self.lap_end_time = np.asarray(lap_end_time, dtype=float)
+        self.compounds = tuple(compounds)
+        self.drivers = tuple(drivers)
+
+    @classmethod
+    def empty(cls) -> 'LapTable':
+        return cls.from_records([])
+
+    @classmethod
+    def from_laps(cls, laps) -> 'LapTable':
+        """Build a table from a fastf1 Laps DataFrame in one vectorized pass"""
+        compound_code, compounds = _category_column(laps, 'Compound')
+        driver_index, drivers = _category_column(laps, 'Driver')
+        if 'IsPersonalBest' in laps.columns:
+            is_personal_best = laps['IsPersonalBest'].eq(True).to_numpy(dtype=bool)
+        else:
+            is_personal_best = np.zeros(len(laps), dtype=bool)
+        is_pit_lap = np.zeros(len(laps), dtype=bool)
+        for column in ('PitInTime', 'PitOutTime'):
+            if column in laps.columns:
+                is_pit_lap |= laps[column].notna().to_numpy(dtype=bool)
+        return cls(
+            lap_number=np.nan_to_num(_float_column(laps, 'LapNumber'), nan=0),
+            lap_time=_seconds_column(laps, 'LapTime'),
+            sector_1_time=_seconds_column(laps, 'Sector1Time'),
+            sector_2_time=_seconds_column(laps, 'Sector2Time'),
+            sector_3_time=_seconds_column(laps, 'Sector3Time'),
+            compound_code=compound_code,
+            tyre_life=_float_column(laps, 'TyreLife'),
+            is_personal_best=is_personal_best,
+            driver_index=driver_index,
+            stint=_float_column(laps, 'Stint'),
+            is_pit_lap=is_pit_lap,
+            lap_start_time=_seconds_column(laps, 'LapStartTime'),
+            lap_end_time=_seconds_column(laps, 'Time'),
+            compounds=compounds,
+            drivers=drivers
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> 'LapTable':
+        """Rebuild a table from to_arrays() output without copying the arrays"""
+        return cls(**{name: arrays[name] for name in cls.ARRAY_COLUMNS},
+                   compounds=meta.get('compounds', ()), drivers=meta.get('drivers', ()))
+
+    def to_arrays(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Column arrays plus the category metadata needed by from_arrays()"""
+        arrays = {name: getattr(self, name) for name in self.ARRAY_COLUMNS}
+        return arrays, {'compounds': list(self.compounds), 'drivers': list(self.drivers)}
+
+    @classmethod
+    def from_records(cls, laps: Iterable[LapData], driver_code: Optional[str] = None) -> 'LapTable':
+        """Build a table from LapData records (used by the sample data generators)"""
+        laps = list(laps)
+        compounds = tuple(dict.fromkeys(lap.compound for lap in laps if lap.compound))
+        compound_lookup = {name: code for code, name in enumerate(compounds)}
+
+        def _nan(value):
+            return np.nan if value is None else value
+
+        return cls(
+            lap_number=[lap.lap_number for lap in laps],
+            lap_time=[_nan(lap.lap_time) for lap in laps],
+            sector_1_time=[_nan(lap.sector_1_time) for lap in laps],
+            sector_2_time=[_nan(lap.sector_2_time) for lap in laps],
+            sector_3_time=[_nan(lap.sector_3_time) for lap in laps],
+            compound_code=[compound_lookup.get(lap.compound, -1) for lap in laps],
+            tyre_life=[_nan(lap.tyre_life) for lap in laps],
+            is_personal_best=[bool(lap.is_personal_best) for lap in laps],
+            driver_index=[0 if driver_code else -1] * len(laps),
+            compounds=compounds,
+            drivers=(driver_code,) if driver_code else ()
+        )
+
+    def __len__(self) -> int:
+        return len(self.lap_number)
+
+    def __iter__(self) -> Iterator[LapRow]:
+        return (LapRow(self, index) for index in range(len(self)))
+
+    def __getitem__(self, index: int) -> LapRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('lap index out of range')
+        return LapRow(self, index)
+
+    def __repr__(self) -> str:
+        return f"LapTable(laps={len(self)}, drivers={list(self.drivers)})"
+
+    def filter(self, mask) -> 'LapTable':
+        """Return a new table with the rows selected by a boolean mask or index array"""
+        return LapTable(*(getattr(self, column)[mask] for column in self.ARRAY_COLUMNS),
+                        compounds=self.compounds, drivers=self.drivers)
+
+    def for_driver(self, driver_code: str) -> 'LapTable':
+        """Return the laps of a single driver"""
+        if driver_code not in self.drivers:
+            return self.filter(np.zeros(len(self), dtype=bool))
+        return self.filter(self.driver_index == self.drivers.index(driver_code))
+
+    def valid(self) -> 'LapTable':
+        """Return laps that have a recorded lap time"""
+        return self.filter(~np.isnan(self.lap_time))
+
+    def with_sectors(self) -> 'LapTable':
+        """Return laps that have all three sector times"""
+        return self.filter(~(np.isnan(self.sector_1_time) | np.isnan(self.sector_2_time) | np.isnan(self.sector_3_time)))
+
+    def values(self, column: str = 'lap_time') -> np.ndarray:
+        """Return the non-missing values of a time column"""
+        data = getattr(self, column)
+        return data[~np.isnan(data)]
+
+    def best(self, column: str = 'lap_time') -> Optional[float]:
+        data = self.values(column)
+        return float(data.min()) if data.size else None
+
+    def mean(self, column: str = 'lap_time') -> Optional[float]:
+        data = self.values(column)
+        return float(data.mean()) if data.size else None
+
+    def std(self, column: str = 'lap_time') -> Optional[float]:
+        data = self.values(column)
+        return float(data.std()) if data.size else None
+
+    def compound_names(self) -> List[str]:
+        """Return the distinct compounds used in this table"""
+        return [self.compounds[code] for code in np.unique(self.compound_code) if code >= 0]
+
+    def lap_range(self, first: Optional[int] = None, last: Optional[int] = None) -> 'LapTable':
+        """Return laps numbered from `first` to `last` inclusive (either end may be None)"""
+        if first is None and last is None:
+            return self
+        mask = np.ones(len(self), dtype=bool)
+        if first is not None:
+            mask &= self.lap_number >= first
+        if last is not None:
+            mask &= self.lap_number <= last
+        return self.filter(mask)
+
+    def to_records(self, fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Convert to a list of plain dicts keyed like LapData fields, converting only `fields` if given"""
+        def _column(values):
+            return [None if value != value else value for value in values.tolist()]
+
+        converters = {
+            'lap_number': lambda: self.lap_number.tolist(),
+            'lap_time': lambda: _column(self.lap_time),
+            'sector_1_time': lambda: _column(self.sector_1_time),
+            'sector_2_time': lambda: _column(self.sector_2_time),
+            'sector_3_time': lambda: _column(self.sector_3_time),
+            'is_personal_best': lambda: self.is_personal_best.tolist(),
+            'compound': lambda: [self.compounds[code] if code >= 0 else None for code in self.compound_code.tolist()],
+            'tyre_life': lambda: [None if value != value else int(value) for value in self.tyre_life.tolist()],
+        }
+        names = [name for name in self.RECORD_FIELDS if fields is None or name in fields]
+        if not names:
+            return [{} for _ in range(len(self))]
+        columns = [converters[name]() for name in names]
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+# Regulation maximum fuel load at the start of a race
+FUEL_START_KG = 110.0
+# Lap time cost of carrying one kilogram of fuel
+FUEL_TIME_PER_KG = 0.03
+# Sessions run from a full tank; other sessions carry unknown fuel loads and are left uncorrected
+RACE_SESSIONS = ('R', 'S')
+
+
+def fuel_correction(table: LapTable, session_type: str) -> Tuple[float, np.ndarray, np.ndarray]:
+    """Fuel burnt per lap, fuel on board halfway through each lap and lap times corrected to an empty tank.
+
+    Races start with FUEL_START_KG and burn it evenly over the session's laps;
+    every kilogram costs FUEL_TIME_PER_KG. Other sessions get no correction.
+    """
+    race_laps = int(table.lap_number.max()) if len(table) else 0
+    fuel_per_lap = FUEL_START_KG / race_laps if session_type in RACE_SESSIONS and race_laps else 0.0
+    start_fuel = FUEL_START_KG if session_type in RACE_SESSIONS else 0.0
+    fuel_mass = np.clip(start_fuel - fuel_per_lap * (table.lap_number - 0.5), 0.0, None)
+    return fuel_per_lap, fuel_mass, table.lap_time - FUEL_TIME_PER_KG * fuel_mass
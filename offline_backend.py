@@ -0,0 +1,289 @@
+"""Offline record/replay stand-in for the upstream APIs used by fastf1.
+
+fastf1 sends every live timing and Ergast request through the two requests
+sessions held by ``fastf1.Cache``. This module mounts transport adapters on
+those sessions: in record mode responses are captured into a zip fixture
+archive, in replay mode they are served from it (with optional latency) and
+anything missing fails loudly instead of reaching the network.
+
+Record sessions into an archive (uses a throwaway cache so every request is
+really fetched):
+    python offline_backend.py record fixtures/bahrain_2023.zip 2023:1:R 2023:1:Q
+
+Replay them:
+    F1_BACKEND_MODE=replay F1_FIXTURE_ARCHIVE=fixtures/bahrain_2023.zip \
+    F1_REPLAY_LATENCY_MS=40 gunicorn main:app
+"""
+import argparse
+import atexit
+import hashlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+import config
+from lazy_imports import fastf1
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+INDEX_NAME = 'index.json'
+
+# Headers describing the wire encoding; bodies are stored decoded
+_DROPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+
+
+def request_key(method: str, url: str, body=None) -> str:
+    """Stable key for a request: method, URL with sorted query and body hash"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    normalized = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+    if isinstance(body, str):
+        body = body.encode()
+    digest = hashlib.sha1(f"{method.upper()} {normalized}".encode())
+    if body:
+        digest.update(body)
+    return digest.hexdigest()
+
+
+class FixtureArchive:
+    """Zip file of recorded upstream responses plus an index of sessions they cover"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.sessions: List[Tuple[int, int, str]] = []
+        self._bodies: Dict[str, bytes] = {}
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if os.path.exists(path):
+            self._zip = zipfile.ZipFile(path)
+            index = json.loads(self._zip.read(INDEX_NAME))
+            if index.get('version') != ARCHIVE_VERSION:
+                raise ValueError(f"Unsupported fixture archive version in {path}")
+            self.entries = index['entries']
+            self.sessions = [tuple(session) for session in index['sessions']]
+
+    def add(self, request, response):
+        """Store the response to a prepared request"""
+        key = request_key(request.method, request.url, request.body)
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in _DROPPED_HEADERS}
+        with self._lock:
+            self.entries[key] = {
+                'method': request.method,
+                'url': request.url,
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': headers
+            }
+            self._bodies[key] = response.content
+
+    def get(self, request) -> Optional[Tuple[Dict, bytes]]:
+        """Look up the recorded entry and body for a prepared request"""
+        key = request_key(request.method, request.url, request.body)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            body = self._bodies.get(key)
+            if body is None:
+                body = self._zip.read(f"bodies/{key}")
+        return entry, body
+
+    def add_session(self, year: int, round_number: int, session_type: str):
+        session = (int(year), int(round_number), str(session_type))
+        with self._lock:
+            if session not in self.sessions:
+                self.sessions.append(session)
+
+    def save(self):
+        """Write the archive, keeping bodies from a previously saved version"""
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for key in self.entries:
+                    body = self._bodies.get(key)
+                    if body is None:
+                        body = self._zip.read(f"bodies/{key}")
+                    archive.writestr(f"bodies/{key}", body)
+                archive.writestr(INDEX_NAME, json.dumps({
+                    'version': ARCHIVE_VERSION,
+                    'sessions': self.sessions,
+                    'entries': self.entries
+                }, indent=1))
+            if self._zip is not None:
+                self._zip.close()
+            os.replace(tmp_path, self.path)
+            self._zip = zipfile.ZipFile(self.path)
+            self._bodies.clear()
+        logger.info(f"Saved {len(self.entries)} recorded responses to {self.path}")
+
+    def get_stats(self) -> Dict:
+        return {
+            'path': self.path,
+            'entries': len(self.entries),
+            'sessions': [list(session) for session in self.sessions],
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that performs the real request and records the response"""
+
+    def __init__(self, archive: FixtureArchive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code < 500:
+            self.archive.add(request, response)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter that answers from a fixture archive and never touches the network"""
+
+    def __init__(self, archive: FixtureArchive, latency_ms: float = 0.0, jitter_ms: float = 0.0):
+        super().__init__()
+        self.archive = archive
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+
+    def send(self, request, **kwargs):
+        delay = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        recorded = self.archive.get(request)
+        if recorded is None:
+            logger.warning(f"Replay miss: no recorded response for {request.method} {request.url}")
+            raise requests.ConnectionError(f"No recorded response for {request.method} {request.url}",
+                                           request=request)
+
+        entry, body = recorded
+        headers = dict(entry['headers'])
+        headers['Content-Length'] = str(len(body))
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=entry['status'],
+                           reason=entry.get('reason'), preload_content=False,
+                           decode_content=False, request_url=request.url)
+        return self.build_response(request, raw)
+
+
+_archive: Optional[FixtureArchive] = None
+
+
+def get_archive() -> Optional[FixtureArchive]:
+    """Archive used by the active record/replay backend (None in live mode)"""
+    return _archive
+
+
+def install_backend(mode: str, archive_path: str, latency_ms: float = 0.0, jitter_ms: float = 0.0) -> Optional[FixtureArchive]:
+    """Mount record or replay adapters on fastf1's HTTP sessions"""
+    global _archive
+    if mode in ('live', 'synthetic'):
+        # Synthetic sessions are generated locally and never reach fastf1's HTTP sessions
+        return None
+    if mode not in ('record', 'replay'):
+        raise ValueError(f"Unknown F1_BACKEND_MODE {mode!r}, expected live, record, replay or synthetic")
+
+    if _archive is None or _archive.path != archive_path:
+        _archive = FixtureArchive(archive_path)
+        if mode == 'record':
+            atexit.register(_archive.save)
+    if mode == 'replay':
+        adapter = ReplayAdapter(_archive, latency_ms, jitter_ms)
+    else:
+        adapter = RecordingAdapter(_archive)
+
+    for attr in ('_requests_session_cached', '_requests_session'):
+        session = getattr(fastf1.Cache, attr, None)
+        if session is None:
+            continue
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if mode == 'replay':
+            # Rate limits protect the real APIs, there is nothing to protect locally
+            session._RATE_LIMITS = {}
+    logger.info(f"F1 data backend in {mode} mode using {archive_path}")
+    return _archive
+
+
+def install_configured_backend() -> Optional[FixtureArchive]:
+    """Install the backend selected by F1_BACKEND_MODE"""
+    return install_backend(config.F1_BACKEND_MODE, config.F1_FIXTURE_ARCHIVE,
+                           config.F1_REPLAY_LATENCY_MS, config.F1_REPLAY_JITTER_MS)
+
+
+def note_session(year: int, round_number: int, session_type: str):
+    """Remember that a session was loaded while recording"""
+    if _archive is not None and config.F1_BACKEND_MODE == 'record':
+        _archive.add_session(year, round_number, session_type)
+
+
+def parse_session_spec(spec: str) -> Tuple[int, int, str]:
+    """Parse 'YEAR:ROUND:TYPE' (e.g. 2023:1:R)"""
+    try:
+        year, round_number, session_type = spec.split(':')
+        return int(year), int(round_number), session_type
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YEAR:ROUND:TYPE, got {spec!r}")
+
+
+def record_sessions(archive_path: str, sessions: List[Tuple[int, int, str]]) -> FixtureArchive:
+    """Fully load the given sessions against the live APIs and record every response"""
+    with tempfile.TemporaryDirectory(prefix='lapla_record_') as cache_dir:
+        # A fresh cache guarantees every upstream request reaches the recorder
+        fastf1.Cache.enable_cache(cache_dir)
+        archive = install_backend('record', archive_path)
+        for year, round_number, session_type in sessions:
+            logger.info(f"Recording {year} round {round_number} {session_type}")
+            fastf1.get_event_schedule(year)
+            session = fastf1.get_session(year, round_number, session_type)
+            session.load(laps=True, telemetry=True, weather=True, messages=True)
+            archive.add_session(year, round_number, session_type)
+        archive.save()
+    return archive
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    record = commands.add_parser('record', help='record sessions from the live APIs')
+    record.add_argument('archive')
+    record.add_argument('sessions', nargs='+', type=parse_session_spec, metavar='YEAR:ROUND:TYPE')
+    info = commands.add_parser('info', help='list the contents of an archive')
+    info.add_argument('archive')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'record':
+        archive = record_sessions(args.archive, args.sessions)
+    else:
+        archive = FixtureArchive(args.archive)
+    print(json.dumps({key: value for key, value in archive.get_stats().items() if key not in ('hits', 'misses')}, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
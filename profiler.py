@@ -0,0 +1,282 @@
+"""Opt-in sampling profiler for slow requests.
+
+A profile is captured when an admin sends the X-Profile header, or for a
+random PROFILE_SAMPLE_RATE share of requests that end up slower than
+PROFILE_SLOW_MS. The sampler thread reads the request thread's stack from
+``sys._current_frames()`` every PROFILE_INTERVAL_MS and folds it into
+``frame;frame;frame count`` lines, which are stored next to a rendered flame
+graph under PROFILE_DIR.
+"""
+import hashlib
+import html
+import contextvars
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from flask import g, request
+
+import config
+from admin import ADMIN_QUERY_PARAM, is_admin_request
+
+PROFILE_HEADER = 'X-Profile'
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler(threading.Thread):
+    """Sample the call stacks of a request's threads at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name='lapla-profiler', daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        # Request thread plus any executor threads currently working for the request
+        self._threads: Dict[int, Optional[str]] = {thread_id: None}
+        self._threads_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def add_thread(self, thread_id: int, label: str):
+        with self._threads_lock:
+            self._threads[thread_id] = label
+
+    def remove_thread(self, thread_id: int):
+        with self._threads_lock:
+            self._threads.pop(thread_id, None)
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            with self._threads_lock:
+                threads = list(self._threads.items())
+            for thread_id, label in threads:
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if label:
+                    names.append(f"[{label}]")
+                self.stacks[';'.join(reversed(names))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def params_hash(route: str, view_args: Dict, query: Dict) -> str:
+    """Stable key for a route and its parameters"""
+    query = {key: value for key, value in query.items() if key != ADMIN_QUERY_PARAM}
+    payload = json.dumps([route, sorted((view_args or {}).items()), sorted(query.items())], default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+def _frame_color(name: str) -> str:
+    digest = hashlib.md5(name.encode()).digest()
+    return f"rgb({205 + digest[0] % 50},{80 + digest[1] % 120},{digest[2] % 60})"
+
+
+def render_flame_graph(stacks: Dict[str, int], title: str, width: int = 1200, row_height: int = 17) -> str:
+    """Render folded stacks as an SVG flame graph (root at the bottom)"""
+    root = {'children': {}, 'count': 0}
+    max_depth = 0
+    for stack, count in stacks.items():
+        node = root
+        node['count'] += count
+        frames = stack.split(';')
+        max_depth = max(max_depth, len(frames))
+        for name in frames:
+            node = node['children'].setdefault(name, {'children': {}, 'count': 0})
+            node['count'] += count
+
+    total = root['count'] or 1
+    top = 30
+    height = top + (max_depth + 1) * row_height + 10
+    scale = (width - 20) / total
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">',
+        f'<rect width="100%" height="100%" fill="#1a1a1a"/>',
+        f'<text x="10" y="18" fill="#eee" font-size="13">{html.escape(title)}</text>',
+    ]
+
+    def draw(name, node, x, depth):
+        node_width = node['count'] * scale
+        if node_width < 0.5:
+            return
+        y = height - 10 - (depth + 1) * row_height
+        label = f"{name} ({node['count']} samples, {node['count'] * 100 / total:.1f}%)"
+        parts.append(f'<g><title>{html.escape(label)}</title>'
+                     f'<rect x="{x:.1f}" y="{y}" width="{node_width:.1f}" height="{row_height - 1}" fill="{_frame_color(name)}"/>')
+        max_chars = int(node_width / 7)
+        if max_chars > 3:
+            text = name if len(name) <= max_chars else name[:max_chars - 2] + '..'
+            parts.append(f'<text x="{x + 3:.1f}" y="{y + row_height - 5}" fill="#000">{html.escape(text)}</text>')
+        parts.append('</g>')
+        child_x = x
+        for child_name, child in sorted(node['children'].items()):
+            draw(child_name, child, child_x, depth + 1)
+            child_x += child['count'] * scale
+
+    draw('all', root, 10, 0)
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+class ProfileStore:
+    """Profiles on disk: <id>.json holds metadata and folded stacks, <id>.svg the flame graph"""
+
+    def __init__(self, directory: str, max_count: int):
+        self.directory = directory
+        self.max_count = max_count
+        self._lock = threading.Lock()
+
+    def _path(self, profile_id: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{os.path.basename(profile_id)}.{extension}")
+
+    def save(self, meta: Dict, stacks: Dict[str, int]) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        route_slug = ''.join(ch if ch.isalnum() else '_' for ch in meta['endpoint'] or meta['route']).strip('_') or 'root'
+        profile_id = f"{route_slug}-{meta['params_hash']}-{int(time.time() * 1000)}"
+        meta = dict(meta, id=profile_id)
+        title = f"{meta['method']} {meta['path']} - {meta['duration_ms']:.0f} ms, {meta['samples']} samples"
+        with open(self._path(profile_id, 'svg'), 'w') as f:
+            f.write(render_flame_graph(stacks, title))
+        with open(self._path(profile_id, 'json'), 'w') as f:
+            json.dump({'meta': meta, 'stacks': stacks}, f)
+        self._prune()
+        return profile_id
+
+    def _prune(self):
+        with self._lock:
+            entries = sorted(
+                (os.path.getmtime(os.path.join(self.directory, name)), name[:-len('.json')])
+                for name in os.listdir(self.directory) if name.endswith('.json')
+            )
+            for _, profile_id in entries[:max(len(entries) - self.max_count, 0)]:
+                for extension in ('json', 'svg'):
+                    try:
+                        os.remove(self._path(profile_id, extension))
+                    except FileNotFoundError:
+                        pass
+
+    def list(self) -> List[Dict]:
+        """Metadata of every stored profile, slowest first"""
+        profiles = []
+        if not os.path.isdir(self.directory):
+            return profiles
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            profile = self.get(name[:-len('.json')])
+            if profile:
+                profiles.append(profile['meta'])
+        return sorted(profiles, key=lambda meta: meta['duration_ms'], reverse=True)
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(profile_id, 'json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def svg_path(self, profile_id: str) -> Optional[str]:
+        path = self._path(profile_id, 'svg')
+        return path if os.path.exists(path) else None
+
+
+store = ProfileStore(config.PROFILE_DIR, config.PROFILE_MAX_COUNT)
+
+
+_active_sampler: contextvars.ContextVar[Optional[StackSampler]] = contextvars.ContextVar('active_sampler', default=None)
+
+
+@contextmanager
+def track_current_thread():
+    """Include the calling thread in the current request's profile while the block runs"""
+    sampler = _active_sampler.get()
+    if sampler is None:
+        yield
+        return
+    thread = threading.current_thread()
+    sampler.add_thread(thread.ident, thread.name)
+    try:
+        yield
+    finally:
+        sampler.remove_thread(thread.ident)
+
+
+def _profile_trigger() -> Optional[str]:
+    if request.headers.get(PROFILE_HEADER) and is_admin_request():
+        return 'header'
+    if config.PROFILE_SAMPLE_RATE > 0 and random.random() < config.PROFILE_SAMPLE_RATE:
+        return 'sampled'
+    return None
+
+
+def init_app(app):
+    """Install the profiling request hooks"""
+
+    @app.before_request
+    def _start_profile():
+        trigger = _profile_trigger()
+        if trigger is None:
+            return
+        sampler = StackSampler(threading.get_ident(), config.PROFILE_INTERVAL_MS / 1000)
+        g.profile = {'trigger': trigger, 'sampler': sampler, 'start': time.perf_counter()}
+        _active_sampler.set(sampler)
+        sampler.start()
+
+    @app.after_request
+    def _finish_profile(response):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+        sampler = profile['sampler']
+        sampler.stop()
+        duration_ms = (time.perf_counter() - profile['start']) * 1000
+        if profile['trigger'] == 'sampled' and duration_ms < config.PROFILE_SLOW_MS:
+            return response
+        if not sampler.samples:
+            return response
+        route = request.url_rule.rule if request.url_rule else request.path
+        query = request.args.to_dict()
+        meta = {
+            'route': route,
+            'endpoint': request.endpoint,
+            'path': request.path,
+            'method': request.method,
+            'params': dict(request.view_args or {}, **{k: v for k, v in query.items() if k != ADMIN_QUERY_PARAM}),
+            'params_hash': params_hash(route, request.view_args, query),
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 1),
+            'samples': sampler.samples,
+            'trigger': profile['trigger'],
+            'captured_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        try:
+            profile_id = store.save(meta, dict(sampler.stacks))
+            response.headers['X-Profile-Id'] = profile_id
+        except Exception as e:
+            logger.error(f"Error saving profile for {request.path}: {e}")
+        return response
+
+    @app.teardown_request
+    def _stop_abandoned_profile(exc):
+        _active_sampler.set(None)
+        # after_request does not run when the view raised
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profile['sampler'].stop()
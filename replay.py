@@ -0,0 +1,95 @@
+"""Position replay of every car on a shared clock, served in time chunks.
+
+Each car's X/Y track (from the session-wide telemetry index) is concatenated
+into one array with every driver shifted into a disjoint time range, so a
+whole chunk of the shared clock is resampled for all cars with a single
+``np.interp``. Times outside a car's data, or inside a gap longer than
+``MAX_GAP_SECONDS`` (garage, red flag), come back as NaN.
+
+A chunk is either NDJSON (a header line, then one ``{"t", "x", "y"}`` line
+per frame) or raw little-endian float32 of shape (frames, drivers, 2) with
+the layout described in the response headers.
+"""
+import json
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from models import optional_floats
+
+DEFAULT_HZ = 4
+MAX_HZ = 10
+CHUNK_SECONDS = 30
+MAX_GAP_SECONDS = 5.0
+FORMATS = ('ndjson', 'binary')
+
+
+class ReplaySource:
+    """All cars' positions of a session, resampled on demand onto a shared clock"""
+
+    def __init__(self, tracks: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]):
+        """`tracks` maps driver codes to (session_time, x, y) arrays sorted by time"""
+        self.drivers = [driver for driver, (time, _, _) in tracks.items() if len(time) > 1]
+        if not self.drivers:
+            raise ValueError('no position data to replay')
+        self.start = float(min(tracks[driver][0][0] for driver in self.drivers))
+        self.end = float(max(tracks[driver][0][-1] for driver in self.drivers))
+        self.span = self.end - self.start + 2 * MAX_GAP_SECONDS
+
+        self.time = np.concatenate([tracks[driver][0] - self.start + i * self.span
+                                    for i, driver in enumerate(self.drivers)])
+        self.x = np.concatenate([tracks[driver][1] for driver in self.drivers]).astype(float)
+        self.y = np.concatenate([tracks[driver][2] for driver in self.drivers]).astype(float)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def chunk_count(self, chunk_seconds: float = CHUNK_SECONDS) -> int:
+        return int(np.ceil(self.duration / chunk_seconds)) if self.duration > 0 else 0
+
+    def manifest(self, hz: int) -> Dict[str, Any]:
+        return {
+            'drivers': self.drivers,
+            'start': round(self.start, 3),
+            'end': round(self.end, 3),
+            'hz': hz,
+            'chunk_seconds': CHUNK_SECONDS,
+            'chunks': self.chunk_count(),
+            'formats': list(FORMATS),
+        }
+
+    def chunk(self, index: int, hz: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Clock (session seconds) and float32 positions (frames, drivers, 2) of one chunk"""
+        if not 0 <= index < self.chunk_count():
+            raise IndexError(f"chunk {index} out of range")
+        step = 1.0 / hz
+        offset = index * CHUNK_SECONDS
+        clock = np.arange(offset, min(offset + CHUNK_SECONDS, self.duration + step), step)
+        queries = (clock[None, :] + np.arange(len(self.drivers))[:, None] * self.span).ravel()
+
+        x = np.interp(queries, self.time, self.x)
+        y = np.interp(queries, self.time, self.y)
+        # NaN where the nearest samples on either side are too far apart (or belong to another car);
+        # a query on a sample has that sample on both sides, including a car's first and last one
+        before = np.searchsorted(self.time, queries, side='right') - 1
+        after = np.searchsorted(self.time, queries, side='left')
+        outside = (before < 0) | (after >= len(self.time))
+        before, after = np.maximum(before, 0), np.minimum(after, len(self.time) - 1)
+        gap = outside | (self.time[after] - self.time[before] > MAX_GAP_SECONDS)
+        x[gap] = np.nan
+        y[gap] = np.nan
+
+        positions = np.stack([x, y], axis=-1).reshape(len(self.drivers), len(clock), 2).transpose(1, 0, 2)
+        return clock + self.start, positions.astype(np.float32)
+
+
+def encode_ndjson(index: int, drivers: List[str], clock: np.ndarray, positions: np.ndarray) -> bytes:
+    lines = [json.dumps({'chunk': index, 'drivers': drivers, 'frames': len(clock)})]
+    for t, frame in zip(clock.tolist(), positions):
+        lines.append(json.dumps({'t': round(t, 3), 'x': optional_floats(frame[:, 0], 1), 'y': optional_floats(frame[:, 1], 1)}))
+    return ('\n'.join(lines) + '\n').encode()
+
+
+def encode_binary(positions: np.ndarray) -> bytes:
+    return np.ascontiguousarray(positions, dtype='<f4').tobytes()
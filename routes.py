@@ -1,12 +1,27 @@
 from flask import render_template, request, jsonify, redirect, url_for, Response
+from werkzeug.datastructures import MultiDict
 from app import app
-from f1_data import F1DataService
+from werkzeug.local import LocalProxy
+from f1_data import get_f1_service
+from async_service import get_async_f1_service
+from admin import ADMIN_QUERY_PARAM, admin_required
+from circuit_maps import RENDER_SIZES
+from lazy_imports import warehouse
+from minisectors import DEFAULT_MINISECTORS
+from models import TELEMETRY_FIELDS, LapTable
+from replay import DEFAULT_HZ, FORMATS as REPLAY_FORMATS
+import config
+import profiler
+import asyncio
 import json
 import logging
 import random
 from datetime import datetime
 
-f1_service = F1DataService()
+# Resolved on first use so importing the app does not pull in fastf1
+f1_service = LocalProxy(get_f1_service)
+# Views that wait on fastf1 loads await this instead, offloading to bounded executors
+async_f1_service = LocalProxy(get_async_f1_service)
 logger = logging.getLogger(__name__)
 
 @app.route('/')
@@ -52,7 +67,7 @@ def performance_insights():
                              schedule=[])
 
 @app.route('/analysis')
-def analysis():
+async def analysis():
     """Analysis page with telemetry visualization"""
     year = request.args.get('year', type=int)
     round_number = request.args.get('round', type=int) 
@@ -63,25 +78,29 @@ def analysis():
         return redirect(url_for('index'))
     
     try:
-        # Get session info
-        sessions = f1_service.get_session_info(year, round_number)
+        # Session info, drivers and lap data are fetched concurrently
+        lookups = [
+            async_f1_service.get_session_info(year, round_number),
+            async_f1_service.get_drivers_in_session(year, round_number, session_type),
+        ]
+        if driver_codes:
+            lookups.append(async_f1_service.get_lap_data(year, round_number, session_type, driver_codes))
+        results = await asyncio.gather(*lookups)
+        sessions, drivers = results[0], results[1]
         current_session = sessions.get(session_type)
         
         if not current_session:
             return redirect(url_for('index'))
         
-        # Get drivers
-        drivers = f1_service.get_drivers_in_session(year, round_number, session_type)
-        
         # Get lap data if drivers are selected
         lap_data = {}
         if driver_codes:
-            lap_data = f1_service.get_lap_data(year, round_number, session_type, driver_codes)
+            lap_data = results[2]
             # If no real data, generate sample data for demonstration
             if not lap_data or all(not laps for laps in lap_data.values()):
-                lap_data = {}
-                for driver_code in driver_codes:
-                    lap_data[driver_code] = f1_service.generate_sample_lap_data(driver_code)
+                samples = await asyncio.gather(*(async_f1_service.generate_sample_lap_data(driver_code)
+                                                  for driver_code in driver_codes))
+                lap_data = dict(zip(driver_codes, samples))
         
         # Format lap times for display
         def format_lap_time(seconds):
@@ -167,83 +186,134 @@ def api_drivers(year, round_number, session_type):
         return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/api/circuit-layout/<int:year>/<int:round_number>/<session_type>/<driver_code>/<int:lap_number>')
-def api_circuit_layout(year, round_number, session_type, driver_code, lap_number):
+async def api_circuit_layout(year, round_number, session_type, driver_code, lap_number):
     """API endpoint to get circuit layout with speed visualization"""
     try:
-        circuit_image = f1_service.generate_circuit_layout(year, round_number, session_type, driver_code, lap_number)
+        circuit_image = await async_f1_service.generate_circuit_layout(year, round_number, session_type, driver_code, lap_number)
         return jsonify({'success': True, 'data': {'image': circuit_image}})
     except Exception as e:
         logger.error(f"Error generating circuit layout: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/circuit-layouts/<int:year>/<int:round_number>/<session_type>')
+async def api_circuit_layouts(year, round_number, session_type):
+    """API endpoint to render speed maps for several drivers (and sizes) in one pass"""
+    try:
+        return jsonify(await _circuit_layouts_payload(year, round_number, session_type, request.args))
+    except Exception as e:
+        logger.error(f"Error rendering circuit layouts: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+async def _circuit_layouts_payload(year, round_number, session_type, args):
+    driver_codes = [code for value in args.getlist('drivers') for code in value.split(',') if code]
+    if not driver_codes:
+        driver_codes = [driver.driver_code for driver in
+                        await async_f1_service.get_drivers_in_session(year, round_number, session_type)]
+    try:
+        sizes = _requested_fields(args, tuple(RENDER_SIZES), name='sizes') or ('full',)
+    except ValueError as e:
+        return {'success': False, 'error': str(e)}
+    return await async_f1_service.render_circuit_maps(year, round_number, session_type, driver_codes,
+                                                      args.get('lap', type=int), sizes)
+
 @app.route('/api/lap_data/<int:year>/<int:round_number>/<session_type>')
-def api_lap_data(year, round_number, session_type):
+async def api_lap_data(year, round_number, session_type):
     """API endpoint to get lap data for drivers"""
     try:
-        driver_codes = request.args.getlist('drivers')
-        if not driver_codes:
-            return jsonify({'success': False, 'error': 'No drivers specified'})
-        
-        lap_data = f1_service.get_lap_data(year, round_number, session_type, driver_codes)
-        
-        # If no real data available, use sample data for demonstration
-        if not lap_data or all(not laps for laps in lap_data.values()):
-            lap_data = {}
-            for driver_code in driver_codes:
-                lap_data[driver_code] = f1_service.generate_sample_lap_data(driver_code)
-        
-        # Format the data for JSON response
-        formatted_data = {}
-        for driver_code, laps in lap_data.items():
-            formatted_laps = []
-            for lap in laps:
-                formatted_laps.append({
-                    'lap_number': lap.lap_number,
-                    'lap_time': lap.lap_time,
-                    'lap_time_formatted': format_lap_time_api(lap.lap_time),
-                    'sector_1_time': lap.sector_1_time,
-                    'sector_2_time': lap.sector_2_time,
-                    'sector_3_time': lap.sector_3_time,
-                    'is_personal_best': lap.is_personal_best,
-                    'compound': lap.compound,
-                    'tyre_life': lap.tyre_life
-                })
-            formatted_data[driver_code] = formatted_laps
-        
-        return jsonify({'success': True, 'data': formatted_data})
+        return jsonify(await _lap_data_payload(year, round_number, session_type, request.args))
     except Exception as e:
         logger.error(f"Error getting lap data: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+async def _lap_data_payload(year, round_number, session_type, args):
+    driver_codes = args.getlist('drivers')
+    if not driver_codes:
+        return {'success': False, 'error': 'No drivers specified'}
+    try:
+        fields = _requested_fields(args, LapTable.RECORD_FIELDS + ('lap_time_formatted',))
+        lap_range = _requested_range(args, 'laps', int)
+    except ValueError as e:
+        return {'success': False, 'error': str(e)}
+    
+    lap_data = await async_f1_service.get_lap_data(year, round_number, session_type, driver_codes, lap_range)
+    
+    # If no real data available, use sample data for demonstration (a lap range may legitimately match nothing)
+    if not lap_data or (lap_range is None and all(not laps for laps in lap_data.values())):
+        samples = await asyncio.gather(*(async_f1_service.generate_sample_lap_data(driver_code)
+                                          for driver_code in driver_codes))
+        lap_data = dict(zip(driver_codes, samples))
+        if lap_range is not None:
+            lap_data = {driver_code: laps.lap_range(*lap_range) for driver_code, laps in lap_data.items()}
+    
+    # Format the data for JSON response, converting only the requested columns
+    formatted_data = {}
+    for driver_code, laps in lap_data.items():
+        formatted_laps = laps.to_records(fields)
+        if fields is None or 'lap_time_formatted' in fields:
+            for lap, seconds in zip(formatted_laps, laps.lap_time.tolist()):
+                lap['lap_time_formatted'] = format_lap_time_api(None if seconds != seconds else seconds)
+        formatted_data[driver_code] = formatted_laps
+    
+    return {'success': True, 'data': formatted_data}
+
 @app.route('/api/telemetry/<int:year>/<int:round_number>/<session_type>/<driver_code>/<int:lap_number>')
-def api_telemetry(year, round_number, session_type, driver_code, lap_number):
+async def api_telemetry(year, round_number, session_type, driver_code, lap_number):
     """API endpoint to get telemetry data for a specific lap"""
     try:
-        telemetry = f1_service.get_telemetry_data(year, round_number, session_type, driver_code, lap_number)
-        
-        # If no real telemetry data, generate sample data
-        if not telemetry:
-            telemetry = f1_service.generate_sample_telemetry(driver_code, lap_number)
-        
-        if telemetry:
-            return jsonify({
-                'success': True,
-                'data': {
-                    'distance': telemetry.distance,
-                    'speed': telemetry.speed,
-                    'throttle': telemetry.throttle,
-                    'brake': telemetry.brake,
-                    'gear': telemetry.gear,
-                    'drs': telemetry.drs,
-                    'time': telemetry.time
-                }
-            })
-        else:
-            return jsonify({'success': False, 'error': 'No telemetry data available'})
+        return jsonify(await _telemetry_payload(year, round_number, session_type, driver_code, lap_number, request.args))
     except Exception as e:
         logger.error(f"Error getting telemetry data: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+async def _telemetry_payload(year, round_number, session_type, driver_code, lap_number, args):
+    try:
+        fields = _requested_fields(args, TELEMETRY_FIELDS) or list(TELEMETRY_FIELDS)
+        distance_range = _requested_range(args, 'distance', float)
+    except ValueError as e:
+        return {'success': False, 'error': str(e)}
+    telemetry = await async_f1_service.get_telemetry_data(year, round_number, session_type, driver_code, lap_number,
+                                                          fields, distance_range)
+    
+    # If no real telemetry data, generate sample data
+    if not telemetry:
+        telemetry = await async_f1_service.generate_sample_telemetry(driver_code, lap_number)
+    
+    if not telemetry:
+        return {'success': False, 'error': 'No telemetry data available'}
+    return {
+        'success': True,
+        'data': {field: getattr(telemetry, field) for field in fields}
+    }
+
+class ParamError(ValueError):
+    """Missing or malformed request params, answered with a 400 (per item in a batch)"""
+
+def _requested_fields(args, allowed, name='fields'):
+    """Fields named by `fields=a,b` (or repeated `fields=`) query args, None when not given"""
+    names = [field.strip() for value in args.getlist(name) for field in value.split(',') if field.strip()]
+    if not names:
+        return None
+    unknown = [field for field in names if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown {name}: {', '.join(unknown)} (available: {', '.join(allowed)})")
+    return list(dict.fromkeys(names))
+
+def _requested_range(args, name, cast):
+    """(low, high) from a `name=low..high` query arg; either end may be left open, a single value is low == high"""
+    value = args.get(name)
+    if not value:
+        return None
+    low, separator, high = value.partition('..')
+    try:
+        if not separator:
+            return cast(low), cast(low)
+        bounds = (cast(low) if low.strip() else None, cast(high) if high.strip() else None)
+    except ValueError:
+        raise ValueError(f"Invalid {name} range: {value} (expected from..to)")
+    if None not in bounds and bounds[0] > bounds[1]:
+        raise ValueError(f"Invalid {name} range: {value} (from is after to)")
+    return bounds
+
 def format_lap_time_api(seconds):
     """Format lap time for API responses"""
     if not seconds or seconds <= 0:
@@ -255,25 +325,27 @@ def format_lap_time_api(seconds):
 
 
 @app.route('/api/track/<int:year>/<int:round_number>/<session_type>')
-def api_track(year, round_number, session_type):
+async def api_track(year, round_number, session_type):
     """API endpoint to get track layout data"""
     try:
-        track_data = f1_service.get_track_data(year, round_number, session_type)
-        if track_data:
-            return jsonify({
-                'success': True,
-                'data': {
-                    'x': track_data.x_coordinates,
-                    'y': track_data.y_coordinates,
-                    'distance': track_data.distance_markers
-                }
-            })
-        else:
-            return jsonify({'success': False, 'error': 'No track data available'})
+        return jsonify(await _track_payload(year, round_number, session_type, request.args))
     except Exception as e:
         logger.error(f"Error getting track data: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+async def _track_payload(year, round_number, session_type, args):
+    track_data = await async_f1_service.get_track_data(year, round_number, session_type)
+    if not track_data:
+        return {'success': False, 'error': 'No track data available'}
+    return {
+        'success': True,
+        'data': {
+            'x': track_data.x_coordinates,
+            'y': track_data.y_coordinates,
+            'distance': track_data.distance_markers
+        }
+    }
+
 # New page routes
 @app.route('/about')
 def about():
@@ -290,6 +362,102 @@ def privacy():
     """Privacy policy page"""
     return render_template('privacy.html')
 
+# Admin endpoints
+@app.route('/admin/cache')
+@admin_required
+def admin_cache_stats():
+    """Admin endpoint with fastf1 cache size, entries, HTTP hit ratio, in-memory sessions, derived results, renders, schedules, shared tables and executors"""
+    try:
+        stats = f1_service.cache.get_stats()
+        stats['sessions'] = f1_service.sessions.get_stats()
+        stats['shared_tables'] = f1_service.shared_tables.get_stats()
+        stats['derived'] = f1_service.derived.get_stats()
+        stats['replay_chunks'] = f1_service.replay_chunks.get_stats()
+        stats['renders'] = f1_service.renders.get_stats()
+        stats['schedules'] = f1_service.schedules.get_stats()
+        stats['executors'] = async_f1_service.get_stats()
+        return jsonify({'success': True, 'data': stats})
+    except Exception as e:
+        logger.error(f"Error getting cache stats: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/admin/profiles')
+@admin_required
+def admin_profiles():
+    """Admin page listing captured request profiles, slowest first"""
+    try:
+        profiles = profiler.store.list()
+    except Exception as e:
+        logger.error(f"Error listing profiles: {e}")
+        profiles = []
+    return render_template('admin_profiles.html', profiles=profiles,
+                           admin_token=request.args.get(ADMIN_QUERY_PARAM, ''))
+
+@app.route('/admin/profiles/<profile_id>')
+@admin_required
+def admin_profile(profile_id):
+    """Admin endpoint with a profile's metadata and folded stacks"""
+    profile = profiler.store.get(profile_id)
+    if profile is None:
+        return jsonify({'success': False, 'error': 'Profile not found'}), 404
+    return jsonify({'success': True, 'data': profile})
+
+@app.route('/admin/profiles/<profile_id>/flamegraph.svg')
+@admin_required
+def admin_profile_flame_graph(profile_id):
+    """Flame graph of a captured profile"""
+    path = profiler.store.svg_path(profile_id)
+    if path is None:
+        return jsonify({'success': False, 'error': 'Profile not found'}), 404
+    with open(path) as f:
+        return Response(f.read(), mimetype='image/svg+xml')
+
+# Cross-season warehouse endpoints (populated with `flask warehouse ingest`)
+@app.route('/api/warehouse/sessions')
+def api_warehouse_sessions():
+    """API endpoint listing ingested sessions"""
+    try:
+        sessions = warehouse.list_sessions(request.args.get('year', type=int))
+        return jsonify({'success': True, 'data': sessions})
+    except Exception as e:
+        logger.error(f"Error listing warehouse sessions: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/warehouse/driver/<driver_code>/pace')
+def api_warehouse_driver_pace(driver_code):
+    """API endpoint for a driver's pace trend across seasons"""
+    try:
+        trend = warehouse.driver_pace_trend(driver_code,
+                                            request.args.get('from_year', type=int),
+                                            request.args.get('to_year', type=int),
+                                            request.args.get('session_type', 'R'))
+        return jsonify({'success': True, 'data': trend})
+    except Exception as e:
+        logger.error(f"Error getting warehouse pace trend: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/warehouse/teammates')
+def api_warehouse_teammates():
+    """API endpoint for teammate median pace deltas"""
+    try:
+        deltas = warehouse.teammate_deltas(request.args.get('from_year', type=int),
+                                           request.args.get('to_year', type=int),
+                                           request.args.get('session_type', 'R'),
+                                           request.args.get('team'))
+        return jsonify({'success': True, 'data': deltas})
+    except Exception as e:
+        logger.error(f"Error getting warehouse teammate deltas: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/warehouse/standings/<int:year>')
+def api_warehouse_standings(year):
+    """API endpoint for championship points from ingested results"""
+    try:
+        return jsonify({'success': True, 'data': warehouse.season_standings(year)})
+    except Exception as e:
+        logger.error(f"Error getting warehouse standings: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 # Enhanced API endpoints for export and comparison features
 @app.route('/api/export/<int:year>/<int:round_number>/<session_type>')
 def api_export_data(year, round_number, session_type):
@@ -355,48 +523,147 @@ def api_compare_drivers(year, round_number, session_type):
 
 
 
+@app.route('/api/minisectors/<int:year>/<int:round_number>/<session_type>')
+async def api_minisectors(year, round_number, session_type):
+    """API endpoint for mini-sector dominance across all drivers"""
+    try:
+        return jsonify(await _minisectors_payload(year, round_number, session_type, request.args))
+    except Exception as e:
+        logger.error(f"Error getting mini-sector dominance: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+async def _minisectors_payload(year, round_number, session_type, args):
+    count = args.get('n', DEFAULT_MINISECTORS, type=int)
+    lap_number = args.get('lap', type=int)
+    return await async_f1_service.get_minisector_dominance(year, round_number, session_type, count, lap_number)
+
+@app.route('/api/replay/<int:year>/<int:round_number>/<session_type>/manifest')
+async def api_replay_manifest(year, round_number, session_type):
+    """API endpoint describing the chunks of a session's position replay"""
+    try:
+        hz = request.args.get('hz', DEFAULT_HZ, type=int)
+        manifest = await async_f1_service.get_replay_manifest(year, round_number, session_type, hz)
+        return jsonify(manifest)
+    except Exception as e:
+        logger.error(f"Error getting replay manifest: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/replay/<int:year>/<int:round_number>/<session_type>/chunk/<int:index>')
+async def api_replay_chunk(year, round_number, session_type, index):
+    """API endpoint streaming one time chunk of every car's position as NDJSON or float32"""
+    try:
+        hz = request.args.get('hz', DEFAULT_HZ, type=int)
+        fmt = request.args.get('format', 'ndjson')
+        if fmt not in REPLAY_FORMATS:
+            return jsonify({'success': False, 'error': f"format must be one of {', '.join(REPLAY_FORMATS)}"}), 400
+        body, headers = await async_f1_service.get_replay_chunk(year, round_number, session_type, index, hz, fmt)
+        response = Response(body, mimetype='application/x-ndjson' if fmt == 'ndjson' else 'application/octet-stream')
+        response.headers.update(headers)
+        # Chunks of a finished session never change
+        response.headers['Cache-Control'] = 'public, max-age=86400'
+        return response
+    except IndexError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+    except Exception as e:
+        logger.error(f"Error getting replay chunk: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/weather/<int:year>/<int:round_number>/<session_type>')
-def api_weather_data(year, round_number, session_type):
+async def api_weather_data(year, round_number, session_type):
     """API endpoint for real weather data"""
     try:
-        weather_data = f1_service.get_weather_data(year, round_number, session_type)
-        return jsonify(weather_data)
+        return jsonify(await _weather_data_payload(year, round_number, session_type, request.args))
     except Exception as e:
         logger.error(f"Error getting weather data: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+async def _weather_data_payload(year, round_number, session_type, args):
+    return await async_f1_service.get_weather_data(year, round_number, session_type)
+
+@app.route('/api/weather_timeline/<int:year>/<int:round_number>/<session_type>')
+async def api_weather_timeline(year, round_number, session_type):
+    """API endpoint for the session weather timeline aligned to laps"""
+    try:
+        return jsonify(await _weather_timeline_payload(year, round_number, session_type, request.args))
+    except ParamError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error getting weather timeline: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+async def _weather_timeline_payload(year, round_number, session_type, args):
+    resolution = None
+    if args.get('resolution'):
+        try:
+            resolution = float(args['resolution'])
+        except ValueError:
+            resolution = float('nan')
+        if not (0 < resolution < float('inf')):
+            raise ParamError("'resolution' must be a positive number of seconds")
+    return await async_f1_service.get_weather_timeline(year, round_number, session_type, resolution)
+
 @app.route('/api/fuel/<int:year>/<int:round_number>/<session_type>')
-def api_fuel_data(year, round_number, session_type):
+async def api_fuel_data(year, round_number, session_type):
     """API endpoint for real fuel consumption analysis"""
     try:
-        driver_codes = request.args.getlist('drivers')
-        fuel_data = f1_service.get_fuel_analysis(year, round_number, session_type, driver_codes)
-        return jsonify(fuel_data)
+        return jsonify(await _fuel_data_payload(year, round_number, session_type, request.args))
     except Exception as e:
         logger.error(f"Error getting fuel data: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+async def _fuel_data_payload(year, round_number, session_type, args):
+    driver_codes = args.getlist('drivers')
+    return await async_f1_service.get_fuel_analysis(year, round_number, session_type, driver_codes)
+
+@app.route('/api/tyre_degradation/<int:year>/<int:round_number>/<session_type>')
+async def api_tyre_degradation(year, round_number, session_type):
+    """API endpoint for per-compound tyre degradation curves and stint fits"""
+    try:
+        return jsonify(await _tyre_degradation_payload(year, round_number, session_type, request.args))
+    except Exception as e:
+        logger.error(f"Error getting tyre degradation: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+async def _tyre_degradation_payload(year, round_number, session_type, args):
+    driver_codes = args.getlist('drivers')
+    return await async_f1_service.get_tyre_degradation(year, round_number, session_type, driver_codes)
+
+@app.route('/api/gaps/<int:year>/<int:round_number>/<session_type>')
+async def api_gaps(year, round_number, session_type):
+    """API endpoint for the per-lap gap to leader, interval and position of the whole field"""
+    try:
+        return jsonify(await _gaps_payload(year, round_number, session_type, request.args))
+    except Exception as e:
+        logger.error(f"Error getting gap timeline: {e}")
+        return jsonify({'success': False, 'error': str(e)})
+
+async def _gaps_payload(year, round_number, session_type, args):
+    return await async_f1_service.get_gap_timeline(year, round_number, session_type)
+
 @app.route('/api/performance-metrics/<int:year>/<int:round_number>/<session_type>')
-def api_performance_metrics(year, round_number, session_type):
+async def api_performance_metrics(year, round_number, session_type):
     """API endpoint for session performance metrics"""
     try:
-        driver_codes = request.args.getlist('drivers')
-        metrics_data = f1_service.get_performance_metrics(year, round_number, session_type, driver_codes)
-        return jsonify({
-            'success': True,
-            'data': metrics_data,
-            'meta': {
-                'year': year,
-                'round': round_number,
-                'session': session_type,
-                'drivers': driver_codes,
-                'timestamp': f1_service.get_current_timestamp()
-            }
-        })
+        return jsonify(await _performance_metrics_payload(year, round_number, session_type, request.args))
     except Exception as e:
         logger.error(f"Error getting performance metrics: {e}")
         return jsonify({'success': False, 'error': str(e)})
 
+async def _performance_metrics_payload(year, round_number, session_type, args):
+    driver_codes = args.getlist('drivers')
+    metrics_data = await async_f1_service.get_performance_metrics(year, round_number, session_type, driver_codes)
+    return {
+        'success': True,
+        'data': metrics_data,
+        'meta': {
+            'year': year,
+            'round': round_number,
+            'session': session_type,
+            'drivers': driver_codes,
+            'timestamp': f1_service.get_current_timestamp()
+        }
+    }
+
 @app.route('/api/custom-insights/<int:year>/<int:round>/<session>')
 def custom_insights(year, round, session):
     """Generate custom performance insights using Lapla Analytics Engine"""
@@ -653,16 +920,92 @@ def performance_insights_data(year, round_number, session_type):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/fastest-laps/<int:year>/<int:round_number>/<session_type>')
-def api_fastest_laps(year, round_number, session_type):
+async def api_fastest_laps(year, round_number, session_type):
     """API endpoint for driver fastest laps"""
     try:
-        selected_drivers = request.args.getlist('drivers')
-        fastest_laps = f1_service.get_driver_fastest_laps(year, round_number, session_type, selected_drivers)
-        return jsonify(fastest_laps)
+        return jsonify(await _fastest_laps_payload(year, round_number, session_type, request.args))
     except Exception as e:
         app.logger.error(f"Error in fastest laps API: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+async def _fastest_laps_payload(year, round_number, session_type, args):
+    selected_drivers = args.getlist('drivers')
+    return await async_f1_service.get_driver_fastest_laps(year, round_number, session_type, selected_drivers)
+
+async def _batch_telemetry_payload(year, round_number, session_type, args):
+    # /api/telemetry takes these from the URL path, where the route itself enforces them
+    driver_code = (args.get('driver') or '').strip()
+    if not driver_code:
+        raise ParamError("'driver' is required")
+    lap_number = args.get('lap', type=int)
+    if lap_number is None or lap_number < 0:
+        raise ParamError("'lap' must be a lap number")
+    return await _telemetry_payload(year, round_number, session_type, driver_code, lap_number, args)
+
+# Session-scoped endpoints a batch can multiplex: payload helper and the session data parts it reads
+BATCH_ENDPOINTS = {
+    'lap_data': (_lap_data_payload, ('laps',)),
+    'telemetry': (_batch_telemetry_payload, ('laps', 'telemetry')),
+    'track': (_track_payload, ('laps', 'telemetry')),
+    'minisectors': (_minisectors_payload, ('laps', 'telemetry')),
+    'weather': (_weather_data_payload, ('laps', 'weather')),
+    'weather_timeline': (_weather_timeline_payload, ('laps', 'weather')),
+    'fuel': (_fuel_data_payload, ('laps',)),
+    'tyre_degradation': (_tyre_degradation_payload, ('laps',)),
+    'gaps': (_gaps_payload, ('laps',)),
+    'performance_metrics': (_performance_metrics_payload, ('laps', 'telemetry')),
+    'fastest_laps': (_fastest_laps_payload, ('laps',)),
+    'circuit_layouts': (_circuit_layouts_payload, ('laps', 'telemetry')),
+}
+
+@app.route('/api/batch', methods=['POST'])
+async def api_batch():
+    """Run several session endpoints against one session load and return their results together"""
+    payload = request.get_json(silent=True) or {}
+    try:
+        year, round_number = int(payload['year']), int(payload['round'])
+        session_type = str(payload['session'])
+        items = list(payload.get('requests') or [])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'year, round, session and requests are required'}), 400
+    if not items:
+        return jsonify({'success': False, 'error': 'No requests specified'}), 400
+    if len(items) > config.BATCH_MAX_REQUESTS:
+        return jsonify({'success': False, 'error': f'At most {config.BATCH_MAX_REQUESTS} requests per batch'}), 400
+    
+    calls = []
+    for position, item in enumerate(items):
+        item = item if isinstance(item, dict) else {}
+        calls.append((str(item.get('id', position)), item.get('endpoint'), MultiDict(item.get('params') or {})))
+    
+    # Load the session once with the union of every item's parts; concurrent items
+    # asking for different parts would otherwise each trigger a wider reload
+    part_sets = {BATCH_ENDPOINTS[endpoint][1] for _, endpoint, _ in calls if endpoint in BATCH_ENDPOINTS}
+    if len(part_sets) > 1:
+        try:
+            await async_f1_service.prepare_session(year, round_number, session_type, set().union(*part_sets))
+        except Exception as e:
+            logger.warning(f"Batch session preload failed for {year}:{round_number}:{session_type}: {e}")
+    
+    async def run(endpoint, args):
+        if endpoint not in BATCH_ENDPOINTS:
+            return {'status': 404, 'body': {'success': False, 'error': f'Unknown endpoint: {endpoint}'}}
+        try:
+            body = await BATCH_ENDPOINTS[endpoint][0](year, round_number, session_type, args)
+            return {'status': 200, 'body': body}
+        except ParamError as e:
+            return {'status': 400, 'body': {'success': False, 'error': str(e)}}
+        except Exception as e:
+            logger.error(f"Error in batch item {endpoint}: {e}")
+            return {'status': 500, 'body': {'success': False, 'error': str(e)}}
+    
+    results = await asyncio.gather(*(run(endpoint, args) for _, endpoint, args in calls))
+    return jsonify({
+        'success': True,
+        'session': {'year': year, 'round': round_number, 'session': session_type},
+        'results': {request_id: result for (request_id, _, _), result in zip(calls, results)}
+    })
+
 def generate_performance_insights_data(session_info, drivers, year, round_number, session_type):
     """Generate comprehensive performance insights data"""
     try:
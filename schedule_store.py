@@ -0,0 +1,179 @@
+"""Season schedules and event metadata, persisted locally and served from memory.
+
+Every page that lists races or sessions needs the season schedule, which
+otherwise means an upstream call (``get_event_schedule`` / ``get_event``)
+per request. The store keeps each season's events in memory indexed by
+(year, round) and in a JSON file shared by all workers. A season older than
+the TTL is still served as is while one background thread fetches a fresh
+copy; only a season that has never been fetched is loaded in the request.
+Workers pick up seasons another worker refreshed from the file instead of
+fetching them again.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Seconds to wait before retrying a season whose refresh failed
+RETRY_SECONDS = 300
+
+
+class ScheduleStore:
+    """Per-season event lists with a (year, round) index, refreshed in the background after `ttl` seconds"""
+
+    def __init__(self, path: Optional[str], ttl: float, fetch: Callable[[int], List[Dict]]):
+        """`fetch(year)` returns the season's events as dicts with at least a 'round_number'"""
+        self.path = path
+        self.ttl = ttl
+        self.fetch = fetch
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.failures = 0
+        self._seasons: Dict[int, Dict] = {}
+        self._index: Dict[Tuple[int, int], Dict] = {}
+        self._file_mtime = 0.0
+        self._refreshing = set()
+        self._failed_at: Dict[int, float] = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._year_locks: Dict[int, threading.Lock] = {}
+        self._reload()
+
+    def season(self, year: int) -> List[Dict]:
+        """Events of a season, fetched in the request only the first time"""
+        self._reload()
+        with self._lock:
+            entry = self._seasons.get(year)
+            if entry is not None:
+                self.hits += 1
+        if entry is None:
+            entry = self._fetch_now(year)
+        elif time.time() - entry['fetched_at'] >= self.ttl:
+            self._refresh_in_background(year)
+        return entry['events']
+
+    def event(self, year: int, round_number: int) -> Optional[Dict]:
+        """One event of a season by round number, None if the schedule does not list it"""
+        self.season(year)
+        with self._lock:
+            return self._index.get((year, round_number))
+
+    def _fetch_now(self, year: int) -> Dict:
+        with self._lock:
+            year_lock = self._year_locks.setdefault(year, threading.Lock())
+        # Requests for the same missing season wait for one fetch
+        with year_lock:
+            with self._lock:
+                entry = self._seasons.get(year)
+            if entry is not None:
+                return entry
+            with self._lock:
+                self.misses += 1
+            return self._store(year, self.fetch(year))
+
+    def _refresh_in_background(self, year: int):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Refresh threads do not survive a fork
+                self._pid, self._refreshing = os.getpid(), set()
+            if year in self._refreshing or time.time() - self._failed_at.get(year, 0.0) < RETRY_SECONDS:
+                return
+            self._refreshing.add(year)
+        threading.Thread(target=self._refresh, args=(year,), name=f'schedule-refresh-{year}', daemon=True).start()
+
+    def _refresh(self, year: int):
+        try:
+            self._store(year, self.fetch(year))
+            with self._lock:
+                self.refreshes += 1
+                self._failed_at.pop(year, None)
+        except Exception as e:
+            # Keep serving the stored copy
+            self.logger.warning(f"Could not refresh the {year} schedule: {e}")
+            with self._lock:
+                self.failures += 1
+                self._failed_at[year] = time.time()
+        finally:
+            with self._lock:
+                self._refreshing.discard(year)
+
+    def _store(self, year: int, events: List[Dict]) -> Dict:
+        entry = {'fetched_at': time.time(), 'events': events}
+        with self._lock:
+            self._set_season(year, entry)
+        self._persist(year, entry)
+        return entry
+
+    def _set_season(self, year: int, entry: Dict):
+        self._seasons[year] = entry
+        for key in [key for key in self._index if key[0] == year]:
+            del self._index[key]
+        for event in entry['events']:
+            self._index.setdefault((year, int(event['round_number'])), event)
+
+    def _reload(self):
+        """Adopt seasons from the file when another worker has written it since the last read"""
+        if not self.path:
+            return
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime <= self._file_mtime:
+            return
+        seasons = self._read()
+        with self._lock:
+            self._file_mtime = max(self._file_mtime, mtime)
+            for year, entry in seasons.items():
+                current = self._seasons.get(year)
+                if current is None or entry['fetched_at'] > current['fetched_at']:
+                    self._set_season(year, entry)
+
+    def _read(self) -> Dict[int, Dict]:
+        try:
+            with open(self.path) as f:
+                return {int(year): entry for year, entry in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read schedule store {self.path}: {e}")
+            return {}
+
+    def _persist(self, year: int, entry: Dict):
+        if not self.path:
+            return
+        try:
+            import fcntl
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Workers merge their season into the file, serialised through a file lock
+            with open(self.path + '.lock', 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                seasons = self._read() if os.path.exists(self.path) else {}
+                seasons[year] = entry
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump({str(key): value for key, value in seasons.items()}, f)
+                os.replace(tmp_path, self.path)
+            with self._lock:
+                self._file_mtime = max(self._file_mtime, os.path.getmtime(self.path))
+        except Exception as e:
+            self.logger.warning(f"Could not update schedule store {self.path}: {e}")
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            now = time.time()
+            total = self.hits + self.misses
+            return {
+                'path': self.path,
+                'ttl': self.ttl,
+                'seasons': {year: {'events': len(entry['events']), 'age': round(now - entry['fetched_at'], 1)}
+                            for year, entry in sorted(self._seasons.items())},
+                'refreshing': sorted(self._refreshing),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 3) if total else None,
+                'refreshes': self.refreshes,
+                'failures': self.failures,
+            }
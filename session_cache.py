@@ -0,0 +1,211 @@
+"""In-memory LRU of loaded fastf1 sessions.
+
+Loading a session from the on-disk cache still means unpickling and
+re-deriving laps and telemetry, so each worker keeps its most recently used
+sessions in memory, plus the results derived from them. A cached session serves any request whose load flags
+are a subset of what was loaded, and concurrent requests for the same
+session wait for a single load. Request counts per session are merged into
+a small JSON file so the preloading entry point can warm the most popular
+sessions.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, FrozenSet, Hashable, List, Tuple
+
+import config
+
+LOAD_PARTS = ('laps', 'telemetry', 'weather', 'messages')
+
+SessionKey = Tuple[int, int, str]
+
+
+def load_parts(load_kwargs: Dict) -> FrozenSet[str]:
+    """Data parts a session.load() call fetches; fastf1 loads everything by default"""
+    return frozenset(part for part in LOAD_PARTS if load_kwargs.get(part, True))
+
+
+def load_kwargs_for(parts: FrozenSet[str]) -> Dict[str, bool]:
+    return {part: part in parts for part in LOAD_PARTS}
+
+
+def session_spec(key: SessionKey) -> str:
+    return f"{key[0]}:{key[1]}:{key[2]}"
+
+
+class SessionCache:
+    """Least-recently-used cache of loaded fastf1 sessions with single-flight loading"""
+
+    def __init__(self, max_sessions: int, popularity_file: str = None, flush_interval: float = 60.0):
+        self.max_sessions = max_sessions
+        self.popularity_file = popularity_file
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[SessionKey, Tuple[FrozenSet[str], object]]' = OrderedDict()
+        self._key_locks: Dict[SessionKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._pending_requests: Counter = Counter()
+        self._last_flush = time.monotonic()
+
+    def _lookup(self, key: SessionKey, parts: FrozenSet[str]):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] >= parts:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        return None
+
+    def get_or_load(self, key: SessionKey, parts: FrozenSet[str], loader: Callable[[FrozenSet[str]], object]):
+        """Return a cached session holding at least `parts`, loading it once if needed"""
+        with self._lock:
+            self._pending_requests[session_spec(key)] += 1
+            session = self._lookup(key, parts)
+            if session is not None:
+                self._maybe_flush()
+                return session
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Another request may have loaded it while we waited
+                session = self._lookup(key, parts)
+                if session is not None:
+                    return session
+                entry = self._entries.get(key)
+                # Load the union so the entry keeps serving earlier, wider requests
+                wanted = parts | entry[0] if entry is not None else parts
+
+            session = loader(wanted)
+
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = (wanted, session)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_sessions:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+                self._maybe_flush()
+            return session
+
+    def keys(self) -> List[SessionKey]:
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'max_sessions': self.max_sessions,
+                'sessions': [{'session': session_spec(key), 'loaded': sorted(parts)}
+                             for key, (parts, _) in self._entries.items()],
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 3) if total else None,
+            }
+
+    def _maybe_flush(self):
+        if self.popularity_file and time.monotonic() - self._last_flush >= self.flush_interval:
+            self._last_flush = time.monotonic()
+            counts, self._pending_requests = self._pending_requests, Counter()
+            threading.Thread(target=self._flush, args=(counts,), daemon=True).start()
+
+    def flush_popularity(self):
+        """Merge request counts collected since the last flush into the popularity file"""
+        with self._lock:
+            counts, self._pending_requests = self._pending_requests, Counter()
+        self._flush(counts)
+
+    def _flush(self, counts: Counter):
+        if not counts or not self.popularity_file:
+            return
+        try:
+            import fcntl
+            os.makedirs(os.path.dirname(self.popularity_file) or '.', exist_ok=True)
+            # Every worker merges its own counts, serialised through a file lock
+            with open(self.popularity_file + '.lock', 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                merged = Counter(read_popularity(self.popularity_file))
+                merged.update(counts)
+                tmp_path = f"{self.popularity_file}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(dict(merged), f)
+                os.replace(tmp_path, self.popularity_file)
+        except Exception as e:
+            self.logger.warning(f"Could not update session popularity file: {e}")
+
+
+class DerivedCache:
+    """LRU of results derived from a session (stints, models, ...) keyed by session and name.
+
+    Derivations are computed at most once per worker at a time; concurrent
+    requests for the same result wait for the first computation.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[SessionKey, Hashable], object]' = OrderedDict()
+        self._key_locks: Dict[Tuple[SessionKey, Hashable], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: SessionKey, name: Hashable, compute: Callable[[], object]):
+        entry_key = (key, name)
+        with self._lock:
+            if entry_key in self._entries:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return self._entries[entry_key]
+            key_lock = self._key_locks.setdefault(entry_key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if entry_key in self._entries:
+                    self.hits += 1
+                    return self._entries[entry_key]
+            value = compute()
+            with self._lock:
+                self.misses += 1
+                self._entries[entry_key] = value
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'max_entries': self.max_entries,
+                'entries': [f"{session_spec(key)}/{name}" for key, name in self._entries],
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 3) if total else None,
+            }
+
+
+def read_popularity(path: str) -> Dict[str, int]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def most_requested(count: int, path: str = None) -> List[str]:
+    """Session specs ('YEAR:ROUND:TYPE') ordered by recorded request count"""
+    popularity = read_popularity(path or config.SESSION_POPULARITY_FILE)
+    return [spec for spec, _ in Counter(popularity).most_common(count)]
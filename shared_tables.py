@@ -0,0 +1,184 @@
+"""Per-session arrays shared across worker processes.
+
+A table is a directory of ``.npy`` column files plus ``meta.json``, published
+once by whichever worker derives it first and memory-mapped read-only by
+every other worker, so all workers read the same physical pages. Attaching
+is a JSON read and one ``np.load(mmap_mode='r')`` per column.
+
+Files are used rather than multiprocessing.shared_memory segments because
+they outlive the publishing worker (segments are unlinked when their creator
+exits) and can be evicted while other workers still have them mapped.
+
+Layout::
+
+    <SHARED_TABLES_DIR>/<source>_<year>_<round>_<session>/<table>/meta.json
+                                                                 /<column>.npy
+
+The directory outlives processes, so ``<source>`` names where the data came
+from: ``fastf1`` for the live, record and replay backends (the same upstream
+data) and the generator settings for synthetic sessions, so runs in
+different backend modes on one host never attach each other's tables.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+import config
+
+FORMAT_VERSION = 4
+
+SessionKey = Tuple[int, int, str]
+
+
+def data_source() -> str:
+    """Name of the data the configured backend serves, part of every table's path"""
+    if config.F1_BACKEND_MODE == 'synthetic':
+        return (f"synthetic-s{config.SYNTHETIC_SEED}-d{config.SYNTHETIC_DRIVERS}"
+                f"-l{config.SYNTHETIC_LAPS}-h{config.SYNTHETIC_HZ:g}")
+    return 'fastf1'
+
+
+class SharedTableStore:
+    """Publish and attach read-only column tables keyed by session and table name"""
+
+    def __init__(self, directory: str, max_bytes: int, memo_size: int = 64, source: str = 'fastf1'):
+        self.directory = directory
+        self.source = source
+        self.max_bytes = max_bytes
+        self.memo_size = memo_size
+        self.logger = logging.getLogger(__name__)
+        self.published = 0
+        self.attached = 0
+        self.memo_hits = 0
+        self.evicted = 0
+        # Tables this process has already mapped; mappings stay valid after eviction
+        self._memo: 'OrderedDict[Tuple[SessionKey, str], Tuple[Dict[str, np.ndarray], Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def table_path(self, key: SessionKey, name: str) -> str:
+        year, round_number, session_type = key
+        return os.path.join(self.directory, f"{self.source}_{year}_{round_number}_{session_type}", name)
+
+    def attach(self, key: SessionKey, name: str) -> Optional[Tuple[Dict[str, np.ndarray], Dict]]:
+        """Map a published table read-only, or return None if it has not been published"""
+        with self._lock:
+            table = self._memo.get((key, name))
+            if table is not None:
+                self._memo.move_to_end((key, name))
+                self.memo_hits += 1
+                return table
+
+        path = self.table_path(key, name)
+        try:
+            with open(os.path.join(path, 'meta.json')) as f:
+                meta = json.load(f)
+            if meta.get('format_version') != FORMAT_VERSION:
+                # Written by an older release; drop it so the table is republished
+                shutil.rmtree(path, ignore_errors=True)
+                return None
+            arrays = {column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode='r', allow_pickle=False)
+                      for column in meta['columns']}
+            # Directory mtime marks the table as recently used for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Could not attach shared table {path}: {e}")
+            return None
+
+        with self._lock:
+            self.attached += 1
+            self._memo[(key, name)] = (arrays, meta)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return arrays, meta
+
+    def publish(self, key: SessionKey, name: str, arrays: Dict[str, np.ndarray], meta: Dict) -> bool:
+        """Write a table and atomically move it into place; the first publisher wins"""
+        path = self.table_path(key, name)
+        if os.path.exists(os.path.join(path, 'meta.json')):
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        staging = f"{path}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            os.makedirs(staging)
+            for column, values in arrays.items():
+                np.save(os.path.join(staging, f"{column}.npy"), np.ascontiguousarray(values), allow_pickle=False)
+            meta = dict(meta, columns=list(arrays), format_version=FORMAT_VERSION, published_at=time.time())
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+            os.rename(staging, path)
+        except OSError as e:
+            # Another worker published the same table first (or the disk is full)
+            shutil.rmtree(staging, ignore_errors=True)
+            if not os.path.exists(os.path.join(path, 'meta.json')):
+                self.logger.warning(f"Could not publish shared table {path}: {e}")
+            return False
+        self.published += 1
+        self.evict()
+        return True
+
+    def _tables(self):
+        if not os.path.isdir(self.directory):
+            return
+        for session_dir in os.listdir(self.directory):
+            session_path = os.path.join(self.directory, session_dir)
+            if not os.path.isdir(session_path):
+                continue
+            for name in os.listdir(session_path):
+                path = os.path.join(session_path, name)
+                if name.endswith('.tmp') or not os.path.isdir(path):
+                    continue
+                size = sum(os.path.getsize(os.path.join(path, filename)) for filename in os.listdir(path))
+                yield path, size, os.stat(path).st_mtime
+
+    def evict(self):
+        """Remove least recently attached tables until the store fits max_bytes"""
+        try:
+            tables = sorted(self._tables(), key=lambda table: table[2])
+            total = sum(size for _, size, _ in tables)
+            for path, size, _ in tables:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                self.evicted += 1
+        except Exception as e:
+            self.logger.warning(f"Error evicting shared tables: {e}")
+
+    def get_stats(self) -> Dict:
+        tables = list(self._tables())
+        return {
+            'directory': self.directory,
+            'source': self.source,
+            'max_mb': round(self.max_bytes / 1024 / 1024, 1),
+            'tables': len(tables),
+            'total_mb': round(sum(size for _, size, _ in tables) / 1024 / 1024, 2),
+            'published': self.published,
+            'attached': self.attached,
+            'memo_hits': self.memo_hits,
+            'evicted': self.evicted,
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_shared_tables() -> SharedTableStore:
+    """Return the process-wide shared table store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SharedTableStore(config.SHARED_TABLES_DIR, config.SHARED_TABLES_MAX_MB * 1024 * 1024,
+                                          source=data_source())
+    return _store
@@ -0,0 +1,184 @@
+"""Stint segmentation and tyre degradation fits over a session LapTable.
+
+Every driver's laps are split into stints in one sorted pass (a new stint
+starts on a new driver, stint number, compound or a drop in tyre life), and
+each stint gets a least-squares fit of lap time against tyre age computed
+from per-stint sums with ``np.bincount``, so a whole session is analysed
+without a Python loop over drivers or laps. In and out laps, lap 1 and laps
+slower than 107% of the stint's best are left out of the fits.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from models import LapTable, fuel_correction, optional_float
+
+# Laps slower than this share of the stint's best are traffic, safety car or mistakes
+CLEAN_LAP_THRESHOLD = 1.07
+# Fewer clean laps than this do not give a meaningful slope
+MIN_FIT_LAPS = 3
+
+
+class StintAnalysis:
+    """Stints and degradation fits of a session, one row per driver stint"""
+
+    def __init__(self, table: LapTable, session_type: Optional[str] = None):
+        """`session_type` selects the fuel correction; lap times in races and sprints are fuel corrected"""
+        self.compounds = table.compounds
+        self.drivers = table.drivers
+        count = len(table)
+
+        order = np.lexsort((table.lap_number, table.driver_index))
+        driver = table.driver_index[order]
+        stint = table.stint[order]
+        compound = table.compound_code[order]
+        tyre_life = table.tyre_life[order]
+        lap_number = table.lap_number[order]
+        lap_time = fuel_correction(table, session_type)[2][order]
+
+        boundary = np.ones(count, dtype=bool)
+        if count > 1:
+            same_stint = (stint[1:] == stint[:-1]) | (np.isnan(stint[1:]) & np.isnan(stint[:-1]))
+            boundary[1:] = ((driver[1:] != driver[:-1]) | ~same_stint | (compound[1:] != compound[:-1])
+                            | (tyre_life[1:] < tyre_life[:-1]))
+        group = np.cumsum(boundary) - 1
+        starts = np.flatnonzero(boundary)
+        groups = len(starts)
+
+        # Tyre age, or the lap's position in the stint when fastf1 has no TyreLife
+        position = np.arange(count) - starts[group] if count else np.zeros(0, dtype=int)
+        age = np.where(np.isnan(tyre_life), position, tyre_life)
+
+        valid = ~np.isnan(lap_time) & ~table.is_pit_lap[order] & (lap_number != 1)
+        if groups:
+            best = np.minimum.reduceat(np.where(valid, lap_time, np.inf), starts)
+        else:
+            best = np.zeros(0)
+        clean = valid & (lap_time <= best[group] * CLEAN_LAP_THRESHOLD)
+        # Clean-lap mask in the table's own row order, for models built on the same laps
+        self.clean = np.zeros(count, dtype=bool)
+        self.clean[order] = clean
+
+        weight = clean.astype(float)
+        y = np.where(clean, lap_time, 0.0)
+        x = np.where(clean, age, 0.0)
+        n = np.bincount(group, weight, minlength=groups)
+        sx = np.bincount(group, x, minlength=groups)
+        sy = np.bincount(group, y, minlength=groups)
+        sxx = np.bincount(group, x * x, minlength=groups)
+        sxy = np.bincount(group, x * y, minlength=groups)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            denominator = n * sxx - sx * sx
+            fitted = (n >= MIN_FIT_LAPS) & (denominator > 0)
+            self.slope = np.where(fitted, (n * sxy - sx * sy) / denominator, np.nan)
+            self.intercept = np.where(fitted, (sy - self.slope * sx) / n, np.nan)
+            self.mean_lap_time = np.where(n > 0, sy / n, np.nan)
+            mean_age = np.where(n > 0, sx / n, np.nan)
+
+        self.driver_index = driver[starts]
+        self.compound_code = compound[starts]
+        # Stint numbers from fastf1, or counted per driver when missing
+        new_driver = np.ones(groups, dtype=bool)
+        new_driver[1:] = self.driver_index[1:] != self.driver_index[:-1]
+        first_group_of_driver = np.maximum.accumulate(np.where(new_driver, np.arange(groups), 0))
+        self.stint = np.where(np.isnan(stint[starts]), np.arange(groups) - first_group_of_driver + 1, stint[starts])
+        self.start_lap = np.minimum.reduceat(lap_number, starts) if groups else np.zeros(0, dtype=np.int32)
+        self.end_lap = np.maximum.reduceat(lap_number, starts) if groups else np.zeros(0, dtype=np.int32)
+        self.laps = np.diff(np.r_[starts, count]).astype(int)
+        self.clean_laps = n.astype(int)
+
+        # Clean laps with their age and lap time relative to their stint's mean, for pooled fits
+        self._lap_group = group[clean]
+        self._lap_age = age[clean]
+        self._lap_dx = age[clean] - mean_age[group[clean]]
+        self._lap_dy = lap_time[clean] - self.mean_lap_time[group[clean]]
+        self._lap_delta = lap_time[clean] - self.intercept[group[clean]]
+
+    def __len__(self) -> int:
+        return len(self.driver_index)
+
+    def _compound_name(self, code: int) -> Optional[str]:
+        return self.compounds[code] if code >= 0 else None
+
+    def _driver_name(self, index: int) -> Optional[str]:
+        return self.drivers[index] if index >= 0 else None
+
+    def to_records(self, driver_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Stints as plain dicts, optionally for one driver (lap times fuel corrected in races)"""
+        rows = range(len(self))
+        if driver_code is not None:
+            if driver_code not in self.drivers:
+                return []
+            rows = np.flatnonzero(self.driver_index == self.drivers.index(driver_code))
+        return [{
+            'driver': self._driver_name(int(self.driver_index[i])),
+            'stint': int(self.stint[i]),
+            'compound': self._compound_name(int(self.compound_code[i])),
+            'start_lap': int(self.start_lap[i]),
+            'end_lap': int(self.end_lap[i]),
+            'laps': int(self.laps[i]),
+            'clean_laps': int(self.clean_laps[i]),
+            'degradation_per_lap': optional_float(self.slope[i]),
+            'base_lap_time': optional_float(self.intercept[i]),
+            'mean_lap_time': optional_float(self.mean_lap_time[i]),
+        } for i in rows]
+
+    def driver_degradation(self, driver_code: str) -> Optional[float]:
+        """Pooled within-stint degradation (s per lap of tyre age) of one driver over all compounds"""
+        if driver_code not in self.drivers:
+            return None
+        mine = self.driver_index[self._lap_group] == self.drivers.index(driver_code)
+        spread = float(np.sum(self._lap_dx[mine] ** 2))
+        if mine.sum() < MIN_FIT_LAPS or spread <= 0:
+            return None
+        return float(np.sum(self._lap_dx[mine] * self._lap_dy[mine]) / spread)
+
+    def compound_curves(self, driver_codes: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Degradation per compound for every driver: pooled slope plus mean lap delta by tyre age"""
+        compound_count = max(len(self.compounds), 1)
+        driver_count = max(len(self.drivers), 1)
+        lap_compound = self.compound_code[self._lap_group].astype(int)
+        lap_driver = self.driver_index[self._lap_group].astype(int)
+        keep = (lap_compound >= 0) & (lap_driver >= 0)
+        pair = lap_driver[keep] * compound_count + lap_compound[keep]
+        dx, dy = self._lap_dx[keep], self._lap_dy[keep]
+        pairs = driver_count * compound_count
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pair_slope = np.bincount(pair, dx * dy, pairs) / np.bincount(pair, dx * dx, pairs)
+            field_slope = (np.bincount(lap_compound[keep], dx * dy, compound_count)
+                           / np.bincount(lap_compound[keep], dx * dx, compound_count))
+        pair_laps = np.bincount(pair, minlength=pairs)
+        stint_pair = self.driver_index.astype(int) * compound_count + self.compound_code.astype(int)
+        fitted = ~np.isnan(self.slope) & (self.compound_code >= 0) & (self.driver_index >= 0)
+        pair_stints = np.bincount(stint_pair[fitted], minlength=pairs)
+
+        # Mean delta to the stint's fitted base time at each tyre age (skip stints without a fit)
+        delta = self._lap_delta[keep]
+        has_fit = ~np.isnan(delta)
+        ages = self._lap_age[keep][has_fit].astype(int)
+        width = int(ages.max()) + 1 if ages.size else 1
+        cell = pair[has_fit] * width + ages
+        cell_count = np.bincount(cell, minlength=pairs * width)
+        cell_delta = np.bincount(cell, delta[has_fit], minlength=pairs * width)
+
+        wanted = set(driver_codes) if driver_codes else None
+        curves = {}
+        for compound_code, compound in enumerate(self.compounds):
+            drivers = {}
+            for driver_index, driver in enumerate(self.drivers):
+                key = driver_index * compound_count + compound_code
+                if (wanted is not None and driver not in wanted) or pair_laps[key] < MIN_FIT_LAPS:
+                    continue
+                counts = cell_count[key * width:(key + 1) * width]
+                totals = cell_delta[key * width:(key + 1) * width]
+                observed = np.flatnonzero(counts)
+                drivers[driver] = {
+                    'degradation_per_lap': optional_float(pair_slope[key]),
+                    'stints': int(pair_stints[key]),
+                    'clean_laps': int(pair_laps[key]),
+                    'curve': [[int(a), round(float(totals[a] / counts[a]), 3)] for a in observed],
+                }
+            if drivers:
+                curves[compound] = {'degradation_per_lap': optional_float(field_slope[compound_code]), 'drivers': drivers}
+        return curves
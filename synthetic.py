@@ -0,0 +1,513 @@
+"""Seeded, vectorized synthetic sessions and seasons for demos, benchmarks and load tests.
+
+The module mirrors the slice of the fastf1 API the service uses
+(``get_session``, ``get_event``, ``get_event_schedule`` and
+``Session.load``), and a loaded SyntheticSession carries ``laps``,
+``car_data``/``pos_data`` per driver number, ``weather_data``, ``results`` and
+``event`` with fastf1's column names and dtypes. Everything downstream
+(LapTable.from_laps, DriverTelemetry.from_session, warehouse ingest) therefore
+runs unchanged. All data is generated with NumPy from a seed derived from
+(seed, year, round, session), so a request always yields the same data. The
+driver count, lap count and sample rate can be scaled far beyond a real
+weekend.
+
+Serve synthetic data instead of the F1 APIs with ``F1_BACKEND_MODE=synthetic``
+(sizes from the SYNTHETIC_* settings), or time generation directly:
+    python synthetic.py 2024:1:R --drivers 200 --laps 70 --hz 10
+"""
+import argparse
+import json
+import sys
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+from models import FUEL_START_KG, FUEL_TIME_PER_KG, LapTable
+
+# Abbreviation, first name, last name, team
+DRIVERS = (
+    ('VER', 'Max', 'Verstappen', 'Red Bull Racing'), ('PER', 'Sergio', 'Perez', 'Red Bull Racing'),
+    ('LEC', 'Charles', 'Leclerc', 'Ferrari'), ('SAI', 'Carlos', 'Sainz', 'Ferrari'),
+    ('HAM', 'Lewis', 'Hamilton', 'Mercedes'), ('RUS', 'George', 'Russell', 'Mercedes'),
+    ('NOR', 'Lando', 'Norris', 'McLaren'), ('PIA', 'Oscar', 'Piastri', 'McLaren'),
+    ('ALO', 'Fernando', 'Alonso', 'Aston Martin'), ('STR', 'Lance', 'Stroll', 'Aston Martin'),
+    ('GAS', 'Pierre', 'Gasly', 'Alpine'), ('OCO', 'Esteban', 'Ocon', 'Alpine'),
+    ('ALB', 'Alexander', 'Albon', 'Williams'), ('SAR', 'Logan', 'Sargeant', 'Williams'),
+    ('TSU', 'Yuki', 'Tsunoda', 'RB'), ('RIC', 'Daniel', 'Ricciardo', 'RB'),
+    ('BOT', 'Valtteri', 'Bottas', 'Kick Sauber'), ('ZHO', 'Guanyu', 'Zhou', 'Kick Sauber'),
+    ('HUL', 'Nico', 'Hulkenberg', 'Haas'), ('MAG', 'Kevin', 'Magnussen', 'Haas'),
+)
+# Event name, location, country
+CIRCUITS = (
+    ('Bahrain Grand Prix', 'Sakhir', 'Bahrain'), ('Saudi Arabian Grand Prix', 'Jeddah', 'Saudi Arabia'),
+    ('Australian Grand Prix', 'Melbourne', 'Australia'), ('Japanese Grand Prix', 'Suzuka', 'Japan'),
+    ('Chinese Grand Prix', 'Shanghai', 'China'), ('Miami Grand Prix', 'Miami', 'United States'),
+    ('Emilia Romagna Grand Prix', 'Imola', 'Italy'), ('Monaco Grand Prix', 'Monaco', 'Monaco'),
+    ('Canadian Grand Prix', 'Montréal', 'Canada'), ('Spanish Grand Prix', 'Barcelona', 'Spain'),
+    ('Austrian Grand Prix', 'Spielberg', 'Austria'), ('British Grand Prix', 'Silverstone', 'United Kingdom'),
+    ('Hungarian Grand Prix', 'Budapest', 'Hungary'), ('Belgian Grand Prix', 'Spa-Francorchamps', 'Belgium'),
+    ('Dutch Grand Prix', 'Zandvoort', 'Netherlands'), ('Italian Grand Prix', 'Monza', 'Italy'),
+    ('Azerbaijan Grand Prix', 'Baku', 'Azerbaijan'), ('Singapore Grand Prix', 'Marina Bay', 'Singapore'),
+    ('United States Grand Prix', 'Austin', 'United States'), ('Mexico City Grand Prix', 'Mexico City', 'Mexico'),
+    ('São Paulo Grand Prix', 'São Paulo', 'Brazil'), ('Las Vegas Grand Prix', 'Las Vegas', 'United States'),
+    ('Qatar Grand Prix', 'Lusail', 'Qatar'), ('Abu Dhabi Grand Prix', 'Yas Island', 'United Arab Emirates'),
+)
+SESSION_NAMES = {'FP1': 'Practice 1', 'FP2': 'Practice 2', 'FP3': 'Practice 3', 'Q': 'Qualifying',
+                 'SQ': 'Sprint Qualifying', 'S': 'Sprint', 'R': 'Race'}
+SESSION_LAPS = {'FP1': 27, 'FP2': 27, 'FP3': 21, 'Q': 18, 'SQ': 12, 'S': 19, 'R': 57}
+SESSION_START = 3600.0  # session time (s) at which the first lap starts
+RUN_LAPS = 3  # practice and qualifying runs: out lap, push lap, in lap
+
+COMPOUNDS = ('SOFT', 'MEDIUM', 'HARD')
+COMPOUND_PACE = np.array([0.0, 0.35, 0.7])  # s per lap slower than the soft
+DEGRADATION = np.array([0.09, 0.06, 0.04])  # s per lap of tyre age
+PIT_IN_LOSS = 5.0
+PIT_OUT_LOSS = 17.0
+POSITION_HZ = 4.0
+RETIREMENT_PROBABILITY = 0.08
+
+
+def _rng(*parts) -> np.random.Generator:
+    """Generator seeded by ints and strings (strings hashed with crc32, stable across runs)"""
+    return np.random.default_rng([zlib.crc32(part.encode()) if isinstance(part, str) else int(part) for part in parts])
+
+
+def _driver_roster(count: int):
+    """(code, number, first name, last name, team) for `count` drivers, cycling the grid with numbered copies"""
+    roster = []
+    for i in range(count):
+        code, first, last, team = DRIVERS[i % len(DRIVERS)]
+        cycle = i // len(DRIVERS)
+        if cycle:
+            code = f"{code[:2]}{cycle}" if cycle < 10 else f"{i:03d}"
+            team = f"{team} {cycle + 1}"
+        roster.append((code, str(i + 1), first, last, team))
+    return roster
+
+
+class SyntheticTrack:
+    """A closed circuit: outline, speed profile and the reference lap sampled on a distance grid"""
+
+    GRID = 2000
+
+    def __init__(self, rng: np.random.Generator):
+        s = np.arange(self.GRID) / self.GRID
+        self.fraction = s
+        harmonics = np.arange(2, 6)[:, None]
+        radius = 1 + (rng.uniform(0.02, 0.12, (4, 1)) * np.cos(2 * np.pi * harmonics * s + rng.uniform(0, 2 * np.pi, (4, 1)))).sum(axis=0)
+        x, y = radius * np.cos(2 * np.pi * s), radius * np.sin(2 * np.pi * s) * rng.uniform(0.5, 0.9)
+        self.length = float(rng.uniform(4300, 5900))
+        scale = self.length / np.hypot(np.diff(x, append=x[0]), np.diff(y, append=y[0])).sum()
+        self.x, self.y = x * scale, y * scale
+
+        # Corners are Gaussian dips in the speed profile (distance measured around the loop)
+        corners = int(rng.integers(12, 20))
+        offset = (s[None, :] - rng.uniform(0, 1, (corners, 1)) + 0.5) % 1 - 0.5
+        depth = rng.uniform(0.25, 1.0, (corners, 1)) * np.exp(-0.5 * (offset / rng.uniform(0.008, 0.03, (corners, 1))) ** 2)
+        self.speed = 320 - 230 * np.clip(depth.max(axis=0), 0, 1)
+
+        change = np.roll(self.speed, -1) - self.speed
+        self.brake = change < -0.4
+        self.throttle = np.where(self.brake, 0.0, np.where(change > -0.05, 100.0, 40 + 60 * (self.speed - 90) / 230))
+        self.gear = np.clip(1 + self.speed // 40, 1, 8).astype(np.int64)
+        self.rpm = 7500 + 4500 * (self.speed % 40) / 40
+        self.drs = np.where(self.speed > 300, 12, 1)
+
+        step_time = (self.length / self.GRID) / (self.speed / 3.6)
+        self.lap_time = float(step_time.sum())
+        # Share of the reference lap time elapsed at each grid point
+        self.time_fraction = np.r_[0.0, np.cumsum(step_time)[:-1]] / self.lap_time
+        self.sector_fractions = np.diff(np.r_[0.0, np.interp([1 / 3, 2 / 3], s, self.time_fraction), 1.0])
+
+    def fraction_at(self, lap_progress: np.ndarray) -> np.ndarray:
+        """Distance fraction around the lap at the given fractions of the lap time"""
+        return np.interp(lap_progress, np.r_[self.time_fraction, 1.0], np.r_[self.fraction, 1.0])
+
+    def channel(self, name: str, fraction: np.ndarray) -> np.ndarray:
+        values = getattr(self, name)
+        if name in ('brake', 'gear', 'drs'):
+            return values[np.minimum((fraction * self.GRID).astype(np.int64), self.GRID - 1)]
+        return np.interp(fraction, self.fraction, values, period=1.0)
+
+
+def _lap_model(rng: np.random.Generator, track: SyntheticTrack, drivers: int, laps: int, session_type: str,
+               retirements: bool = True) -> Dict[str, np.ndarray]:
+    """Lap timing of a whole session as drivers x laps arrays, plus the mask of laps actually driven"""
+    race = session_type in ('R', 'S')
+    lap = np.arange(1, laps + 1)[None, :]
+    team_pace = np.repeat(rng.normal(0, 0.5, (drivers + 1) // 2), 2)[:drivers]
+    pace = track.lap_time + team_pace + rng.normal(0, 0.15, drivers)
+    noise = rng.normal(0, 0.25, (drivers, laps))
+    gap = np.zeros((drivers, laps))
+
+    if race:
+        stops = rng.integers(1, 3, drivers) if session_type == 'R' and laps >= 20 else np.zeros(drivers, dtype=int)
+        first = np.where(stops >= 1, rng.integers(round(laps * 0.25), round(laps * 0.55) + 1, drivers), laps + 1)
+        second = np.where(stops >= 2, rng.integers(round(laps * 0.6), round(laps * 0.85) + 1, drivers), laps + 1)
+        stint = 1 + (lap > first[:, None]) + (lap > second[:, None])
+        pit_in = (lap == first[:, None]) | (lap == second[:, None])
+        pit_out = (lap == first[:, None] + 1) | (lap == second[:, None] + 1)
+        fuel = FUEL_START_KG * (1 - (lap - 1) / laps) * FUEL_TIME_PER_KG
+        extra = fuel + np.where(lap == 1, 4.0, 0.0) + pit_in * PIT_IN_LOSS + pit_out * PIT_OUT_LOSS
+        stint_compound = rng.integers(0, len(COMPOUNDS), (drivers, 3))
+        gap[:, 0] = rng.permutation(drivers) * 0.2  # grid slots
+    else:
+        run_lap = (lap - 1) % RUN_LAPS
+        stint = np.broadcast_to((lap - 1) // RUN_LAPS + 1, (drivers, laps))
+        pit_out, pit_in = np.broadcast_to(run_lap == 0, (drivers, laps)), np.broadcast_to(run_lap == RUN_LAPS - 1, (drivers, laps))
+        extra = np.where(run_lap == 1, 0.0, rng.uniform(12, 30, (drivers, laps)))
+        gap = np.where(pit_out, rng.uniform(60, 300, (drivers, laps)), 0.0)
+        gap[:, 0] = rng.uniform(0, 600, drivers)
+        soft_bias = 0.8 if session_type in ('Q', 'SQ') else 0.4
+        stint_compound = np.where(rng.uniform(0, 1, (drivers, int(stint.max()))) < soft_bias, 0,
+                                  rng.integers(1, len(COMPOUNDS), (drivers, int(stint.max()))))
+
+    compound = np.take_along_axis(stint_compound, np.minimum(stint - 1, stint_compound.shape[1] - 1), axis=1)
+    new_stint = np.diff(stint, axis=1, prepend=0) != 0
+    tyre_life = lap - np.maximum.accumulate(np.where(new_stint, lap, 0), axis=1) + 1
+    lap_time = (pace[:, None] + COMPOUND_PACE[compound] + DEGRADATION[compound] * tyre_life + extra + noise)
+
+    lap_end = SESSION_START + np.cumsum(gap + lap_time, axis=1)
+    lap_start = lap_end - lap_time
+    driven = np.ones((drivers, laps), dtype=bool)
+    retired = np.zeros(drivers, dtype=bool)
+    if race:
+        # Everyone finishes the lap they are on when the leader takes the flag; some retire on the way
+        driven &= lap_start < lap_end[:, -1].min()
+        if retirements and laps > 1:
+            retired = rng.uniform(0, 1, drivers) < RETIREMENT_PROBABILITY
+            driven &= lap <= np.where(retired, rng.integers(1, laps, drivers), laps)[:, None]
+
+    eligible = driven & ~pit_in & ~pit_out
+    best_so_far = np.minimum.accumulate(np.where(eligible, lap_time, np.inf), axis=1)
+    return {
+        'lap_number': np.broadcast_to(lap, (drivers, laps)), 'lap_time': lap_time,
+        'lap_start': lap_start, 'lap_end': lap_end, 'stint': stint, 'compound': compound,
+        'tyre_life': tyre_life, 'pit_in': pit_in, 'pit_out': pit_out, 'driven': driven, 'retired': retired,
+        'personal_best': eligible & (lap_time <= best_so_far),
+        'sectors': lap_time[..., None] * track.sector_fractions,
+    }
+
+
+def _seconds(values: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """Float seconds as timedelta64[ns] (NaT where NaN or masked out); much faster than pd.to_timedelta"""
+    nanoseconds = np.asarray(values, dtype=float) * 1e9
+    if mask is not None:
+        nanoseconds = np.where(mask, nanoseconds, np.nan)
+    finite = np.isfinite(nanoseconds)
+    ticks = np.full(nanoseconds.shape, np.iinfo(np.int64).min, dtype=np.int64)
+    ticks[finite] = np.round(nanoseconds[finite]).astype(np.int64)
+    return ticks.view('timedelta64[ns]')
+
+
+class SyntheticLaps(pd.DataFrame):
+    """Laps DataFrame with the fastf1 Laps selectors the service uses"""
+
+    @property
+    def _constructor(self):
+        return SyntheticLaps
+
+    def pick_drivers(self, identifiers) -> 'SyntheticLaps':
+        identifiers = [str(identifier) for identifier in ([identifiers] if isinstance(identifiers, (str, int)) else identifiers)]
+        return self[self['Driver'].isin(identifiers) | self['DriverNumber'].isin(identifiers)]
+
+    def pick_driver(self, identifier) -> 'SyntheticLaps':
+        return self.pick_drivers(identifier)
+
+    def pick_fastest(self) -> Optional[pd.Series]:
+        timed = self[self['LapTime'].notna() & self['IsPersonalBest'].eq(True)]
+        return None if timed.empty else timed.loc[timed['LapTime'].idxmin()]
+
+
+class SyntheticSession:
+    """A generated session that loads and reads like a fastf1 Session"""
+
+    def __init__(self, year: int, round_number: int, session_type: str, drivers: Optional[int] = None,
+                 laps: Optional[int] = None, hz: Optional[float] = None, seed: Optional[int] = None):
+        self.year, self.round_number, self.session_type = year, round_number, session_type
+        self.seed = config.SYNTHETIC_SEED if seed is None else seed
+        self.hz = hz or config.SYNTHETIC_HZ
+        self.roster = _driver_roster(drivers or config.SYNTHETIC_DRIVERS)
+        self.total_laps = laps or config.SYNTHETIC_LAPS or SESSION_LAPS.get(session_type, 20)
+        self.event = get_event(year, round_number, seed=self.seed)
+        self.name = SESSION_NAMES.get(session_type, session_type)
+        self.date = self.event['EventDate'] + pd.Timedelta(hours=15)
+        self.drivers = [number for _, number, _, _, _ in self.roster]
+        # The circuit is shared by every session of the round
+        self.track = SyntheticTrack(_rng(self.seed, year, round_number, 'track'))
+        self._model = None
+        self.laps = SyntheticLaps()
+        self.results = pd.DataFrame()
+        self.car_data: Dict[str, pd.DataFrame] = {}
+        self.pos_data: Dict[str, pd.DataFrame] = {}
+        self.weather_data = pd.DataFrame()
+        self.race_control_messages = pd.DataFrame()
+
+    @property
+    def model(self) -> Dict[str, np.ndarray]:
+        if self._model is None:
+            rng = _rng(self.seed, self.year, self.round_number, self.session_type)
+            self._model = _lap_model(rng, self.track, len(self.roster), self.total_laps, self.session_type)
+        return self._model
+
+    def load(self, *, laps: bool = True, telemetry: bool = True, weather: bool = True, messages: bool = True, **_):
+        """Generate the requested parts, like fastf1's Session.load()"""
+        if laps or telemetry:
+            self.laps = self._laps()
+            self.results = self._results()
+        if telemetry:
+            for driver in range(len(self.roster)):
+                number = self.roster[driver][1]
+                self.car_data[number], self.pos_data[number] = self._driver_samples(driver)
+        if weather:
+            self.weather_data = self._weather()
+        return self
+
+    def _laps(self) -> SyntheticLaps:
+        model = self.model
+        driven = model['driven']
+        driver, _ = np.nonzero(driven)
+
+        def pick(name):
+            return model[name][driven]
+        lap_start, lap_end = pick('lap_start'), pick('lap_end')
+
+        position = np.full(driven.shape, np.nan)
+        if self.session_type in ('R', 'S'):
+            order = np.argsort(np.where(driven, model['lap_end'], np.inf), axis=0, kind='stable')
+            np.put_along_axis(position, order, np.arange(1, len(self.roster) + 1, dtype=float)[:, None], axis=0)
+            position[~driven] = np.nan
+
+        codes = np.array([entry[0] for entry in self.roster], dtype=object)
+        numbers = np.array([entry[1] for entry in self.roster], dtype=object)
+        teams = np.array([entry[4] for entry in self.roster], dtype=object)
+        sectors = model['sectors'][driven]
+        pit_in, pit_out = pick('pit_in'), pick('pit_out')
+        return SyntheticLaps({
+            'Time': _seconds(lap_end),
+            'Driver': codes[driver],
+            'DriverNumber': numbers[driver],
+            'LapTime': _seconds(pick('lap_time')),
+            'LapNumber': pick('lap_number').astype(float),
+            'Stint': pick('stint').astype(float),
+            'PitOutTime': _seconds(lap_start, pit_out),
+            'PitInTime': _seconds(lap_end - 2.0, pit_in),
+            'Sector1Time': _seconds(sectors[:, 0]),
+            'Sector2Time': _seconds(sectors[:, 1]),
+            'Sector3Time': _seconds(sectors[:, 2]),
+            'IsPersonalBest': pick('personal_best'),
+            'Compound': np.array(COMPOUNDS, dtype=object)[pick('compound')],
+            'TyreLife': pick('tyre_life').astype(float),
+            'FreshTyre': pick('tyre_life') == 1,
+            'Team': teams[driver],
+            'LapStartTime': _seconds(lap_start),
+            'LapStartDate': np.datetime64(self.date) + _seconds(lap_start),
+            'TrackStatus': '1',
+            'Position': position[driven],
+            'Deleted': False,
+            'IsAccurate': ~(pit_in | pit_out),
+        })
+
+    def _results(self) -> pd.DataFrame:
+        model = self.model
+        laps_done = model['driven'].sum(axis=1)
+        finish = np.where(laps_done > 0, np.take_along_axis(model['lap_end'], np.maximum(laps_done - 1, 0)[:, None], 1)[:, 0], np.inf)
+        best = np.where(model['driven'], model['lap_time'], np.inf).min(axis=1)
+        race = self.session_type in ('R', 'S')
+        # Races are classified by laps then finishing time, other sessions by best lap
+        order = np.lexsort((finish, -laps_done)) if race else np.argsort(best, kind='stable')
+        position = np.empty(len(order), dtype=float)
+        position[order] = np.arange(1, len(order) + 1)
+        points_table = np.array([25, 18, 15, 12, 10, 8, 6, 4, 2, 1] if self.session_type == 'R' else [8, 7, 6, 5, 4, 3, 2, 1])
+        points = np.where(race & (position <= len(points_table)), points_table[np.minimum(position.astype(int), len(points_table)) - 1], 0)
+        laps_down = laps_done.max() - laps_done
+        lapped = np.array([f"+{down} Lap{'s' if down > 1 else ''}" for down in laps_down.tolist()], dtype=object)
+        status = np.where(model['retired'], 'Retired', np.where(laps_down > 0, lapped, 'Finished')) if race else ''
+        rng = _rng(self.seed, self.year, self.round_number, self.session_type, 'grid')
+        return pd.DataFrame({
+            'DriverNumber': [entry[1] for entry in self.roster],
+            'Abbreviation': [entry[0] for entry in self.roster],
+            'FirstName': [entry[2] for entry in self.roster],
+            'LastName': [entry[3] for entry in self.roster],
+            'FullName': [f"{entry[2]} {entry[3]}" for entry in self.roster],
+            'TeamName': [entry[4] for entry in self.roster],
+            'Position': position,
+            'GridPosition': (rng.permutation(len(self.roster)) + 1).astype(float) if race else np.nan,
+            'Status': status,
+            'Points': points.astype(float),
+            'Time': _seconds(finish - finish.min(), np.isfinite(finish) & (laps_down == 0) & race),
+        })
+
+    def _driver_samples(self, driver: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Car data at `hz` and position data at ~4 Hz for the whole of one driver's session"""
+        model = self.model
+        driven = model['driven'][driver]
+        lap_start, lap_end, lap_time = (model[name][driver][driven] for name in ('lap_start', 'lap_end', 'lap_time'))
+        rng = _rng(self.seed, self.year, self.round_number, self.session_type, 'samples', driver)
+
+        def on_track(times):
+            lap = np.clip(np.searchsorted(lap_end, times, side='right'), 0, len(lap_end) - 1)
+            moving = (times >= lap_start[lap]) & (times < lap_end[lap])
+            fraction = np.where(moving, self.track.fraction_at((times - lap_start[lap]) / lap_time[lap]), 0.0)
+            return moving, fraction, self.track.lap_time / lap_time[lap]
+
+        times = np.arange(lap_start[0] - 2.0, lap_end[-1] + 2.0, 1.0 / self.hz)
+        moving, fraction, pace = on_track(times)
+        speed = np.where(moving, np.maximum(self.track.channel('speed', fraction) * pace + rng.normal(0, 1.5, len(times)), 0), 0.0)
+        session_time = _seconds(times)
+        car = pd.DataFrame({
+            'Date': np.datetime64(self.date) + session_time,
+            'RPM': np.where(moving, self.track.channel('rpm', fraction), 0.0),
+            'Speed': speed,
+            'nGear': np.where(moving, self.track.channel('gear', fraction), 0),
+            'Throttle': np.where(moving, self.track.channel('throttle', fraction), 0.0),
+            'Brake': moving & self.track.channel('brake', fraction),
+            'DRS': np.where(moving, self.track.channel('drs', fraction), 0),
+            'Source': 'car',
+            'Time': session_time - session_time[0],
+            'SessionTime': session_time,
+        })
+
+        times = np.arange(lap_start[0] - 2.0 + 0.11, lap_end[-1] + 2.0, 1.0 / POSITION_HZ)
+        moving, fraction, _ = on_track(times)
+        session_time = _seconds(times)
+        # fastf1 positions are in 1/10 m
+        pos = pd.DataFrame({
+            'Date': np.datetime64(self.date) + session_time,
+            'Status': np.where(moving, 'OnTrack', 'OffTrack'),
+            'X': self.track.channel('x', fraction) * 10,
+            'Y': self.track.channel('y', fraction) * 10,
+            'Z': np.zeros(len(times)),
+            'Source': 'pos',
+            'Time': session_time - session_time[0],
+            'SessionTime': session_time,
+        })
+        return car, pos
+
+    def _weather(self) -> pd.DataFrame:
+        rng = _rng(self.seed, self.year, self.round_number, self.session_type, 'weather')
+        end = float(self.model['lap_end'][self.model['driven']].max()) + 300 if self.model['driven'].any() else SESSION_START
+        times = np.arange(0.0, end, 60.0)
+        drift = np.cumsum(rng.normal(0, 0.05, len(times)))
+        air = rng.uniform(16, 34) + drift
+        rain_start = rng.uniform(0, end) if rng.uniform() < 0.15 else np.inf
+        return pd.DataFrame({
+            'Time': _seconds(times),
+            'AirTemp': np.round(air, 1),
+            'Humidity': np.round(np.clip(rng.uniform(30, 80) - drift * 2, 5, 100), 1),
+            'Pressure': np.round(rng.uniform(1005, 1025) + np.cumsum(rng.normal(0, 0.02, len(times))), 1),
+            'Rainfall': (times >= rain_start) & (times < rain_start + 1800),
+            'TrackTemp': np.round(air + rng.uniform(8, 20) + drift * 1.5, 1),
+            'WindDirection': (rng.uniform(0, 360) + np.cumsum(rng.normal(0, 4, len(times)))).astype(int) % 360,
+            'WindSpeed': np.round(np.abs(rng.uniform(0.5, 5) + np.cumsum(rng.normal(0, 0.05, len(times)))), 1),
+        })
+
+
+def get_event_schedule(year: int, rounds: Optional[int] = None, seed: Optional[int] = None) -> pd.DataFrame:
+    """A season of events with fastf1's schedule columns"""
+    seed = config.SYNTHETIC_SEED if seed is None else seed
+    rounds = rounds or config.SYNTHETIC_ROUNDS
+    rng = _rng(seed, year, 'season')
+    circuits = [CIRCUITS[i % len(CIRCUITS)] for i in rng.permutation(max(rounds, len(CIRCUITS)))[:rounds]]
+    dates = pd.Timestamp(year, 3, 2) + pd.to_timedelta(np.cumsum(np.r_[0, rng.choice([7, 14], rounds - 1)]), unit='D')
+    sprint = rng.uniform(0, 1, rounds) < 0.25
+    return pd.DataFrame({
+        'RoundNumber': np.arange(1, rounds + 1),
+        'Country': [country for _, _, country in circuits],
+        'Location': [location for _, location, _ in circuits],
+        'EventName': [name for name, _, _ in circuits],
+        'EventDate': dates,
+        'EventFormat': np.where(sprint, 'sprint_qualifying', 'conventional'),
+    })
+
+
+def get_event(year: int, round_number: int, seed: Optional[int] = None) -> pd.Series:
+    schedule = get_event_schedule(year, max(round_number, config.SYNTHETIC_ROUNDS), seed)
+    return schedule.iloc[round_number - 1]
+
+
+def get_session(year: int, round_number: int, session_type: str, **sizes) -> SyntheticSession:
+    """An unloaded synthetic session; sizes (drivers, laps, hz, seed) default to the SYNTHETIC_* settings"""
+    return SyntheticSession(year, round_number, session_type, **sizes)
+
+
+def sample_lap_table(driver_code: str, lap_count: int = 30) -> LapTable:
+    """A single driver's race laps, seeded by the driver code so a driver always gets the same sample"""
+    rng = _rng(config.SYNTHETIC_SEED, 'sample', driver_code)
+    track = SyntheticTrack(rng)
+    model = _lap_model(rng, track, 1, lap_count, 'R', retirements=False)
+    driven = model['driven'][0]
+
+    def pick(name):
+        return model[name][0][driven]
+    sectors = model['sectors'][0][driven]
+    return LapTable(
+        lap_number=pick('lap_number'), lap_time=pick('lap_time'),
+        sector_1_time=sectors[:, 0], sector_2_time=sectors[:, 1], sector_3_time=sectors[:, 2],
+        compound_code=pick('compound'), tyre_life=pick('tyre_life'), is_personal_best=pick('personal_best'),
+        driver_index=np.zeros(int(driven.sum())), stint=pick('stint'), is_pit_lap=pick('pit_in') | pick('pit_out'),
+        lap_start_time=pick('lap_start'), lap_end_time=pick('lap_end'),
+        compounds=COMPOUNDS, drivers=(driver_code,)
+    )
+
+
+def sample_lap_telemetry(driver_code: str, lap_number: int, hz: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """One lap of car telemetry (distance, time and channels) seeded by driver and lap"""
+    hz = hz or config.SYNTHETIC_HZ
+    track = SyntheticTrack(_rng(config.SYNTHETIC_SEED, 'sample', driver_code))
+    rng = _rng(config.SYNTHETIC_SEED, 'sample', driver_code, lap_number)
+    lap_time = track.lap_time + rng.normal(0, 0.3)
+    times = np.arange(0.0, lap_time, 1.0 / hz)
+    fraction = track.fraction_at(times / lap_time)
+    return {
+        'distance': fraction * track.length,
+        'speed': np.maximum(track.channel('speed', fraction) * track.lap_time / lap_time + rng.normal(0, 1.5, len(times)), 0),
+        'throttle': track.channel('throttle', fraction),
+        'brake': track.channel('brake', fraction),
+        'gear': track.channel('gear', fraction),
+        'drs': track.channel('drs', fraction),
+        'time': times,
+    }
+
+
+def main(argv=None) -> int:
+    from offline_backend import parse_session_spec
+    from telemetry_index import DriverTelemetry
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('session', type=parse_session_spec, metavar='YEAR:ROUND:TYPE')
+    parser.add_argument('--drivers', type=int, default=config.SYNTHETIC_DRIVERS)
+    parser.add_argument('--laps', type=int, default=config.SYNTHETIC_LAPS or None)
+    parser.add_argument('--hz', type=float, default=config.SYNTHETIC_HZ)
+    parser.add_argument('--seed', type=int, default=config.SYNTHETIC_SEED)
+    args = parser.parse_args(argv)
+
+    timings = {}
+    start = time.perf_counter()
+    session = get_session(*args.session, drivers=args.drivers, laps=args.laps, hz=args.hz, seed=args.seed).load()
+    timings['generate'] = time.perf_counter() - start
+    start = time.perf_counter()
+    table = LapTable.from_laps(session.laps)
+    timings['lap_table'] = time.perf_counter() - start
+    start = time.perf_counter()
+    for code, _, _, _, _ in session.roster:
+        DriverTelemetry.from_session(session, code)
+    timings['telemetry_merge'] = time.perf_counter() - start
+    print(json.dumps({
+        'session': f"{args.session[0]}:{args.session[1]}:{args.session[2]}",
+        'event': str(session.event['EventName']),
+        'drivers': len(session.roster),
+        'laps': len(table),
+        'car_samples': sum(len(frame) for frame in session.car_data.values()),
+        'position_samples': sum(len(frame) for frame in session.pos_data.values()),
+        'seconds': {name: round(value, 3) for name, value in timings.items()},
+    }, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
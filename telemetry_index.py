@@ -0,0 +1,182 @@
+"""Session-wide merged telemetry per driver with a lap index.
+
+fastf1's ``Lap.get_telemetry()`` slices, merges and re-interpolates car and
+position data on every call. Here a driver's whole session is merged once:
+position samples are interpolated onto the car data timeline with
+``np.interp`` and distance is integrated from speed. A lap index of sample
+offsets then turns any lap into an O(log n) slice of views, and per-lap
+reductions (top speed, ...) run over all laps with ``np.maximum.reduceat``.
+The arrays are published to the shared table store so other workers map
+them instead of merging again.
+"""
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Channels kept per sample, besides session time and distance
+CHANNELS = {
+    'speed': 'Speed',
+    'throttle': 'Throttle',
+    'brake': 'Brake',
+    'gear': 'nGear',
+    'drs': 'DRS',
+    'rpm': 'RPM',
+}
+POSITION_CHANNELS = {'x': 'X', 'y': 'Y'}
+LAP_COLUMNS = ('lap_number', 'lap_start_offset', 'lap_end_offset', 'lap_start_time', 'lap_start_distance')
+
+
+def _seconds(series) -> np.ndarray:
+    return series.dt.total_seconds().to_numpy(dtype=float, na_value=np.nan)
+
+
+class DriverTelemetry:
+    """One driver's merged session telemetry plus the sample range of every lap"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        self.arrays = arrays
+        self.meta = meta
+        self.session_time = arrays['session_time']
+        self.distance = arrays['distance']
+        self.lap_number = arrays['lap_number']
+        self.lap_start_offset = arrays['lap_start_offset']
+        self.lap_end_offset = arrays['lap_end_offset']
+        self.lap_start_time = arrays['lap_start_time']
+        self.lap_start_distance = arrays['lap_start_distance']
+
+    @classmethod
+    def from_session(cls, session, driver_code: str) -> 'DriverTelemetry':
+        """Merge a loaded session's car and position data for one driver"""
+        laps = session.laps.pick_drivers(driver_code)
+        if laps.empty:
+            raise ValueError(f"no laps for driver {driver_code}")
+        driver_number = str(laps['DriverNumber'].iloc[0])
+        car = session.car_data[driver_number]
+        pos = session.pos_data[driver_number]
+
+        session_time = _seconds(car['SessionTime'])
+        arrays = {'session_time': session_time}
+        for name, column in CHANNELS.items():
+            if column in car.columns:
+                arrays[name] = car[column].to_numpy()
+        if 'brake' in arrays:
+            arrays['brake'] = arrays['brake'].astype(bool)
+        pos_time = _seconds(pos['SessionTime'])
+        for name, column in POSITION_CHANNELS.items():
+            arrays[name] = np.interp(session_time, pos_time, pos[column].to_numpy(dtype=float))
+
+        # Distance integrated over the session; per-lap distance is a difference, so errors do not accumulate
+        step = np.diff(session_time, prepend=session_time[:1]) * arrays['speed'].astype(float) / 3.6
+        arrays['distance'] = np.cumsum(step)
+
+        laps = laps.sort_values('LapNumber')
+        lap_start = _seconds(laps['LapStartTime'])
+        lap_end = _seconds(laps['Time'])
+        timed = ~(np.isnan(lap_start) | np.isnan(lap_end))
+        lap_start, lap_end = lap_start[timed], lap_end[timed]
+        arrays['lap_number'] = laps['LapNumber'].to_numpy(dtype=float)[timed].astype(np.int32)
+        arrays['lap_start_offset'] = np.searchsorted(session_time, lap_start, side='left')
+        arrays['lap_end_offset'] = np.searchsorted(session_time, lap_end, side='right')
+        arrays['lap_start_time'] = lap_start
+        arrays['lap_start_distance'] = np.interp(lap_start, session_time, arrays['distance'])
+
+        return cls(arrays, {'driver': driver_code, 'event_name': str(session.event['EventName'])})
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> 'DriverTelemetry':
+        return cls(arrays, meta)
+
+    def to_arrays(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        return self.arrays, dict(self.meta)
+
+    def __len__(self) -> int:
+        return len(self.session_time)
+
+    def _lap_index(self, lap_number: int) -> Optional[int]:
+        index = int(np.searchsorted(self.lap_number, lap_number))
+        if index < len(self.lap_number) and self.lap_number[index] == lap_number:
+            return index
+        return None
+
+    def lap(self, lap_number: int, channels: Optional[Sequence[str]] = None,
+            distance: Optional[Tuple[Optional[float], Optional[float]]] = None) -> Optional[Dict[str, np.ndarray]]:
+        """Channels of one lap as array views, with distance and time measured from the lap start
+
+        `channels` limits which arrays are sliced and `distance` = (from, to) in
+        metres narrows the slice to that window of the lap (either end may be
+        None). Returns None for unknown laps and laps without samples.
+        """
+        index = self._lap_index(lap_number)
+        if index is None:
+            return None
+        start, end = int(self.lap_start_offset[index]), int(self.lap_end_offset[index])
+        if end <= start:
+            return None
+        if distance is not None:
+            # Distance is integrated from speed, so it never decreases and can be binary searched
+            lap_distance = self.distance[start:end] - self.lap_start_distance[index]
+            low, high = distance
+            if high is not None:
+                end = start + int(np.searchsorted(lap_distance, high, side='right'))
+            if low is not None:
+                start += int(np.searchsorted(lap_distance, low, side='left'))
+            end = max(start, end)
+
+        lap = {name: values[start:end] for name, values in self.arrays.items()
+               if name not in LAP_COLUMNS and name not in ('session_time', 'distance')
+               and (channels is None or name in channels)}
+        if channels is None or 'time' in channels:
+            lap['time'] = self.session_time[start:end] - self.lap_start_time[index]
+        if channels is None or 'distance' in channels:
+            lap['distance'] = self.distance[start:end] - self.lap_start_distance[index]
+        return lap
+
+    def lap_maxima(self, channel: str = 'speed') -> Tuple[np.ndarray, np.ndarray]:
+        """Lap numbers and the maximum of a channel on each lap, for all laps at once"""
+        has_samples = self.lap_end_offset > self.lap_start_offset
+        starts = self.lap_start_offset[has_samples]
+        if not starts.size:
+            return np.zeros(0, dtype=np.int32), np.zeros(0)
+        ends = self.lap_end_offset[has_samples]
+        # Samples outside every lap are masked, so each reduceat segment [start_i, start_i+1) holds only lap i
+        inside = np.zeros(len(self) + 1, dtype=np.int32)
+        np.add.at(inside, starts, 1)
+        np.add.at(inside, ends, -1)
+        values = np.where(np.cumsum(inside[:-1]) > 0, np.asarray(self.arrays[channel], dtype=float), -np.inf)
+        return self.lap_number[has_samples], np.maximum.reduceat(values, starts)
+
+
+class SessionTelemetry:
+    """Telemetry of every driver in one session, each built on first use.
+
+    Held as a single cache entry per session, so a full field's telemetry
+    does not take one LRU slot per driver.
+    """
+
+    def __init__(self, build: Callable[[str], DriverTelemetry]):
+        self._build = build
+        self._drivers: Dict[str, DriverTelemetry] = {}
+        self._driver_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def driver(self, driver_code: str) -> DriverTelemetry:
+        """A driver's telemetry, built once; concurrent callers wait for the first build"""
+        with self._lock:
+            telemetry = self._drivers.get(driver_code)
+            if telemetry is not None:
+                return telemetry
+            driver_lock = self._driver_locks.setdefault(driver_code, threading.Lock())
+        with driver_lock:
+            with self._lock:
+                telemetry = self._drivers.get(driver_code)
+            if telemetry is None:
+                telemetry = self._build(driver_code)
+                with self._lock:
+                    self._drivers[driver_code] = telemetry
+            return telemetry
+
+    @property
+    def drivers(self) -> List[str]:
+        with self._lock:
+            return list(self._drivers)
@@ -0,0 +1,69 @@
+"""GapTimeline against a lap-by-lap recount of the same synthetic race"""
+import numpy as np
+import pytest
+
+import synthetic
+from gaps import GapTimeline
+from models import LapTable
+
+
+@pytest.fixture(scope='module')
+def race():
+    # Seed 1: one retirement and cars a lap down at the flag
+    session = synthetic.get_session(2024, 1, 'R', drivers=20, laps=30, seed=1)
+    session.load(telemetry=False, weather=False)
+    table = LapTable.from_laps(session.laps)
+    return session, table, GapTimeline(table)
+
+
+def _crossings(table: LapTable, laps: int) -> np.ndarray:
+    crossing = np.full((len(table.drivers), laps), np.nan)
+    for driver, lap, time in zip(table.driver_index.tolist(), table.lap_number.tolist(), table.lap_end_time.tolist()):
+        crossing[driver, lap - 1] = time
+    return crossing
+
+
+def test_positions_rank_line_crossings(race):
+    _, table, timeline = race
+    crossing = _crossings(table, timeline.laps)
+    for lap in range(timeline.laps):
+        done = np.flatnonzero(~np.isnan(crossing[:, lap]))
+        expected = done[np.argsort(crossing[done, lap], kind='stable')]
+        assert np.array_equal(timeline.position[expected, lap], np.arange(1, len(done) + 1))
+        assert timeline.leader[lap] == table.drivers[expected[0]]
+        assert timeline.gap[expected[0], lap] == 0
+        # Intervals add up to the gap to the leader
+        np.testing.assert_allclose(np.cumsum(timeline.interval[expected, lap]), timeline.gap[expected, lap])
+
+
+def test_lapped_cars_count_leader_crossings(race):
+    session, table, timeline = race
+    crossing = _crossings(table, timeline.laps)
+    leader_line = np.nanmin(crossing, axis=0)
+    laps_done = session.model['driven'].sum(axis=1)
+    lapped = [table.drivers.index(session.roster[d][0]) for d in np.flatnonzero(
+        (laps_done < timeline.laps) & ~session.model['retired'])]
+    assert lapped, 'the fixture should have cars a lap down'
+    for driver in range(len(table.drivers)):
+        for lap in np.flatnonzero(~np.isnan(crossing[driver])):
+            expected = max(int(np.sum(leader_line <= crossing[driver, lap])) - (lap + 1), 0)
+            assert timeline.laps_down[driver, lap] == expected
+    for driver in lapped:
+        last = int(np.flatnonzero(~np.isnan(crossing[driver]))[-1])
+        assert timeline.laps_down[driver, last] >= 1
+
+
+def test_retired_cars_drop_out_after_their_last_lap(race):
+    session, table, timeline = race
+    retired = np.flatnonzero(session.model['retired'])
+    assert retired.size, 'the fixture should have a retirement'
+    for car in retired:
+        driver = table.drivers.index(session.roster[car][0])
+        done = int(session.model['driven'][car].sum())
+        assert not np.isnan(timeline.position[driver, :done]).any()
+        assert np.isnan(timeline.position[driver, done:]).all()
+        assert np.isnan(timeline.gap[driver, done:]).all()
+        assert (timeline.laps_down[driver, done:] == -1).all()
+        payload = timeline.to_dict()['drivers'][table.drivers[driver]]
+        assert payload['position'][done:] == [None] * (timeline.laps - done)
+        assert payload['laps_down'][done:] == [None] * (timeline.laps - done)
@@ -0,0 +1,58 @@
+"""Mini-sector times of synthetic laps: they partition each lap and do not depend on integrated lap length"""
+import numpy as np
+import pytest
+
+import synthetic
+from minisectors import MiniSectorDominance
+from models import LapTable
+from telemetry_index import DriverTelemetry
+
+HZ = 10.0
+LAP = 5
+
+
+@pytest.fixture(scope='module')
+def laps():
+    session = synthetic.get_session(2024, 1, 'R', drivers=6, laps=8, hz=HZ, seed=2)
+    session.load(weather=False)
+    table = LapTable.from_laps(session.laps)
+    laps, lap_times = {}, {}
+    for driver in table.drivers:
+        laps[driver] = DriverTelemetry.from_session(session, driver).lap(LAP)
+        own = table.for_driver(driver)
+        lap_times[driver] = float(own.lap_time[own.lap_number == LAP][0])
+    return laps, lap_times
+
+
+def test_minisector_times_sum_to_lap_time(laps):
+    laps, lap_times = laps
+    dominance = MiniSectorDominance(laps, 25)
+    assert not np.isnan(dominance.times).any()
+    for i, driver in enumerate(dominance.drivers):
+        lap = laps[driver]
+        assert dominance.times[i].sum() == pytest.approx(lap['time'][-1] - lap['time'][0])
+        # Telemetry starts and ends within a sample of the timed lap
+        assert dominance.times[i].sum() == pytest.approx(lap_times[driver], abs=2 / HZ)
+
+
+def test_boundaries_and_winners(laps):
+    laps, _ = laps
+    dominance = MiniSectorDominance(laps, 25, reference_driver='VER')
+    assert dominance.boundaries[0] == 0
+    assert dominance.boundaries[-1] == pytest.approx(dominance.lap_length)
+    assert np.all(np.diff(dominance.boundaries) > 0)
+    np.testing.assert_allclose(dominance.deltas[dominance.fastest, np.arange(25)], 0)
+    assert (dominance.deltas >= 0).all()
+
+    payload = dominance.to_dict()
+    assert None not in payload['dominance']
+    assert sum(driver['minisectors_won'] for driver in payload['drivers'].values()) == 25
+    assert payload['track']['minisector'][0] == 0 and payload['track']['minisector'][-1] == 24
+    assert np.all(np.diff(payload['track']['minisector']) >= 0)
+
+
+def test_integrated_lap_length_does_not_shift_boundaries(laps):
+    laps, _ = laps
+    stretched = dict(laps, PER=dict(laps['PER'], distance=laps['PER']['distance'] * 1.01))
+    plain, scaled = MiniSectorDominance(laps, 25), MiniSectorDominance(stretched, 25)
+    np.testing.assert_allclose(plain.times, scaled.times)
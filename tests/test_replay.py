@@ -0,0 +1,77 @@
+"""Replay chunks of a synthetic race: clock coverage, chunk bounds and gap masking"""
+import numpy as np
+import pytest
+
+import synthetic
+from models import LapTable
+from replay import CHUNK_SECONDS, MAX_GAP_SECONDS, ReplaySource
+from telemetry_index import DriverTelemetry
+
+HZ = 4
+
+
+@pytest.fixture(scope='module')
+def tracks():
+    # Seed 1: HAM retires after lap 4 of 8
+    session = synthetic.get_session(2024, 1, 'R', drivers=6, laps=8, hz=4.0, seed=1)
+    session.load(weather=False)
+    tracks = {}
+    for driver in LapTable.from_laps(session.laps).drivers:
+        telemetry = DriverTelemetry.from_session(session, driver)
+        tracks[driver] = (telemetry.session_time, telemetry.arrays['x'], telemetry.arrays['y'])
+    return tracks
+
+
+def _replay(source: ReplaySource):
+    """Clock and positions of every chunk, concatenated"""
+    chunks = [source.chunk(index, HZ) for index in range(source.chunk_count())]
+    return np.concatenate([clock for clock, _ in chunks]), np.concatenate([frames for _, frames in chunks])
+
+
+def test_chunks_cover_the_session_once(tracks):
+    source = ReplaySource(tracks)
+    assert source.chunk_count() == int(np.ceil(source.duration / CHUNK_SECONDS))
+    for index in (-1, source.chunk_count()):
+        with pytest.raises(IndexError):
+            source.chunk(index, HZ)
+    for index in range(source.chunk_count()):
+        clock, frames = source.chunk(index, HZ)
+        assert len(clock) <= CHUNK_SECONDS * HZ
+        assert frames.shape == (len(clock), len(source.drivers), 2) and frames.dtype == np.float32
+    clock, _ = _replay(source)
+    np.testing.assert_allclose(np.diff(clock), 1 / HZ)
+    assert clock[0] == source.start
+    assert clock[-1] >= source.end - 1 / HZ
+
+
+def test_positions_match_samples_and_mask_outside_data(tracks):
+    source = ReplaySource(tracks)
+    clock, frames = _replay(source)
+    for i, driver in enumerate(source.drivers):
+        time, x, y = tracks[driver]
+        inside = (clock >= time[0]) & (clock <= time[-1])
+        assert not np.isnan(frames[inside, i]).any()
+        # Nothing leaks in from the neighbouring cars' data before the first or after the last sample
+        assert np.isnan(frames[~inside, i]).all()
+        np.testing.assert_allclose(frames[inside, i, 0], np.interp(clock[inside], time, x), rtol=1e-5, atol=0.05)
+        np.testing.assert_allclose(frames[inside, i, 1], np.interp(clock[inside], time, y), rtol=1e-5, atol=0.05)
+
+
+def test_retired_car_is_masked_after_retiring(tracks):
+    source = ReplaySource(tracks)
+    clock, frames = _replay(source)
+    retired = source.drivers.index('HAM')
+    assert tracks['HAM'][0][-1] < source.end - 60
+    assert np.isnan(frames[clock > tracks['HAM'][0][-1], retired]).all()
+
+
+def test_gaps_in_a_track_are_masked(tracks):
+    time, x, y = tracks['VER']
+    hole = (time > time[0] + 100) & (time < time[0] + 100 + 2 * MAX_GAP_SECONDS)
+    source = ReplaySource(dict(tracks, VER=(time[~hole], x[~hole], y[~hole])))
+    clock, frames = _replay(source)
+    driver = source.drivers.index('VER')
+    before, after = time[~hole][time[~hole] < time[hole][0]][-1], time[~hole][time[~hole] > time[hole][-1]][0]
+    assert np.isnan(frames[(clock > before) & (clock < after), driver]).all()
+    kept = (clock >= time[0]) & (clock <= time[-1]) & ((clock <= before) | (clock >= after))
+    assert not np.isnan(frames[kept, driver]).any()
@@ -0,0 +1,44 @@
+"""Stint degradation fits against the synthetic generator's known tyre wear"""
+import numpy as np
+import pytest
+
+import synthetic
+from fuel import FuelModel
+from models import LapTable, fuel_correction
+from stints import StintAnalysis
+
+
+@pytest.fixture(scope='module')
+def race_laps():
+    session = synthetic.get_session(2024, 1, 'R', drivers=20, laps=57, seed=0)
+    session.load(telemetry=False, weather=False)
+    return LapTable.from_laps(session.laps)
+
+
+def test_race_fits_recover_generator_degradation(race_laps):
+    curves = StintAnalysis(race_laps, 'R').compound_curves()
+    for compound, wear in zip(synthetic.COMPOUNDS, synthetic.DEGRADATION):
+        assert curves[compound]['degradation_per_lap'] == pytest.approx(wear, abs=0.01)
+
+
+def test_stint_slopes_are_positive_in_races(race_laps):
+    stints = StintAnalysis(race_laps, 'R')
+    fitted = stints.slope[~np.isnan(stints.slope)]
+    assert fitted.size
+    assert np.median(fitted) == pytest.approx(synthetic.DEGRADATION.mean(), abs=0.02)
+
+
+def test_fuel_model_uses_the_same_correction(race_laps):
+    stints = StintAnalysis(race_laps, 'R')
+    model = FuelModel(race_laps, stints, 'R')
+    np.testing.assert_array_equal(model.corrected_lap_time, fuel_correction(race_laps, 'R')[2])
+
+
+def test_other_sessions_are_not_fuel_corrected():
+    session = synthetic.get_session(2024, 1, 'FP2', drivers=4, laps=12, seed=0)
+    session.load(telemetry=False, weather=False)
+    table = LapTable.from_laps(session.laps)
+    fuel_per_lap, fuel_mass, corrected = fuel_correction(table, 'FP2')
+    assert fuel_per_lap == 0.0
+    assert not fuel_mass.any()
+    np.testing.assert_array_equal(corrected, table.lap_time)
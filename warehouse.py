@@ -0,0 +1,398 @@
+"""Cross-season analytics warehouse.
+
+`flask warehouse ingest YEAR` loads sessions through the data service once and writes
+their laps, stints, results and per-driver aggregates into indexed tables,
+so season and multi-season questions are answered with SQL instead of
+loading dozens of sessions. Column types stay within what both SQLite and
+Postgres support.
+
+The module is imported on first use (``lazy_imports.warehouse`` and the lazy
+``warehouse`` CLI group), by which time the main app may have served
+requests and can no longer take extensions, so SQLAlchemy is bound to a
+small Flask app of its own and every query runs in its app context.
+"""
+import functools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+import click
+from flask import Flask, current_app, has_app_context
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Engine, event, func, insert
+from sqlalchemy.orm import aliased
+
+import config
+from models import LapTable
+from stints import StintAnalysis
+
+logger = logging.getLogger(__name__)
+
+db = SQLAlchemy()
+
+_app = Flask(__name__)
+_app.config.update(SQLALCHEMY_DATABASE_URI=config.WAREHOUSE_DATABASE_URL,
+                   SQLALCHEMY_ENGINE_OPTIONS={'pool_pre_ping': True})
+db.init_app(_app)
+
+_tables_ready = False
+_tables_lock = threading.Lock()
+
+
+class WarehouseSession(db.Model):
+    __tablename__ = 'wh_sessions'
+    __table_args__ = (db.UniqueConstraint('year', 'round_number', 'session_type', name='uq_wh_session'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    year = db.Column(db.Integer, nullable=False, index=True)
+    round_number = db.Column(db.Integer, nullable=False)
+    session_type = db.Column(db.String(8), nullable=False)
+    event_name = db.Column(db.String(100))
+    location = db.Column(db.String(100))
+    session_date = db.Column(db.DateTime)
+    ingested_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
+
+
+class WarehouseLap(db.Model):
+    __tablename__ = 'wh_laps'
+    __table_args__ = (db.Index('ix_wh_laps_session_driver', 'session_id', 'driver'),
+                      db.Index('ix_wh_laps_driver', 'driver'))
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('wh_sessions.id', ondelete='CASCADE'), nullable=False)
+    driver = db.Column(db.String(3), nullable=False)
+    team = db.Column(db.String(50))
+    lap_number = db.Column(db.Integer, nullable=False)
+    lap_time = db.Column(db.Float)
+    sector_1_time = db.Column(db.Float)
+    sector_2_time = db.Column(db.Float)
+    sector_3_time = db.Column(db.Float)
+    compound = db.Column(db.String(12))
+    tyre_life = db.Column(db.Integer)
+    stint = db.Column(db.Integer)
+    is_personal_best = db.Column(db.Boolean, nullable=False, default=False)
+    is_clean = db.Column(db.Boolean, nullable=False, default=False)
+
+
+class WarehouseStint(db.Model):
+    __tablename__ = 'wh_stints'
+    __table_args__ = (db.Index('ix_wh_stints_session_driver', 'session_id', 'driver'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('wh_sessions.id', ondelete='CASCADE'), nullable=False)
+    driver = db.Column(db.String(3), nullable=False)
+    stint = db.Column(db.Integer, nullable=False)
+    compound = db.Column(db.String(12))
+    start_lap = db.Column(db.Integer)
+    end_lap = db.Column(db.Integer)
+    laps = db.Column(db.Integer, nullable=False)
+    best_lap_time = db.Column(db.Float)
+    mean_lap_time = db.Column(db.Float)
+
+
+class WarehouseResult(db.Model):
+    __tablename__ = 'wh_results'
+    __table_args__ = (db.Index('ix_wh_results_session', 'session_id'),
+                      db.Index('ix_wh_results_driver', 'driver'))
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('wh_sessions.id', ondelete='CASCADE'), nullable=False)
+    driver = db.Column(db.String(3), nullable=False)
+    team = db.Column(db.String(50))
+    position = db.Column(db.Integer)
+    grid_position = db.Column(db.Integer)
+    status = db.Column(db.String(50))
+    points = db.Column(db.Float)
+
+
+class WarehouseAggregate(db.Model):
+    """Per session and driver pace summary"""
+    __tablename__ = 'wh_session_aggregates'
+    __table_args__ = (db.UniqueConstraint('session_id', 'driver', name='uq_wh_aggregate'),
+                      db.Index('ix_wh_aggregates_driver', 'driver'),
+                      db.Index('ix_wh_aggregates_team', 'team'))
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('wh_sessions.id', ondelete='CASCADE'), nullable=False)
+    driver = db.Column(db.String(3), nullable=False)
+    team = db.Column(db.String(50))
+    laps = db.Column(db.Integer, nullable=False)
+    clean_laps = db.Column(db.Integer, nullable=False)
+    best_lap_time = db.Column(db.Float)
+    median_lap_time = db.Column(db.Float)
+    mean_lap_time = db.Column(db.Float)
+    std_lap_time = db.Column(db.Float)
+    best_sector_1 = db.Column(db.Float)
+    best_sector_2 = db.Column(db.Float)
+    best_sector_3 = db.Column(db.Float)
+    theoretical_best = db.Column(db.Float)
+
+
+@event.listens_for(Engine, 'connect')
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets every gunicorn worker read while an ingest writes
+    if type(dbapi_connection).__module__.startswith('sqlite3'):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+
+def _in_app_context(func):
+    """Run a warehouse function in the warehouse app's context (and its database session)"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if has_app_context() and current_app._get_current_object() is _app:
+            return func(*args, **kwargs)
+        with _app.app_context():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _none_if_nan(value):
+    return None if value is None or value != value else value
+
+
+def _records(frame) -> List[Dict]:
+    return [{key: _none_if_nan(value) for key, value in row.items()} for row in frame.to_dict('records')]
+
+
+def build_session_tables(session, session_type: str) -> Dict:
+    """Derive lap, stint, result and aggregate rows from a loaded fastf1 session"""
+    from lazy_imports import pd
+
+    laps = session.laps
+    frame = pd.DataFrame({
+        'driver': laps['Driver'].astype(str),
+        'team': laps['Team'] if 'Team' in laps.columns else None,
+        'lap_number': laps['LapNumber'].fillna(0).astype(int),
+        'lap_time': laps['LapTime'].dt.total_seconds(),
+        'sector_1_time': laps['Sector1Time'].dt.total_seconds(),
+        'sector_2_time': laps['Sector2Time'].dt.total_seconds(),
+        'sector_3_time': laps['Sector3Time'].dt.total_seconds(),
+        'compound': laps['Compound'] if 'Compound' in laps.columns else None,
+        'tyre_life': laps['TyreLife'] if 'TyreLife' in laps.columns else None,
+        'stint': laps['Stint'] if 'Stint' in laps.columns else None,
+        'is_personal_best': laps['IsPersonalBest'].eq(True) if 'IsPersonalBest' in laps.columns else False,
+    })
+    # Clean laps as the stint engine finds them, so medians match /api/fuel and /api/tyre_degradation
+    frame['is_clean'] = StintAnalysis(LapTable.from_laps(laps), session_type).clean
+
+    stints = (frame.dropna(subset=['stint'])
+              .groupby(['driver', 'stint'], as_index=False)
+              .agg(compound=('compound', 'first'), start_lap=('lap_number', 'min'), end_lap=('lap_number', 'max'),
+                   laps=('lap_number', 'size'), best_lap_time=('lap_time', 'min')))
+    clean = frame[frame['is_clean']]
+    stint_means = clean.groupby(['driver', 'stint'])['lap_time'].mean().rename('mean_lap_time')
+    stints = stints.join(stint_means, on=['driver', 'stint'])
+
+    aggregates = frame.groupby('driver', as_index=False).agg(
+        team=('team', 'first'), laps=('lap_number', 'size'), best_lap_time=('lap_time', 'min'),
+        best_sector_1=('sector_1_time', 'min'), best_sector_2=('sector_2_time', 'min'),
+        best_sector_3=('sector_3_time', 'min'))
+    clean_stats = clean.groupby('driver')['lap_time'].agg(
+        clean_laps='size', median_lap_time='median', mean_lap_time='mean', std_lap_time='std')
+    aggregates = aggregates.join(clean_stats, on='driver')
+    aggregates['clean_laps'] = aggregates['clean_laps'].fillna(0).astype(int)
+    aggregates['theoretical_best'] = aggregates[['best_sector_1', 'best_sector_2', 'best_sector_3']].sum(axis=1, min_count=3)
+
+    results = []
+    session_results = getattr(session, 'results', None)
+    if session_results is not None and len(session_results):
+        results = _records(pd.DataFrame({
+            'driver': session_results['Abbreviation'].astype(str),
+            'team': session_results['TeamName'],
+            'position': session_results['Position'],
+            'grid_position': session_results['GridPosition'],
+            'status': session_results['Status'],
+            'points': session_results['Points'],
+        }))
+        for row in results:
+            for key in ('position', 'grid_position'):
+                row[key] = int(row[key]) if row[key] is not None else None
+
+    return {
+        'laps': _records(frame),
+        'stints': _records(stints),
+        'results': results,
+        'aggregates': _records(aggregates),
+    }
+
+
+@_in_app_context
+def ingest_session(year: int, round_number: int, session_type: str) -> Dict:
+    """Load one session and replace its rows in the warehouse"""
+    from f1_data import get_f1_service
+
+    start = time.perf_counter()
+    session = get_f1_service()._load_session(year, round_number, session_type,
+                                             laps=True, telemetry=False, weather=False, messages=False)
+    tables = build_session_tables(session, session_type)
+
+    existing = WarehouseSession.query.filter_by(year=year, round_number=round_number, session_type=session_type).first()
+    if existing is not None:
+        for model in (WarehouseLap, WarehouseStint, WarehouseResult, WarehouseAggregate):
+            model.query.filter_by(session_id=existing.id).delete()
+        db.session.delete(existing)
+        db.session.flush()
+
+    event = session.event
+    session_date = getattr(session, 'date', None)
+    record = WarehouseSession(year=year, round_number=round_number, session_type=session_type,
+                              event_name=str(event.get('EventName', '')), location=str(event.get('Location', '')),
+                              session_date=session_date.to_pydatetime() if session_date is not None and session_date == session_date else None)
+    db.session.add(record)
+    db.session.flush()
+
+    counts = {}
+    for name, model in (('laps', WarehouseLap), ('stints', WarehouseStint),
+                        ('results', WarehouseResult), ('aggregates', WarehouseAggregate)):
+        rows = [dict(row, session_id=record.id) for row in tables[name]]
+        if rows:
+            db.session.execute(insert(model), rows)
+        counts[name] = len(rows)
+    db.session.commit()
+    counts['seconds'] = round(time.perf_counter() - start, 2)
+    return counts
+
+
+@_in_app_context
+def ensure_tables():
+    """Create the warehouse tables on first use in this process, not at import"""
+    global _tables_ready
+    if _tables_ready:
+        return
+    with _tables_lock:
+        if not _tables_ready:
+            db.create_all()
+            _tables_ready = True
+
+
+def _session_filter(query, session_model, from_year: Optional[int], to_year: Optional[int], session_type: str):
+    if from_year is not None:
+        query = query.filter(session_model.year >= from_year)
+    if to_year is not None:
+        query = query.filter(session_model.year <= to_year)
+    return query.filter(session_model.session_type == session_type)
+
+
+@_in_app_context
+def list_sessions(year: Optional[int] = None) -> List[Dict]:
+    ensure_tables()
+    query = WarehouseSession.query.order_by(WarehouseSession.year, WarehouseSession.round_number, WarehouseSession.session_type)
+    if year is not None:
+        query = query.filter(WarehouseSession.year == year)
+    return [{'year': s.year, 'round_number': s.round_number, 'session_type': s.session_type,
+             'event_name': s.event_name, 'location': s.location,
+             'ingested_at': s.ingested_at.isoformat() if s.ingested_at else None} for s in query]
+
+
+@_in_app_context
+def driver_pace_trend(driver: str, from_year: Optional[int], to_year: Optional[int], session_type: str = 'R') -> List[Dict]:
+    """Per-session pace of one driver, in calendar order"""
+    ensure_tables()
+    query = (db.session.query(WarehouseSession.year, WarehouseSession.round_number, WarehouseSession.event_name,
+                              WarehouseAggregate.team, WarehouseAggregate.best_lap_time,
+                              WarehouseAggregate.median_lap_time, WarehouseAggregate.std_lap_time,
+                              WarehouseAggregate.clean_laps)
+             .join(WarehouseAggregate, WarehouseAggregate.session_id == WarehouseSession.id)
+             .filter(WarehouseAggregate.driver == driver.upper()))
+    query = _session_filter(query, WarehouseSession, from_year, to_year, session_type)
+    return [row._asdict() for row in query.order_by(WarehouseSession.year, WarehouseSession.round_number)]
+
+
+@_in_app_context
+def teammate_deltas(from_year: Optional[int], to_year: Optional[int], session_type: str = 'R',
+                    team: Optional[str] = None) -> List[Dict]:
+    """Median clean-lap delta between teammates for every session (positive: first driver slower)"""
+    ensure_tables()
+    first, second = aliased(WarehouseAggregate), aliased(WarehouseAggregate)
+    query = (db.session.query(WarehouseSession.year, WarehouseSession.round_number, WarehouseSession.event_name,
+                              first.team, first.driver.label('driver'), second.driver.label('teammate'),
+                              first.median_lap_time.label('driver_median'),
+                              second.median_lap_time.label('teammate_median'),
+                              (first.median_lap_time - second.median_lap_time).label('delta'))
+             .join(first, first.session_id == WarehouseSession.id)
+             .join(second, (second.session_id == first.session_id) & (second.team == first.team)
+                   & (first.driver < second.driver))
+             .filter(first.median_lap_time.isnot(None), second.median_lap_time.isnot(None)))
+    query = _session_filter(query, WarehouseSession, from_year, to_year, session_type)
+    if team:
+        query = query.filter(first.team == team)
+    rows = query.order_by(WarehouseSession.year, WarehouseSession.round_number, first.team)
+    return [dict(row._asdict(), delta=round(row.delta, 3)) for row in rows]
+
+
+@_in_app_context
+def season_standings(year: int) -> List[Dict]:
+    """Championship points per driver from ingested race and sprint results"""
+    ensure_tables()
+    points = func.sum(WarehouseResult.points).label('points')
+    query = (db.session.query(WarehouseResult.driver, func.max(WarehouseResult.team).label('team'), points,
+                              func.count(WarehouseResult.id).label('sessions'))
+             .join(WarehouseSession, WarehouseSession.id == WarehouseResult.session_id)
+             .filter(WarehouseSession.year == year, WarehouseSession.session_type.in_(('R', 'S')))
+             .group_by(WarehouseResult.driver)
+             .order_by(points.desc()))
+    return [row._asdict() for row in query]
+
+
+def _parse_rounds(spec: Optional[str]) -> Optional[List[int]]:
+    if not spec:
+        return None
+    rounds = []
+    for part in spec.split(','):
+        low, _, high = part.partition('-')
+        rounds.extend(range(int(low), int(high or low) + 1))
+    return rounds
+
+
+@click.group('warehouse')
+def warehouse_cli():
+    """Cross-season analytics warehouse"""
+
+
+@warehouse_cli.command('init')
+def init_command():
+    """Create the warehouse tables"""
+    ensure_tables()
+    click.echo(f"Warehouse tables ready at {config.WAREHOUSE_DATABASE_URL}")
+
+
+@warehouse_cli.command('ingest')
+@click.argument('years', nargs=-1, type=int, required=True)
+@click.option('--rounds', help='rounds to ingest, e.g. 1-5,8 (default: every round of the season)')
+@click.option('--sessions', default='Q,R', show_default=True, help='comma separated session types')
+def ingest_command(years, rounds, sessions):
+    """Load sessions through the configured backend and write them into the warehouse"""
+    from f1_data import get_f1_service
+
+    ensure_tables()
+    # One app context for the whole run, so a failed session's rollback reaches the session that failed
+    with _app.app_context():
+        for year in years:
+            round_numbers = _parse_rounds(rounds)
+            if round_numbers is None:
+                # Through the schedule store and backend like every page; round 0 is pre-season testing
+                round_numbers = [int(race['round_number']) for race in get_f1_service().get_season_schedule(year)
+                                 if int(race['round_number']) > 0]
+                if not round_numbers:
+                    click.echo(f"{year}: no schedule available", err=True)
+            for round_number in round_numbers:
+                for session_type in sessions.split(','):
+                    try:
+                        counts = ingest_session(year, round_number, session_type)
+                        click.echo(f"{year} round {round_number} {session_type}: {counts}")
+                    except Exception as e:
+                        db.session.rollback()
+                        click.echo(f"{year} round {round_number} {session_type}: failed ({e})", err=True)
+
+
+def reset_after_fork():
+    """Drop pooled connections inherited from the master without closing them under it"""
+    try:
+        with _app.app_context():
+            db.engine.dispose(close=False)
+    except Exception as e:
+        logger.warning(f"Could not reset warehouse connections after fork: {e}")
@@ -0,0 +1,107 @@
+"""Session weather as a columnar timeline aligned to lap numbers.
+
+fastf1 reports weather about once a minute in session time. The timeline
+keeps those samples as sorted NumPy columns, maps each one to the lap the
+leader was on with ``np.searchsorted`` over the leader's lap start times
+(from the session's lap table), and
+downsamples to a coarser resolution with ``np.bincount`` (wind direction is
+averaged as a vector so 350° and 10° average to 0°, not 180°).
+"""
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from models import LapTable, optional_floats
+
+# fastf1 weather column -> API field
+COLUMNS = {
+    'AirTemp': 'air_temperature',
+    'TrackTemp': 'track_temperature',
+    'Humidity': 'humidity',
+    'Pressure': 'pressure',
+    'WindSpeed': 'wind_speed',
+    'WindDirection': 'wind_direction',
+}
+
+
+def leader_lap_starts(table: LapTable) -> np.ndarray:
+    """Session time at which the leader started each lap (index 0 is lap 1)"""
+    known = ~np.isnan(table.lap_start_time) & (table.lap_number > 0)
+    if not known.any():
+        return np.zeros(0)
+    laps = int(table.lap_number[known].max())
+    starts = np.full(laps + 1, np.inf)
+    np.minimum.at(starts, table.lap_number[known], table.lap_start_time[known])
+    starts = starts[1:]
+    # Laps nobody has a start time for inherit the previous lap's start; keep the index sorted
+    starts[np.isinf(starts)] = np.nan
+    return np.fmax.accumulate(np.nan_to_num(starts, nan=-np.inf))
+
+
+class WeatherTimeline:
+    """Weather samples of a session as sorted columns"""
+
+    def __init__(self, weather_data):
+        weather_data = weather_data.sort_values('Time')
+        self.time = weather_data['Time'].dt.total_seconds().to_numpy(dtype=float, na_value=np.nan)
+        self.columns = {
+            field: (weather_data[column].to_numpy(dtype=float, na_value=np.nan)
+                    if column in weather_data.columns else np.full(len(self.time), np.nan))
+            for column, field in COLUMNS.items()
+        }
+        if 'Rainfall' in weather_data.columns:
+            self.rainfall = weather_data['Rainfall'].eq(True).to_numpy(dtype=bool)
+        else:
+            self.rainfall = np.zeros(len(self.time), dtype=bool)
+
+    @staticmethod
+    def laps_at(time: np.ndarray, lap_starts: Optional[np.ndarray]) -> np.ndarray:
+        """Lap number for each sample time (0 before the first lap starts, -1 without lap data)"""
+        if lap_starts is None or not len(lap_starts):
+            return np.full(len(time), -1, dtype=np.int32)
+        return np.searchsorted(lap_starts, time, side='right').astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def latest(self, lap_starts: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
+        """The last sample, shaped like the weather panel expects"""
+        if not len(self):
+            return None
+        sample = {field: optional_floats(values[-1:], 1)[0] for field, values in self.columns.items()}
+        sample['rainfall'] = bool(self.rainfall[-1])
+        lap = int(self.laps_at(self.time[-1:], lap_starts)[0])
+        sample['lap'] = lap if lap >= 0 else None
+        sample['session_time'] = round(float(self.time[-1]), 1)
+        return sample
+
+    def to_dict(self, resolution: Optional[float] = None, lap_starts: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Columnar timeline, averaged into buckets of `resolution` seconds when it is coarser than the samples"""
+        time, rainfall, columns = self.time, self.rainfall, self.columns
+        lap = self.laps_at(time, lap_starts)
+        if resolution and resolution > 0 and len(time):
+            bucket = np.floor((time - time[0]) / resolution).astype(np.int64)
+            _, bucket = np.unique(bucket, return_inverse=True)
+            buckets = int(bucket.max()) + 1
+            counts = np.bincount(bucket, minlength=buckets)
+
+            def mean(values):
+                present = ~np.isnan(values)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    return (np.bincount(bucket[present], values[present], buckets)
+                            / np.bincount(bucket[present], minlength=buckets))
+
+            columns = {field: mean(values) for field, values in columns.items() if field != 'wind_direction'}
+            radians = np.deg2rad(self.columns['wind_direction'])
+            direction = np.rad2deg(np.arctan2(mean(np.sin(radians)), mean(np.cos(radians))))
+            columns['wind_direction'] = np.round(direction, 1) % 360
+            time = np.bincount(bucket, time, buckets) / counts
+            # A bucket is wet if it rained at any point, and belongs to the lap it ended on
+            rainfall = np.bincount(bucket, rainfall, buckets) > 0
+            last = np.r_[np.flatnonzero(np.diff(bucket)), len(bucket) - 1]
+            lap = lap[last]
+
+        data = {'session_time': optional_floats(time, 1), 'lap': [None if value < 0 else value for value in lap.tolist()]}
+        data.update({field: optional_floats(values, 1) for field, values in columns.items()})
+        data['rainfall'] = rainfall.tolist()
+        return data
@@ -0,0 +1,77 @@
+"""Production entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app the master imports this module, loads the configured hot
+sessions into the service's in-memory session cache and only then forks,
+so every worker starts with those sessions already loaded and shares their
+memory copy-on-write.
+"""
+import logging
+import time
+from datetime import date
+from typing import List, Tuple
+
+import config
+from session_cache import most_requested
+
+logger = logging.getLogger(__name__)
+
+
+def latest_weekend(service) -> List[Tuple[int, int, str]]:
+    """Qualifying and race of the most recent race weekend that has taken place"""
+    today = date.today().isoformat()
+    for year in (date.today().year, date.today().year - 1):
+        past = [race for race in service.get_season_schedule(year)
+                if race['date'] and race['date'] <= today and race['round_number']]
+        if past:
+            round_number = int(past[-1]['round_number'])
+            return [(year, round_number, 'Q'), (year, round_number, 'R')]
+    return []
+
+
+def resolve_hot_sessions(service, spec: str) -> List[Tuple[int, int, str]]:
+    """Expand a HOT_SESSIONS value into (year, round, session_type) tuples"""
+    from offline_backend import parse_session_spec
+
+    sessions = []
+    for entry in (spec or '').split(','):
+        entry = entry.strip()
+        try:
+            if entry == 'latest':
+                sessions.extend(latest_weekend(service))
+            elif entry == 'popular':
+                sessions.extend(parse_session_spec(item) for item in most_requested(config.HOT_SESSIONS_POPULAR_COUNT))
+            elif entry:
+                sessions.append(parse_session_spec(entry))
+        except Exception as e:
+            logger.warning(f"Skipping hot session entry {entry!r}: {e}")
+    # Keep the first occurrence of each session, up to what the cache can hold
+    unique = list(dict.fromkeys(sessions))
+    return unique[:config.SESSION_CACHE_SIZE]
+
+
+def warm_sessions(service, sessions: List[Tuple[int, int, str]]):
+    """Fully load each session into the service's in-memory session cache"""
+    for year, round_number, session_type in sessions:
+        start = time.perf_counter()
+        try:
+            service._load_session(year, round_number, session_type)
+            logger.info(f"Warmed {year} round {round_number} {session_type} in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            logger.warning(f"Could not warm {year} round {round_number} {session_type}: {e}")
+
+
+def create_app(hot_sessions: str = None):
+    """Import the Flask app and warm the hot sessions"""
+    from app import app
+    from f1_data import get_f1_service
+
+    spec = config.HOT_SESSIONS if hot_sessions is None else hot_sessions
+    if spec:
+        service = get_f1_service()
+        warm_sessions(service, resolve_hot_sessions(service, spec))
+    return app
+
+
+app = create_app()